@@ -120,6 +120,46 @@ def update_default_resources():
     update_default_resources()
 
 
+@neon_core_cli.command(help="Build a shared pre-trained intent cache")
+@click.option(
+    "--intent-cache",
+    "-i",
+    default=None,
+    help="Trained padatious intent cache directory",
+)
+@click.option(
+    "--output",
+    "-o",
+    default=None,
+    help="Directory to write the intent cache artifact to",
+)
+@click.option(
+    "--keep",
+    "-k",
+    type=int,
+    default=None,
+    help="Number of most recent artifacts to keep (0 keeps all)",
+)
+def build_intent_cache(intent_cache: Optional[str] = None,
+                       output: Optional[str] = None,
+                       keep: Optional[int] = None):
+    from neon_core.configuration import Configuration
+    from neon_core.util.padatious_cache import \
+        build_intent_cache_artifact, get_intent_cache_dir
+
+    config = Configuration().get("padatious") or {}
+    intent_cache = intent_cache or get_intent_cache_dir(config)
+    shared_config = config.get("shared_cache") or {}
+    output = output or shared_config.get("path")
+    if not output:
+        raise click.UsageError("No output directory specified or configured")
+    if keep is None:
+        keep = shared_config.get("keep", 3)
+    click.echo(f"Building intent cache artifact from {intent_cache}")
+    artifact = build_intent_cache_artifact(intent_cache, output, keep)
+    click.echo(f"Built intent cache artifact: {artifact}")
+
+
 @neon_core_cli.command(help="Start Neon Skills module")
 @click.option(
     "--health-check-server-port",
@@ -128,7 +168,14 @@ def update_default_resources():
     default=None,
     help="Port for health check server to listen on",
 )
-def run_skills(health_check_server_port: Optional[int] = None):
+@click.option(
+    "--zygote/--no-zygote",
+    default=None,
+    help="Preload modules once and fork the skills service, so it can be "
+         "restarted quickly on crash or SIGHUP",
+)
+def run_skills(health_check_server_port: Optional[int] = None,
+               zygote: Optional[bool] = None):
     from neon_core.util.skill_utils import update_default_resources
 
     update_default_resources()
@@ -136,5 +183,5 @@ def run_skills(health_check_server_port: Optional[int] = None):
     from neon_core.skills.__main__ import main
 
     click.echo("Starting Skills Service")
-    main(health_check_server_port=health_check_server_port)
+    main(health_check_server_port=health_check_server_port, zygote=zygote)
     click.echo("Skills Service Shutdown")
@@ -0,0 +1,163 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import sqlite3
+
+from hashlib import sha256
+from os import makedirs
+from os.path import dirname, expanduser, join
+from threading import Lock
+from typing import Optional
+
+from ovos_utils.log import LOG
+from ovos_utils.xdg_utils import xdg_cache_home
+
+from neon_core.util.cache_utils import TimedLRUCache
+
+
+class TranslationCache:
+    """
+    Content-addressed cache of translations and language detections with an
+    in-memory LRU tier and an optional SQLite tier that persists across
+    restarts.
+    """
+    def __init__(self, max_entries: int = 4096, persistent: bool = False,
+                 path: Optional[str] = None):
+        """
+        :param max_entries: max entries in the in-memory tier
+        :param persistent: if True, also cache entries in a SQLite database
+        :param path: database path, default in the XDG cache directory
+        """
+        self._memory = TimedLRUCache(max_entries)
+        self._db = None
+        self._db_lock = Lock()
+        if persistent:
+            path = expanduser(path or join(xdg_cache_home(), "neon",
+                                           "translation_cache.sqlite"))
+            try:
+                makedirs(dirname(path), exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("CREATE TABLE IF NOT EXISTS cache "
+                                 "(key TEXT PRIMARY KEY, value TEXT)")
+                self._db.commit()
+            except sqlite3.Error as e:
+                LOG.error(f"Failed to open translation cache {path}: {e}")
+                self._db = None
+
+    @staticmethod
+    def get_key(text: str, source_lang: Optional[str],
+                target_lang: Optional[str], plugin: str) -> str:
+        """
+        Get a content-addressed key for a cache entry
+        :param text: source text
+        :param source_lang: source language code (None for detection)
+        :param target_lang: target language code (None for detection)
+        :param plugin: name of the plugin producing the result
+        :returns: hex digest key
+        """
+        return sha256(json.dumps([text, source_lang, target_lang, plugin])
+                      .encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached result, checking memory before the database
+        :param key: key returned by `get_key`
+        :returns: cached result or None
+        """
+        value = self._memory.get(key)
+        if value is None and self._db:
+            with self._db_lock:
+                row = self._db.execute("SELECT value FROM cache WHERE key=?",
+                                       (key,)).fetchone()
+            if row:
+                value = json.loads(row[0])
+                self._memory.put(key, value)
+        return value
+
+    def put(self, key: str, value: str):
+        """
+        Cache a result
+        :param key: key returned by `get_key`
+        :param value: JSON-serializable result to cache
+        """
+        self._memory.put(key, value)
+        if self._db:
+            with self._db_lock:
+                self._db.execute("INSERT OR REPLACE INTO cache VALUES (?, ?)",
+                                 (key, json.dumps(value)))
+                self._db.commit()
+
+    def shutdown(self):
+        if self._db:
+            with self._db_lock:
+                self._db.close()
+                self._db = None
+
+
+class _CachedPlugin:
+    """
+    Proxy for a language plugin that delegates uncached methods
+    """
+    def __init__(self, plugin, cache: TranslationCache):
+        self.plugin = plugin
+        self.cache = cache
+        self.plugin_name = f"{type(plugin).__module__}." \
+                           f"{type(plugin).__qualname__}"
+
+    def __getattr__(self, item):
+        return getattr(self.plugin, item)
+
+
+class CachedTranslator(_CachedPlugin):
+    """
+    Proxy for a `LanguageTranslator` that caches `translate` results
+    """
+    def translate(self, text: str, target: Optional[str] = None,
+                  source: Optional[str] = None) -> str:
+        key = self.cache.get_key(text, source, target, self.plugin_name)
+        translated = self.cache.get(key)
+        if translated is None:
+            translated = self.plugin.translate(text, target, source)
+            if translated:
+                self.cache.put(key, translated)
+        return translated
+
+
+class CachedDetector(_CachedPlugin):
+    """
+    Proxy for a `LanguageDetector` that caches `detect` results
+    """
+    def detect(self, text: str) -> str:
+        key = self.cache.get_key(text, None, None, self.plugin_name)
+        lang = self.cache.get(key)
+        if lang is None:
+            lang = self.plugin.detect(text)
+            if lang:
+                self.cache.put(key, lang)
+        return lang
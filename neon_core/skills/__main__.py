@@ -26,7 +26,14 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from neon_core.skills.service import NeonSkillService
+import signal
+
+from functools import partial
+from threading import Event
+
+from neon_core.skills.service import NeonSkillService, on_error, \
+    on_stopping
+from ovos_config.config import Configuration
 from neon_utils.log_utils import init_log
 from ovos_utils.log import LOG
 from ovos_utils.process_utils import reset_sigint_handler
@@ -38,7 +45,65 @@ from neon_utils.process_utils import (
 )
 
 
+def _wait_for_service(service: NeonSkillService, failed: Event) -> bool:
+    """
+    Block until an exit signal is received, or the service reports an error
+    or stops.
+    :param service: started NeonSkillService
+    :param failed: Event set when the service reports an error or is
+        stopping
+    :returns: True if the service failed or stopped, False on an exit signal
+    """
+    exit_event = Event()
+
+    def _handle_signal(signum, frame):
+        LOG.debug(f"Exiting on signal {signal.Signals(signum).name}")
+        exit_event.set()
+
+    signal.signal(signal.SIGTERM, _handle_signal)
+    signal.signal(signal.SIGINT, _handle_signal)
+    try:
+        while not exit_event.is_set():
+            if failed.wait(1):
+                return True
+            if not service.is_alive() and \
+                    not service.skill_manager.is_alive():
+                LOG.error("Skills service stopped")
+                return True
+    except KeyboardInterrupt:
+        LOG.debug("Exiting on KeyboardInterrupt")
+    return False
+
+
 def main(*args, **kwargs):
+    zygote_config = dict(Configuration().get("skills", {}).get("zygote") or {})
+    zygote = kwargs.pop("zygote", None)
+    if zygote is None:
+        zygote = zygote_config.get("enabled", False)
+    zygote_config.pop("enabled", None)
+    if zygote:
+        from neon_core.skills.zygote import SkillsZygote
+        init_log(log_name="skills")
+        SkillsZygote(partial(main, *args, zygote=False, exit_on_error=True,
+                             **kwargs), **zygote_config).run()
+        return
+    # Zygote workers exit when the service fails so they are restarted
+    exit_on_error = kwargs.pop("exit_on_error", False)
+    failed = Event()
+    if exit_on_error:
+        error_hook = kwargs.pop("error_hook", on_error)
+        stopping_hook = kwargs.pop("stopping_hook", on_stopping)
+
+        def _on_error(e='Unknown'):
+            error_hook(e)
+            failed.set()
+
+        def _on_stopping():
+            stopping_hook()
+            failed.set()
+
+        kwargs["error_hook"] = _on_error
+        kwargs["stopping_hook"] = _on_stopping
     reset_sigint_handler()
     init_log(log_name="skills")
     malloc_running = start_malloc(stack_depth=4)
@@ -50,14 +115,21 @@ def main(*args, **kwargs):
         start_health_check_server(
             service.skill_manager.status, health_check_server_port, service.check_health
         )
+    service_failed = False
     try:
         service.start()
-        wait_for_exit_signal()
+        if exit_on_error:
+            service_failed = _wait_for_service(service, failed)
+        else:
+            wait_for_exit_signal()
         if malloc_running:
             print_malloc(snapshot_malloc())
     except Exception as e:
         LOG.exception(e)
     service.shutdown()
+    if service_failed:
+        # Exit the zygote worker with a nonzero status
+        raise RuntimeError("Skills service failed")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import time
+
+from threading import Event, Lock
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from ovos_bus_client import Message
+from ovos_bus_client.session import SessionManager
+from ovos_plugin_manager.templates.pipeline import IntentMatch
+from ovos_utils import flatten_list
+from ovos_utils.log import LOG
+
+
+class ConcurrentFallbackService:
+    """
+    Asks every eligible fallback skill whether it can handle an utterance at
+    once, instead of sending the utterance to each skill in turn. Skills
+    answer the `ovos.skills.fallback.ping` query with their side effect free
+    `can_answer` result. The highest priority skill that accepts before the
+    deadline is sent the fallback request; the next accepting skill is only
+    tried if it does not handle the utterance. Skills that have not answered
+    by the deadline are sent `ovos.skills.fallback.force_timeout`.
+    """
+    def __init__(self, bus, fallback_service):
+        """
+        :param bus: MessageBusClient to send requests on
+        :param fallback_service: FallbackService that tracks fallback skills
+        """
+        self.bus = bus
+        self.fallback_service = fallback_service
+
+    @property
+    def config(self) -> dict:
+        return self.fallback_service.fallback_config.get("concurrent") or {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.config.get("enabled"))
+
+    def _get_skills(self, message: Message, start: int,
+                    stop: int) -> List[str]:
+        """
+        Get fallback skills that may handle a request in a priority range
+        :param message: Message associated with the request
+        :param start: priority the range starts after
+        :param stop: last priority in the range
+        :returns: skill IDs in priority order (highest priority first)
+        """
+        fallback = self.fallback_service
+        session = SessionManager.get(message)
+        skills = [(priority, skill_id) for skill_id, priority in
+                  list(fallback.registered_fallbacks.items())
+                  if start < priority <= stop and
+                  skill_id not in session.blacklisted_skills and
+                  fallback._fallback_allowed(skill_id)]
+        return [skill_id for _, skill_id in sorted(skills)]
+
+    @staticmethod
+    def _select(order: List[str],
+                results: Dict[str, bool]) -> Tuple[List[str], bool]:
+        """
+        Select skills from the answers received so far
+        :param order: skill IDs in priority order
+        :param results: dict of skill ID to `can_handle` answer
+        :returns: accepting skill IDs in priority order, True if the highest
+            priority accepting skill is known
+        """
+        accepted = [skill_id for skill_id in order if results.get(skill_id)]
+        for skill_id in order:
+            if skill_id not in results:
+                return accepted, False
+            if results[skill_id]:
+                return accepted, True
+        return accepted, True
+
+    def _poll_skills(self, skill_ids: List[str], utterances: List[str],
+                     lang: str, message: Message) -> List[str]:
+        """
+        Ask all skills whether they can handle the utterances
+        :param skill_ids: skill IDs to ask, in priority order
+        :param utterances: list of utterances to handle
+        :param lang: language of utterances
+        :param message: Message associated with the utterances
+        :returns: skill IDs that accepted, in priority order
+        """
+        results = dict()
+        lock = Lock()
+        decided = Event()
+        poll_id = str(uuid4())
+
+        def handle_pong(msg: Message):
+            if msg.context.get("fallback_poll_id") != poll_id:
+                return
+            skill_id = msg.data.get("skill_id")
+            if skill_id not in skill_ids:
+                return
+            with lock:
+                results[skill_id] = bool(msg.data.get("can_handle", True))
+                if self._select(skill_ids, results)[1]:
+                    decided.set()
+
+        deadline = self.config.get("deadline", 3)
+        self.bus.on("ovos.skills.fallback.pong", handle_pong)
+        try:
+            ping = message.forward("ovos.skills.fallback.ping",
+                                   {"utterances": utterances, "lang": lang})
+            # Skills reply with this context, identifying answers to this poll
+            ping.context["fallback_poll_id"] = poll_id
+            self.bus.emit(ping)
+            decided.wait(deadline)
+        finally:
+            self.bus.remove("ovos.skills.fallback.pong", handle_pong)
+
+        with lock:
+            results = dict(results)
+        for skill_id in skill_ids:
+            if skill_id not in results:
+                LOG.warning(f"{skill_id} did not answer fallback query "
+                            f"within {deadline}s")
+                self.bus.emit(message.forward(
+                    "ovos.skills.fallback.force_timeout",
+                    {"skill_id": skill_id}))
+        accepted, _ = self._select(skill_ids, results)
+        return accepted
+
+    def _fallback_range(self, utterances: List[str], lang: str,
+                        message: Message, start: int,
+                        stop: int) -> Optional[IntentMatch]:
+        """
+        Handle an utterance with fallback skills in a priority range
+        :param utterances: list of utterances to handle
+        :param lang: language of utterances
+        :param message: Message associated with the utterances
+        :param start: priority the range starts after
+        :param stop: last priority in the range
+        :returns: IntentMatch if a skill handled the utterance, else None
+        """
+        utterances = flatten_list(utterances)
+        message.data["utterances"] = utterances
+        message.data["lang"] = lang
+        skill_ids = self._get_skills(message, start, stop)
+        if not skill_ids:
+            return None
+        start_time = time.monotonic()
+        accepted = self._poll_skills(skill_ids, utterances, lang, message)
+        LOG.debug(f"Polled {len(skill_ids)} fallback skills in "
+                  f"{time.monotonic() - start_time}s; accepted={accepted}")
+        for skill_id in accepted:
+            if self.fallback_service.attempt_fallback(utterances, skill_id,
+                                                      lang, message):
+                return IntentMatch(intent_service='Fallback',
+                                   intent_type=None, intent_data={},
+                                   skill_id=skill_id, utterance=utterances[0])
+        return None
+
+    def high_prio(self, utterances, lang, message) -> Optional[IntentMatch]:
+        return self._fallback_range(utterances, lang, message, 0, 5)
+
+    def medium_prio(self, utterances, lang, message) -> Optional[IntentMatch]:
+        return self._fallback_range(utterances, lang, message, 5, 90)
+
+    def low_prio(self, utterances, lang, message) -> Optional[IntentMatch]:
+        return self._fallback_range(utterances, lang, message, 90, 101)
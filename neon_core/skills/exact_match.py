@@ -0,0 +1,232 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import re
+
+from os.path import isfile
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple
+
+from ovos_bus_client import Message
+from ovos_bus_client.session import SessionManager
+from ovos_bus_client.util import get_message_lang
+from ovos_plugin_manager.templates.pipeline import IntentMatch
+from ovos_utils.bracket_expansion import expand_template
+from ovos_utils.log import LOG
+
+# (intent engine, intent name)
+IntentKey = Tuple[str, str]
+
+
+def normalize_phrase(phrase: str) -> str:
+    """
+    Normalize a phrase for exact matching
+    :param phrase: utterance or intent template to normalize
+    :returns: lowercase phrase without punctuation or extra whitespace
+    """
+    return " ".join(re.sub(r"[^\w\s']", " ", phrase.lower()).split())
+
+
+class ExactMatchService:
+    """
+    Matches utterances that are exactly equal to an expanded Padatious intent
+    template, or to the vocabulary of an Adapt intent with a single required
+    keyword. Matches are looked up in a hash index that is updated as intents
+    are registered and detached.
+    """
+    def __init__(self, bus, lang: str = "en-us"):
+        """
+        :param bus: MessageBusClient to listen for registrations on
+        :param lang: default language of registrations without a `lang`
+        """
+        self.bus = bus
+        self.lang = lang.lower()
+        self._lock = Lock()
+        # lang: normalized phrase: intents matching the phrase
+        self._index: Dict[str, Dict[str, Set[IntentKey]]] = dict()
+        # lang: intent: phrases indexed for the intent
+        self._phrases: Dict[str, Dict[IntentKey, Set[str]]] = dict()
+        # lang: Adapt entity type: normalized vocabulary
+        self._vocab: Dict[str, Dict[str, Set[str]]] = dict()
+        # Adapt intent name: single required entity type
+        self._adapt_intents: Dict[str, str] = dict()
+
+        self.bus.on("padatious:register_intent", self.handle_register_padatious)
+        self.bus.on("register_vocab", self.handle_register_vocab)
+        self.bus.on("register_intent", self.handle_register_adapt)
+        self.bus.on("detach_intent", self.handle_detach_intent)
+        self.bus.on("detach_skill", self.handle_detach_skill)
+
+    def _add(self, lang: str, intent: IntentKey, phrases: Set[str]):
+        index = self._index.setdefault(lang, dict())
+        self._phrases.setdefault(lang, dict()).setdefault(
+            intent, set()).update(phrases)
+        for phrase in phrases:
+            index.setdefault(phrase, set()).add(intent)
+
+    def _remove(self, intent: IntentKey):
+        for lang, intents in self._phrases.items():
+            for phrase in intents.pop(intent, set()):
+                matches = self._index[lang].get(phrase)
+                if matches:
+                    matches.discard(intent)
+                    if not matches:
+                        self._index[lang].pop(phrase)
+
+    def handle_register_padatious(self, message: Message):
+        """
+        Index the expanded templates of a Padatious intent. Templates
+        containing entities are not indexed.
+        :param message: `padatious:register_intent` Message
+        """
+        name = message.data.get("name")
+        lang = (message.data.get("lang") or self.lang).lower()
+        samples = message.data.get("samples")
+        file_name = message.data.get("file_name")
+        if not samples and file_name and isfile(file_name):
+            with open(file_name) as f:
+                samples = f.readlines()
+        if not name or not samples:
+            return
+        phrases = set()
+        for line in samples:
+            line = line.strip()
+            if not line or line.startswith("#") or "{" in line:
+                continue
+            phrases.update(normalize_phrase(p) for p in expand_template(line))
+        phrases.discard("")
+        with self._lock:
+            self._remove(("padatious", name))
+            self._add(lang, ("padatious", name), phrases)
+
+    def handle_register_vocab(self, message: Message):
+        """
+        Index Adapt vocabulary for intents requiring only that vocabulary.
+        :param message: `register_vocab` Message
+        """
+        entity_type = message.data.get("entity_type")
+        value = message.data.get("entity_value")
+        if message.data.get("regex") or not entity_type or not value:
+            return
+        lang = get_message_lang(message).lower()
+        phrase = normalize_phrase(value)
+        with self._lock:
+            self._vocab.setdefault(lang, dict()).setdefault(
+                entity_type, set()).add(phrase)
+            for intent, required in self._adapt_intents.items():
+                if required == entity_type:
+                    self._add(lang, ("adapt", intent), {phrase})
+
+    def handle_register_adapt(self, message: Message):
+        """
+        Index an Adapt intent if it requires exactly one keyword and has no
+        other keywords.
+        :param message: `register_intent` Message
+        """
+        name = message.data.get("name")
+        requires = message.data.get("requires") or []
+        if not name:
+            return
+        with self._lock:
+            self._remove(("adapt", name))
+            self._adapt_intents.pop(name, None)
+            if len(requires) != 1 or message.data.get("at_least_one") or \
+                    message.data.get("optional") or \
+                    message.data.get("excludes"):
+                return
+            entity_type = requires[0][0]
+            self._adapt_intents[name] = entity_type
+            for lang, vocab in self._vocab.items():
+                if vocab.get(entity_type):
+                    self._add(lang, ("adapt", name), vocab[entity_type])
+
+    def handle_detach_intent(self, message: Message):
+        """
+        Remove an intent from the index.
+        :param message: `detach_intent` Message
+        """
+        name = message.data.get("intent_name")
+        with self._lock:
+            for engine in ("padatious", "adapt"):
+                self._remove((engine, name))
+            self._adapt_intents.pop(name, None)
+
+    def handle_detach_skill(self, message: Message):
+        """
+        Remove all intents and vocabulary of a skill from the index.
+        :param message: `detach_skill` Message
+        """
+        skill_id = message.data.get("skill_id")
+        if not skill_id:
+            return
+        # Adapt entity types are prefixed with a modified skill_id
+        entity_skill_id = skill_id[:-1].replace('.', '_').replace('-', '_')
+        with self._lock:
+            intents = set(intent for phrases in self._phrases.values()
+                          for intent in phrases
+                          if intent[1].startswith(f"{skill_id}:"))
+            for intent in intents:
+                self._remove(intent)
+                self._adapt_intents.pop(intent[1], None)
+            for vocab in self._vocab.values():
+                for entity_type in [e for e in vocab
+                                    if e.startswith(entity_skill_id)]:
+                    vocab.pop(entity_type)
+
+    def match(self, utterances: List[str], lang: str,
+              message: Message) -> Optional[IntentMatch]:
+        """
+        Match an utterance exactly equal to one intent's template or
+        vocabulary. Phrases shared by multiple intents are not matched.
+        :param utterances: list of utterances to match
+        :param lang: language of the utterances
+        :param message: Message associated with the utterances
+        :returns: IntentMatch if an utterance matched exactly, else None
+        """
+        lang = (lang or self.lang).lower()
+        sess = SessionManager.get(message)
+        for utterance in utterances:
+            with self._lock:
+                intents = self._index.get(lang, {}).get(
+                    normalize_phrase(utterance))
+                if not intents or len(intents) != 1:
+                    continue
+                engine, name = next(iter(intents))
+                entity_type = self._adapt_intents.get(name)
+            skill_id = name.split(":")[0]
+            if name in sess.blacklisted_intents or \
+                    skill_id in sess.blacklisted_skills:
+                continue
+            LOG.debug(f"Exact {engine} match: {name}")
+            if engine == "padatious":
+                return IntentMatch("Padatious", name, dict(), skill_id,
+                                   utterance)
+            data = {"intent_type": name, "confidence": 1.0, "target": None,
+                    entity_type: utterance, "utterance": utterance}
+            return IntentMatch("Adapt", name, data, skill_id, utterance)
+        return None
@@ -27,11 +27,15 @@
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import time
-import wave
 
-from typing import List
-from neon_transformers.text_transformers import UtteranceTransformersService
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from copy import deepcopy
+from functools import partial, wraps
+from threading import Lock, Thread, local
+from typing import List, Optional
 from ovos_bus_client import Message, MessageBusClient
+from ovos_bus_client.session import SessionManager
 from neon_utils.message_utils import get_message_user
 from neon_utils.metrics_utils import Stopwatch
 from neon_utils.user_utils import apply_local_user_profile_updates
@@ -41,6 +45,23 @@ from ovos_config.locale import set_default_lang
 from ovos_utils.log import LOG
 from neon_core.configuration import Configuration
 from neon_core.language import get_lang_config
+from neon_core.language.translation_cache import TranslationCache, \
+    CachedTranslator, CachedDetector
+from neon_core.skills.concurrent_fallback import ConcurrentFallbackService
+from neon_core.skills.exact_match import ExactMatchService
+from neon_core.skills.lazy_intents import LazyIntentLanguages
+from neon_core.skills.padatious_scorer import VectorizedIntentScorer
+from neon_core.skills.parallel_converse import ParallelConverseService
+from neon_core.skills.pipeline_stats import PipelineStats, \
+    SIDE_EFFECT_STAGES, get_utterance_shape
+from neon_core.skills.transcript_writer import TranscriptWriter
+from neon_core.skills.utterance_queue import UtteranceCoalescer, \
+    UtteranceWorkerPool, ShedPolicy, get_coalesce_key, get_session_id
+from neon_core.skills.utterance_transformers import \
+    NeonUtteranceTransformersService
+from neon_core.util.cache_utils import TimedLRUCache
+from neon_core.util.padatious_cache import build_intent_cache_artifact, \
+    get_current_artifact, get_intent_cache_dir, install_intent_cache_artifact
 
 from ovos_core.intent_services import IntentService
 
@@ -58,14 +79,25 @@ except ImportError:
 # except ImportError:
 Transcribe = None
 
+ResolvedLang = namedtuple("ResolvedLang", ("lang", "native"))
+
+# Max language table entries, including requested codes not in configuration
+_MAX_LANG_TABLE_SIZE = 256
+
+# Pipeline stages with deterministic results for a given utterance and set of
+# registered intents; matches from these stages may be cached
+_CACHEABLE_STAGES = ("padatious_", "padacioso_", "adapt_")
+
 
 class NeonIntentService(IntentService):
     def __init__(self, bus: MessageBusClient):
         super().__init__(bus)
         self.config = Configuration()
         self.language_config = get_lang_config()
+        padatious_langs = self.padatious_service.containers.keys() if \
+            self.padatious_service else None
         LOG.debug(f"Languages Adapt={self.adapt_service.engines.keys()}|"
-                  f"Padatious={self.padatious_service.containers.keys()}")
+                  f"Padatious={padatious_langs}")
 
         # Initialize default user to inject into incoming messages
         try:
@@ -77,19 +109,182 @@ class NeonIntentService(IntentService):
         self._default_user['user']['username'] = "local"
         set_default_lang(self.language_config["internal"])
 
+        self._install_shared_intent_cache()
+
+        if self.padatious_service and \
+                (self.config.get("padatious") or {}).get("scorer") == "numpy":
+            for container in self.padatious_service.containers.values():
+                self._attach_padatious_scorer(container)
+
+        # Optionally create intent engines for languages on first use
+        lazy_config = self.config.get("intents", {}).get("lazy_languages") or {}
+        self._lazy_langs = None
+        if lazy_config.get("enabled"):
+            eager_langs = list(lazy_config.get("eager_langs") or [])
+            eager_langs.append(self.config.get("lang", "en-us"))
+            self._lazy_langs = LazyIntentLanguages(
+                self.bus, self.adapt_service, self.padatious_service,
+                eager_langs, lazy_config.get("idle_timeout", 3600),
+                self.config.get("padatious"),
+                self._attach_padatious_scorer if
+                (self.config.get("padatious") or {}).get("scorer") == "numpy"
+                else None)
+
         # self._setup_converse_handlers()
 
-        self.transformers = UtteranceTransformersService(self.bus, self.config)
+        self.transformers = NeonUtteranceTransformersService(
+            self.bus, self.config, (self.config.get("intents", {}).get(
+                "transformers") or {}).get("workers", 0))
+
+        self.translation_cache = None
+        self._init_translation_cache()
 
         self.transcript_service = None
         if callable(Transcribe):
             try:
-                self.transcript_service = Transcribe()
+                transcript_config = self.config.get("intents",
+                                                    {}).get("transcripts") or {}
+                self.transcript_service = TranscriptWriter(
+                    Transcribe(), transcript_config.get("audio_dir"),
+                    transcript_config.get("max_queued", 256),
+                    transcript_config.get("batch_size", 16),
+                    transcript_config.get("flush_interval", 1.0))
             except Exception as e:
                 LOG.exception(e)
 
+        # Cache final intent matches for repeated utterances
+        cache_config = self.config.get("intents", {}).get("match_cache") or {}
+        self._intent_version = 0
+        self._match_state = local()
+        self._match_cache = TimedLRUCache(
+            cache_config.get("max_entries", 512),
+            cache_config.get("ttl", 300)) if cache_config.get("enabled") \
+            else None
+
+        # Registrations are only indexed if exact matching is configured
+        pipeline = self.config.get("intents", {}).get("pipeline") or []
+        self.exact_match = ExactMatchService(
+            self.bus, self.config.get("lang", "en-us")) if \
+            "exact_high" in pipeline else None
+        self.parallel_converse = ParallelConverseService(self.bus,
+                                                         self.converse)
+        self.concurrent_fallback = ConcurrentFallbackService(self.bus,
+                                                             self.fallback)
+
+        # Optionally adapt pipeline order to observed matches
+        adaptive_config = self.config.get("intents",
+                                          {}).get("adaptive_pipeline") or {}
+        self._pipeline_stats = PipelineStats(
+            adaptive_config.get("stats_file"),
+            adaptive_config.get("min_samples", 50),
+            adaptive_config.get("explore_interval", 20),
+            adaptive_config.get("pinned") or [],
+            adaptive_config.get("reorder", False),
+            adaptive_config.get("save_interval", 60)) if \
+            adaptive_config.get("enabled") else None
+
+        # Optionally limit the time spent matching each utterance
+        budget_config = self.config.get("intents", {}).get("time_budget") or {}
+        self._budget_config = budget_config if budget_config.get("enabled") \
+            else None
+        self._budget_executor = ThreadPoolExecutor(
+            budget_config.get("workers", 8),
+            thread_name_prefix="pipeline_stage") if self._budget_config \
+            else None
+        # Stages that ran out of time and are still running
+        self._budget_abandoned = 0
+        self._budget_lock = Lock()
+
+        # Optionally match N-best hypotheses concurrently
+        speculative_config = self.config.get("intents",
+                                             {}).get("speculative_match") or {}
+        self._speculative_stages = \
+            (speculative_config.get("stages") or []) if \
+            speculative_config.get("enabled") else None
+        self._speculative_executor = ThreadPoolExecutor(
+            speculative_config.get("workers", 4),
+            thread_name_prefix="speculative_match") if \
+            self._speculative_stages else None
+
+        # Optionally transform and match partial transcripts before the final
+        # transcript is received
+        prematch_config = self.config.get("intents",
+                                          {}).get("partial_prematch") or {}
+        self._prematch_stages = \
+            (prematch_config.get("stages") or []) if \
+            prematch_config.get("enabled") else None
+        self._prematch_cache = TimedLRUCache(
+            prematch_config.get("max_entries", 64),
+            prematch_config.get("ttl", 30)) if \
+            self._prematch_stages is not None else None
+        self._prematch_executor = ThreadPoolExecutor(
+            prematch_config.get("workers", 2),
+            thread_name_prefix="partial_prematch") if \
+            self._prematch_cache is not None else None
+        self._latest_partials = dict()
+
+        # Cache padatious lookups requested via `intent.service.padatious.get`
+        padatious_cache = self.config.get("intents",
+                                          {}).get("padatious_cache") or {}
+        self._padatious_cache = TimedLRUCache(
+            padatious_cache.get("max_entries", 4096),
+            padatious_cache.get("ttl")) if \
+            padatious_cache.get("enabled", True) else None
+
+        # Optionally handle utterances on a pool of worker threads
+        queue_config = self.config.get("intents",
+                                       {}).get("utterance_queue") or {}
+        self._utterance_pool = UtteranceWorkerPool(
+            self._handle_utterance, queue_config["workers"],
+            queue_config.get("max_queued") or 0,
+            queue_config.get("max_queued_per_user") or 0,
+            queue_config.get("shed_policy") or ShedPolicy.REJECT_NEWEST,
+            self._handle_shed_utterance) if queue_config.get("workers") \
+            else None
+        self._coalescer = UtteranceCoalescer(
+            queue_config.get("duplicate_window", 0)) if \
+            queue_config.get("coalesce_duplicates") else None
+
+        self._lang_table = dict()
+        self._build_lang_table()
+
         self.bus.on("neon.profile_update", self.handle_profile_update)
         self.bus.on("neon.languages.skills", self.handle_supported_languages)
+        self.bus.on("neon.utterances.batch", self.handle_utterance_batch)
+        self.bus.on("neon.get_match_cache_stats",
+                    self.handle_get_match_cache_stats)
+        if self._prematch_cache is not None:
+            self.bus.on("neon.utterance.partial",
+                        self.handle_partial_utterance)
+        self.bus.on("intent.service.padatious.batch.get",
+                    self.handle_get_padatious_batch)
+        self.bus.on("mycroft.skills.trained", self.handle_padatious_trained)
+        self.bus.on("configuration.updated", self.handle_config_reload)
+        self.bus.on("configuration.patch", self.handle_config_reload)
+        for event in ("register_vocab", "register_intent", "detach_intent",
+                      "detach_skill", "padatious:register_intent",
+                      "padatious:register_entity", "mycroft.skills.trained"):
+            self.bus.on(event, self.handle_intents_changed)
+
+    def _init_translation_cache(self):
+        """
+        Wrap the utterance translator's translation and detection plugins
+        with a `TranslationCache` if enabled in configuration
+        """
+        cache_config = self.language_config.get("translation_cache") or {}
+        translator = self.transformers.loaded_modules.get(
+            'neon_utterance_translator_plugin')
+        if not translator or not cache_config.get("enabled"):
+            return
+        self.translation_cache = TranslationCache(
+            cache_config.get("max_entries", 4096),
+            cache_config.get("persistent", False), cache_config.get("path"))
+        if translator.translator:
+            translator.translator = CachedTranslator(translator.translator,
+                                                     self.translation_cache)
+        if translator.lang_detector:
+            translator.lang_detector = CachedDetector(
+                translator.lang_detector, self.translation_cache)
 
     @property
     def supported_languages(self) -> List[str]:
@@ -115,6 +310,18 @@ class NeonIntentService(IntentService):
                                         "native_langs": native_langs,
                                         "translate_langs": translate_langs}))
 
+    def handle_get_match_cache_stats(self, message):
+        """
+        Handle a request for aggregate intent match cache metrics
+        :param message: neon.get_match_cache_stats request
+        """
+        cache = self._match_cache
+        self.bus.emit(message.response(
+            {"enabled": cache is not None,
+             "hits": cache.hits if cache is not None else 0,
+             "misses": cache.missed if cache is not None else 0,
+             "entries": len(cache) if cache is not None else 0}))
+
     def handle_profile_update(self, message):
         updated_profile = message.data.get("profile")
         if updated_profile["user"]["username"] == \
@@ -122,13 +329,97 @@ class NeonIntentService(IntentService):
             apply_local_user_profile_updates(updated_profile,
                                              self._default_user)
 
+    def handle_intents_changed(self, message=None):
+        """
+        Handle a change to registered intents or vocabulary by invalidating
+        any cached intent matches and pipeline statistics
+        :param message: Message registering or removing intents
+        """
+        self._intent_version += 1
+        if self._pipeline_stats:
+            lang = message.data.get("lang") if message else None
+            self._pipeline_stats.reset(lang)
+        if self._match_cache is not None:
+            self._match_cache.clear()
+        if self._padatious_cache is not None:
+            self._padatious_cache.clear()
+
+    def _install_shared_intent_cache(self):
+        """
+        Seed the padatious intent cache from the current shared artifact, if
+        enabled, so that only changed intents are trained.
+        """
+        padatious_config = self.config.get("padatious") or {}
+        shared_config = padatious_config.get("shared_cache") or {}
+        if not shared_config.get("enabled") or not self.padatious_service:
+            return
+        try:
+            artifact = get_current_artifact(shared_config["path"])
+            if not artifact:
+                LOG.info(f"No intent cache artifact in "
+                         f"{shared_config['path']}")
+                return
+            install_intent_cache_artifact(
+                artifact, get_intent_cache_dir(padatious_config))
+        except Exception as e:
+            LOG.exception(f"Failed to install intent cache artifact: {e}")
+
+    @staticmethod
+    def _attach_padatious_scorer(container):
+        """
+        Score intents in a padatious container with a vectorized scorer
+        :param container: padatious IntentContainer
+        """
+        try:
+            VectorizedIntentScorer.attach(container)
+        except ImportError as e:
+            LOG.warning(f"Using default padatious scorer: {e}")
+
+    def handle_padatious_trained(self, _=None):
+        """
+        Handle initial padatious training by publishing the trained intent
+        cache as a shared artifact, if configured.
+        """
+        padatious_config = self.config.get("padatious") or {}
+        shared_config = padatious_config.get("shared_cache") or {}
+        if not shared_config.get("enabled") or \
+                not shared_config.get("publish"):
+            return
+
+        def _publish():
+            try:
+                build_intent_cache_artifact(
+                    get_intent_cache_dir(padatious_config),
+                    shared_config["path"], shared_config.get("keep", 3))
+            except Exception as e:
+                LOG.exception(f"Failed to build intent cache artifact: {e}")
+        Thread(target=_publish, daemon=True).start()
+
     def shutdown(self):
+        if self._utterance_pool:
+            self._utterance_pool.shutdown()
+        if self._lazy_langs:
+            self._lazy_langs.shutdown()
+        if self._pipeline_stats:
+            self._pipeline_stats.shutdown()
+        if self._budget_executor:
+            self._budget_executor.shutdown(wait=False)
+        if self._speculative_executor:
+            self._speculative_executor.shutdown(wait=False)
+        if self._prematch_executor:
+            self._prematch_executor.shutdown(wait=False)
         self.transformers.shutdown()
+        if self.transcript_service:
+            self.transcript_service.shutdown()
+        if self.translation_cache:
+            self.translation_cache.shutdown()
 
     def _save_utterance_transcription(self, message):
         """
-        Record a user utterance with the transcript_service.
-        Adds the `audio_file` context to message context.
+        Queue a user utterance to be recorded by the transcript_service.
+        Adds the `audio_file` context to message context; the transcript is
+        written asynchronously and may not be saved yet when the message is
+        handled.
 
         Args:
             message (Message): message associated with user input
@@ -136,12 +427,9 @@ class NeonIntentService(IntentService):
         if self.transcript_service:
             # TODO: Read transcription preferences here DM
             audio = message.context.get("raw_audio")  # This is a tempfile
-            if audio:
-                audio = wave.open(audio, 'r')
-                audio = audio.readframes(audio.getnframes())
             timestamp = message.context["timing"].get("transcribed",
                                                       time.time())
-            audio_file = self.transcript_service.write_transcript(
+            audio_file = self.transcript_service.submit(
                 get_message_user(message),
                 message.data.get('utterances', [''])[0], timestamp, audio)
             message.context["audio_file"] = audio_file
@@ -160,6 +448,117 @@ class NeonIntentService(IntentService):
         message.data["utterances"] = utterances
         return message
 
+    def _init_timing(self, message: Message, utt_received: float):
+        """
+        Add or init timing data in message context
+        :param message: Message associated with user request
+        :param utt_received: timestamp when the request was received
+        """
+        message.context.setdefault("timing", dict())
+        message.context["timing"]["handle_utterance"] = utt_received
+        if message.context["timing"].get("client_sent") and \
+                not message.context["timing"].get("client_to_core"):
+            message.context["timing"]["client_to_core"] = \
+                utt_received - message.context["timing"]["client_sent"]
+
+    def _build_lang_table(self):
+        """
+        Precompute resolved languages for configured language codes so
+        utterance language resolution is a lookup. Translator languages are
+        added in a background thread since they may require a remote request.
+        """
+        table = dict()
+        self._add_lang_table_entries(
+            table, [None, self.language_config["user"],
+                    self.language_config["internal"]] +
+            list(self.language_config.get("supported_langs") or []))
+        self._lang_table = table
+        Thread(target=self._add_translator_langs, args=(table,),
+               daemon=True).start()
+
+    def _add_translator_langs(self, table: dict):
+        """
+        Add the utterance translator's available languages to a language table
+        :param table: language table to update
+        """
+        translator = self.transformers.loaded_modules.get(
+            'neon_utterance_translator_plugin')
+        if not translator or not translator.translator:
+            return
+        try:
+            self._add_lang_table_entries(
+                table, list(translator.translator.available_languages))
+        except Exception as e:
+            LOG.error(f"Failed to get translator languages: {e}")
+        LOG.debug(f"Built language table with {len(table)} entries")
+
+    def _add_lang_table_entries(self, table: dict, requested: list):
+        """
+        Add resolved languages to a language table
+        :param table: language table to update
+        :param requested: list of requested language codes to resolve
+        """
+        for lang in requested:
+            resolved = self._get_resolved_lang(lang)
+            table[lang] = resolved
+            # Resolved codes resolve to themselves
+            table.setdefault(resolved.lang, resolved)
+
+    def _get_resolved_lang(self, requested_lang: Optional[str]) -> \
+            ResolvedLang:
+        """
+        Resolve a requested language code to a full language code and whether
+        that language is handled natively or translated
+        :param requested_lang: requested language code, if any
+        :returns: ResolvedLang for the requested language
+        """
+        lang = get_full_lang_code(requested_lang or
+                                  self.language_config["user"])
+        if requested_lang and \
+                requested_lang.split('-')[0] != lang.split('-')[0]:
+            lang = get_full_lang_code(requested_lang.split('-')[0])
+            if lang.split('-')[0] != requested_lang.split('-')[0] and \
+                    '-' in requested_lang:
+                # Unknown to lingua_franca; trust the full requested code
+                lang = requested_lang
+            LOG.warning(f"requested={requested_lang}|resolved={lang}")
+        return ResolvedLang(lang, lang.split('-')[0] in
+                            self.supported_languages)
+
+    def _lookup_lang(self, requested_lang: Optional[str]) -> ResolvedLang:
+        """
+        Look up a requested language code in the language table, adding it to
+        the table if it is not yet known
+        :param requested_lang: requested language code, if any
+        :returns: ResolvedLang for the requested language
+        """
+        resolved = self._lang_table.get(requested_lang)
+        if resolved is None:
+            resolved = self._get_resolved_lang(requested_lang)
+            if len(self._lang_table) < _MAX_LANG_TABLE_SIZE:
+                self._lang_table[requested_lang] = resolved
+        return resolved
+
+    def handle_config_reload(self, _=None):
+        """
+        Handle a configuration change by reloading language configuration and
+        rebuilding the language table
+        """
+        self.language_config = get_lang_config()
+        self._build_lang_table()
+
+    def _resolve_lang(self, message: Message) -> str:
+        """
+        Resolve the full language code of an utterance and update
+        `message.data['lang']` accordingly
+        :param message: Message associated with user request
+        :returns: full language code of the utterance
+        """
+        lang = self._lookup_lang(message.data.get('lang')).lang
+        message.data["lang"] = lang
+        LOG.debug(f"message_lang={lang}")
+        return lang
+
     def handle_utterance(self, message):
         """
         Handler for 'recognizer_loop:utterance'
@@ -172,40 +571,150 @@ class NeonIntentService(IntentService):
 
         # Notify emitting module that skills is handling this utterance
         self.bus.emit(message.response())
+        self._submit_utterance(message, utt_received)
 
-        # Add or init timing data
-        message.context.setdefault("timing", dict())
-        message.context["timing"]["handle_utterance"] = utt_received
-        if message.context["timing"].get("client_sent") and \
-                not message.context["timing"].get("client_to_core"):
-            message.context["timing"]["client_to_core"] = \
-                utt_received - message.context["timing"]["client_sent"]
+    def _submit_utterance(self, message: Message, utt_received: float,
+                          on_done: Optional[callable] = None):
+        """
+        Handle an utterance on the worker pool if enabled, else on the calling
+        thread, unless it duplicates a request that is being handled.
+        :param message: Message associated with user request
+        :param utt_received: timestamp when the request was received
+        :param on_done: callable that accepts the Message and an error string
+            (None if handled), called once the utterance is handled or dropped
+        """
+        if self._coalescer and \
+                not self._coalescer.start(get_coalesce_key(message)):
+            LOG.info(f"Ignoring duplicate utterance: "
+                     f"{message.data.get('utterances')}")
+            self._abort_utterance(message, "duplicate")
+            if on_done:
+                on_done(message, "duplicate")
+            return
 
+        self._init_timing(message, utt_received)
+        if self._utterance_pool:
+            self._utterance_pool.submit(message, on_done)
+            return
+        error = None
         try:
-            # Get language of the utterance
-            requested_lang = message.data.get('lang')
-            lang = get_full_lang_code(
-                message.data.get('lang') or self.language_config["user"])
-            if requested_lang and \
-                    requested_lang.split('-')[0] != lang.split('-')[0]:
-                lang = get_full_lang_code(requested_lang.split('-')[0])
-                LOG.warning(f"requested={requested_lang}|resolved={lang}")
-            message.data["lang"] = lang
-            LOG.debug(f"message_lang={lang}")
+            self._handle_utterance(message)
         except Exception as e:
             LOG.exception(e)
-            if '-' not in message.data.get("lang", ""):
-                raise RuntimeError(f"Full `lang` code not in message.data: "
-                                   f"{message.data}")
-            lang = message.data["lang"]
+            error = repr(e)
+        if on_done:
+            on_done(message, error)
+
+    def _handle_shed_utterance(self, message: Message, reason: str):
+        """
+        Notify the emitting module that an utterance was shed by admission
+        control and will not be handled.
+        :param message: Message associated with the shed request
+        :param reason: reason the utterance was shed
+        """
+        if self._coalescer:
+            self._coalescer.finish(get_coalesce_key(message), False)
+        self._abort_utterance(message, reason)
+
+    def _abort_utterance(self, message: Message, reason: str):
+        """
+        Notify the emitting module that an utterance will not be handled.
+        :param message: Message associated with the request
+        :param reason: reason the utterance is not handled
+        """
+        self.bus.emit(message.reply('intent_aborted',
+                                    {'utterances': message.data.get(
+                                        'utterances', []),
+                                     'lang': message.data.get('lang'),
+                                     'reason': reason}))
 
+    def _handle_utterance(self, message: Message):
+        """
+        Resolve language and handle an utterance. This is called from the
+        utterance worker pool if enabled.
+        :param message: Message associated with user request
+        """
+        key = get_coalesce_key(message) if self._coalescer else None
         try:
-            # Ensure user profile data is present
-            if "user_profiles" not in message.context:
-                message.context["user_profiles"] = [self._default_user.content]
-                message.context["username"] = \
-                    self._default_user.content["user"]["username"]
+            lang = self._resolve_lang(message)
+            self._process_utterance(message, lang)
+        finally:
+            if key:
+                duplicates = self._coalescer.finish(key)
+                if duplicates:
+                    LOG.debug(f"Coalesced {duplicates} duplicate requests")
+
+    def handle_utterance_batch(self, message):
+        """
+        Handler for 'neon.utterances.batch'
+        Handles a list of utterance requests, sharing setup across the batch.
+        Each request is handled like a `recognizer_loop:utterance`, including
+        the worker pool, admission control and duplicate coalescing. A
+        `neon.utterances.batch.result` is emitted for each request with its
+        index and timing context, or an `error` if it was not handled; results
+        of requests in different sessions may be emitted out of order.
+
+        Arguments:
+            message (Message): message with `requests`, a list of dicts with
+                `utterances` and optional `lang` and `context`
+        """
+        batch_received = time.time()
+        requests = message.data.get("requests") or []
 
+        # Notify emitting module that skills is handling this batch
+        self.bus.emit(message.response({"count": len(requests)}))
+
+        # Default user and resolved languages are shared by the whole batch
+        base = Message(message.msg_type, {}, deepcopy(message.context))
+        self._add_default_user(base)
+        resolved_langs = dict()
+        for idx, request in enumerate(requests):
+            context = deepcopy(base.context)
+            context.update(request.get("context") or {})
+            item = Message("recognizer_loop:utterance",
+                           {"utterances": request.get("utterances") or [],
+                            "lang": request.get("lang")}, context)
+            requested_lang = item.data["lang"]
+            try:
+                if requested_lang not in resolved_langs:
+                    resolved_langs[requested_lang] = \
+                        self._lookup_lang(requested_lang).lang
+            except Exception as e:
+                LOG.exception(e)
+                self._emit_batch_result(message, idx, item, repr(e))
+                continue
+            item.data["lang"] = resolved_langs[requested_lang]
+            self._submit_utterance(item, batch_received,
+                                   partial(self._emit_batch_result,
+                                           message, idx))
+
+    def _emit_batch_result(self, batch: Message, idx: int, item: Message,
+                           error: Optional[str] = None):
+        """
+        Emit the result of one request in an utterance batch
+        :param batch: `neon.utterances.batch` Message
+        :param idx: index of the request in the batch
+        :param item: utterance Message created for the request
+        :param error: reason the request was not handled, if any
+        """
+        data = {"index": idx}
+        if error:
+            data["error"] = error
+        else:
+            data["utterances"] = item.data["utterances"]
+            data["lang"] = item.data["lang"]
+        self.bus.emit(batch.reply("neon.utterances.batch.result", data,
+                                  item.context))
+
+    def _process_utterance(self, message: Message, lang: str):
+        """
+        Run an utterance with a resolved language through transcription,
+        transformers, and intent matching.
+        :param message: Message associated with user request
+        :param lang: full language code of the utterance
+        """
+        try:
+            self._add_default_user(message)
             stopwatch = Stopwatch()
 
             # TODO: Consider saving transcriptions after text parsers cleanup
@@ -216,9 +725,18 @@ class NeonIntentService(IntentService):
                 self._save_utterance_transcription(message)
             message.context["timing"]["save_transcript"] = stopwatch.time
 
-            # Get text parser context
+            # Get text parser context, unless it was already done for a
+            # partial transcript of this utterance
+            prematched = self._prematch_cache.pop(
+                (get_session_id(message), tuple(message.data["utterances"]),
+                 lang)) if self._prematch_cache is not None else None
             with stopwatch:
-                message = self._get_parsers_service_context(message, lang)
+                if prematched:
+                    message.data["utterances"] = \
+                        list(prematched["utterances"])
+                    message.context.update(deepcopy(prematched["context"]))
+                else:
+                    message = self._get_parsers_service_context(message, lang)
             # TODO: `text_parsers` timing context left for backwards-compat.
             message.context["timing"]["text_parsers"] = stopwatch.time
             message.context["timing"]["transform_utterance"] = stopwatch.time
@@ -237,43 +755,517 @@ class NeonIntentService(IntentService):
                 self.bus.emit(reply)
                 return
 
-            if message.data["lang"].split('-')[0] in self.supported_languages:
-                LOG.debug(f'Native language support ({message.data["lang"]})')
-                if message.context.get("translation_data") and \
-                    message.context.get("translation_data")[0].get(
-                        "was_translated"):
-                    # TODO: Patching translation plugin supported language check
-                    LOG.warning(f"Translated supported input!")
-                    real_utterances = [message.context.get(
-                        "translation_data")[0].get("raw_utterance")]
-                    message.data["utterances"] = real_utterances
-            # If translated, make sure message.data['lang'] is updated
-            elif message.context.get("translation_data") and \
-                    message.context.get("translation_data")[0].get(
-                        "was_translated"):
-                LOG.info(f"Using utterance translated to: "
-                         f"{self.language_config['internal']}")
-                message.data["lang"] = self.language_config["internal"]
+            self._apply_translation_data(message)
             # now pass our modified message to Mycroft
             # TODO: Consider how to implement 'and' parsing and converse DM
             LOG.info(f"lang={message.data['lang']} "
                      f"{message.data.get('utterances')}")
-            super().handle_utterance(message)
+            if self._lazy_langs:
+                with stopwatch:
+                    self._lazy_langs.ensure_loaded(message.data["lang"])
+                message.context["timing"]["load_lang"] = stopwatch.time
+            prediction = None
+            if prematched:
+                message.context["timing"]["prematched"] = True
+                if prematched["intent_version"] == self._intent_version and \
+                        prematched["normalized"] == \
+                        message.data["utterances"] and \
+                        prematched["lang"] == message.data["lang"]:
+                    prediction = prematched["prediction"]
+            self._match_and_dispatch(message, prediction)
         except Exception as err:
             LOG.exception(err)
 
+    def _add_default_user(self, message: Message):
+        """
+        Add the default user profile to a message without user profile data
+        :param message: Message associated with user request
+        """
+        if "user_profiles" not in message.context:
+            message.context["user_profiles"] = [self._default_user.content]
+            message.context["username"] = \
+                self._default_user.content["user"]["username"]
+
+    def _apply_translation_data(self, message: Message):
+        """
+        Use raw utterances for natively supported languages that were
+        translated, or update the message `lang` for translated utterances
+        :param message: Message with normalized `utterances`
+        """
+        if self._lookup_lang(message.data["lang"]).native:
+            LOG.debug(f'Native language support ({message.data["lang"]})')
+            if message.context.get("translation_data") and \
+                message.context.get("translation_data")[0].get(
+                    "was_translated"):
+                # TODO: Patching translation plugin supported language check
+                LOG.warning(f"Translated supported input!")
+                real_utterances = [message.context.get(
+                    "translation_data")[0].get("raw_utterance")]
+                message.data["utterances"] = real_utterances
+        # If translated, make sure message.data['lang'] is updated
+        elif message.context.get("translation_data") and \
+                message.context.get("translation_data")[0].get(
+                    "was_translated"):
+            LOG.info(f"Using utterance translated to: "
+                     f"{self.language_config['internal']}")
+            message.data["lang"] = self.language_config["internal"]
+
+    def handle_partial_utterance(self, message: Message):
+        """
+        Handler for 'neon.utterance.partial'
+        Transforms and matches a partial transcript in the background. If the
+        final utterance has the same transcript, the transformer output and
+        matches are reused. A `neon.intent.predicted` message is emitted when
+        a partial transcript matches an intent so the skill can prepare.
+        :param message: Message with partial `utterances` and optional `lang`
+        """
+        self._latest_partials[get_session_id(message)] = message
+        self._prematch_executor.submit(self._prematch_partial, message)
+
+    def _prematch_partial(self, message: Message):
+        """
+        Transform and match a partial transcript, caching the results for the
+        final utterance.
+        :param message: Message with partial `utterances` and optional `lang`
+        """
+        session_id = get_session_id(message)
+        if self._latest_partials.get(session_id) is not message:
+            # A newer partial transcript was received
+            return
+        try:
+            partial = Message(message.msg_type, deepcopy(message.data),
+                              deepcopy(message.context))
+            lang = self._resolve_lang(partial)
+            raw = tuple(partial.data.get("utterances") or [])
+            self._add_default_user(partial)
+            context = deepcopy(partial.context)
+            partial = self._get_parsers_service_context(partial, lang)
+            cached = {"utterances": list(partial.data["utterances"]),
+                      "context": {k: v for k, v in partial.context.items()
+                                  if k != "timing" and context.get(k) != v},
+                      "intent_version": self._intent_version,
+                      "prediction": None}
+            partial.data["utterances"] = [u.lower().strip() for u in
+                                          partial.data["utterances"]
+                                          if u.strip()]
+            if partial.data["utterances"]:
+                self._apply_translation_data(partial)
+                cached["prediction"] = self._match_speculative(
+                    partial, self._prematch_stages)
+            cached["normalized"] = partial.data["utterances"]
+            cached["lang"] = partial.data["lang"]
+            self._prematch_cache.put((session_id, raw, lang), cached)
+            predicted = [(stage, match) for stage, match in
+                         (cached["prediction"] or {}).items() if match]
+            if predicted:
+                stage, match = predicted[0]
+                LOG.debug(f"Predicted {match.intent_type} from {raw}")
+                self.bus.emit(message.forward("neon.intent.predicted",
+                                              {"skill_id": match.skill_id,
+                                               "intent_type":
+                                                   match.intent_type,
+                                               "utterance": match.utterance,
+                                               "stage": stage}))
+        except Exception as e:
+            LOG.exception(e)
+        finally:
+            if self._latest_partials.get(session_id) is message:
+                self._latest_partials.pop(session_id)
+
+    def _get_match_cache_key(self, message: Message) -> Optional[tuple]:
+        """
+        Build a match cache key for a normalized utterance message
+        :param message: Message with normalized `utterances` and full `lang`
+        :returns: hashable key, or None if this message should not be cached
+        """
+        sess = SessionManager.get(message)
+        if sess.context.frame_stack:
+            # Adapt matches depend on injected context
+            return None
+        return (tuple(message.data["utterances"]), message.data["lang"],
+                self._intent_version,
+                tuple(sorted(skill[0] for skill in sess.active_skills)))
+
+    def _match_and_dispatch(self, message: Message,
+                            prediction: Optional[dict] = None):
+        """
+        Run the intent pipeline for a normalized utterance, using and updating
+        the match cache and pipeline statistics if enabled.
+        :param message: Message with normalized `utterances` and full `lang`
+        :param prediction: dict of stage name to IntentMatch or None, matched
+            from a partial transcript of this utterance
+        """
+        key = None
+        if self._match_cache is not None:
+            key = self._get_match_cache_key(message)
+            cached = self._match_cache.get(key) if key else None
+            message.context["timing"]["match_cache_hit"] = cached is not None
+            self._match_state.cached = cached
+            self._match_state.trace = list() if key and not cached else None
+        self._match_state.message = message
+        self._match_state.stage_trace = list() if self._pipeline_stats \
+            else None
+        self._match_state.deadline = time.monotonic() + \
+            self._budget_config.get("total", 10) if self._budget_config \
+            else None
+        self._match_state.speculative = prediction
+        # Hypotheses are matched when the pipeline reaches the first
+        # speculative stage, after stages like stop and converse
+        self._match_state.speculate = prediction is None and \
+            bool(self._speculative_stages) and \
+            len(message.data["utterances"]) > 1
+        try:
+            super().handle_utterance(message)
+            trace = getattr(self._match_state, "trace", None)
+            if trace:
+                matched = [(stage, match) for stage, match in trace if match]
+                stage, match = matched[-1] if matched else (None, None)
+                self._match_cache.put(key, {"stage": stage, "match": match,
+                                            "skipped": [s for s, m in trace
+                                                        if not m]})
+            stage_trace = self._match_state.stage_trace
+            if stage_trace:
+                self._pipeline_stats.record(
+                    message.data["lang"],
+                    get_utterance_shape(message.data["utterances"]),
+                    stage_trace)
+        finally:
+            self._match_state.cached = None
+            self._match_state.trace = None
+            self._match_state.message = None
+            self._match_state.stage_trace = None
+            self._match_state.deadline = None
+            self._match_state.speculative = None
+            self._match_state.speculate = False
+
+    @staticmethod
+    def _get_match_confidence(match) -> float:
+        """
+        Get the confidence of an intent match, if reported by the engine
+        :param match: IntentMatch returned by a pipeline stage
+        :returns: match confidence, or 0.0 if not reported
+        """
+        if isinstance(match.intent_data, dict):
+            return match.intent_data.get("confidence") or \
+                match.intent_data.get("conf") or 0.0
+        return 0.0
+
+    def _match_speculative(self, message: Message, stage_names: List[str],
+                           executor: Optional[ThreadPoolExecutor] = None) -> \
+            Optional[dict]:
+        """
+        Run each hypothesis through the given pipeline stages, stopping at the
+        first stage that matches it. Only the first stage in pipeline order
+        matched by any hypothesis is selected, with the highest confidence
+        match among those hypotheses. Ties are resolved in hypothesis order.
+        :param message: Message with normalized `utterances` and full `lang`
+        :param stage_names: names of pipeline stages to match
+        :param executor: executor to match hypotheses concurrently on
+        :returns: dict of stage name to selected IntentMatch, or None for
+            earlier stages that no hypothesis matched. Later stages are not
+            included and should be matched normally.
+        """
+        stages = [(stage, match_func) for stage, match_func in
+                  self._get_stage_matchers(session=SessionManager.get(message))
+                  if stage in stage_names]
+        if not stages:
+            return None
+        lang = message.data["lang"]
+        if self._lazy_langs:
+            self._lazy_langs.ensure_loaded(lang)
+
+        def _first_match(utterance):
+            for stage, match_func in stages:
+                try:
+                    match = match_func([utterance], lang, message)
+                except Exception as e:
+                    LOG.exception(f"{stage} failed: {e}")
+                    match = None
+                if match:
+                    return stage, match
+            return None, None
+
+        if executor:
+            futures = [executor.submit(_first_match, utterance)
+                       for utterance in message.data["utterances"]]
+            results = [future.result() for future in futures]
+        else:
+            results = [_first_match(utterance)
+                       for utterance in message.data["utterances"]]
+        order = [stage for stage, _ in stages]
+        matched = [(order.index(stage), match) for stage, match in results
+                   if stage]
+        first = min(idx for idx, _ in matched) if matched else len(order)
+        selected = {stage: None for stage in order[:first + 1]}
+        for idx, match in matched:
+            if idx == first and (selected[order[idx]] is None or
+                                 self._get_match_confidence(match) >
+                                 self._get_match_confidence(
+                                     selected[order[idx]])):
+                selected[order[idx]] = match
+        LOG.debug(f"Speculative matches: "
+                  f"{[(s, m.intent_type) for s, m in selected.items() if m]}")
+        return selected
+
+    def _wrap_speculative_matcher(self, stage: str, match_func: callable) -> \
+            callable:
+        """
+        Wrap a pipeline matcher to return the match selected for the current
+        utterance, if it was matched speculatively or from a partial
+        transcript. The first wrapped stage the pipeline reaches starts
+        speculative matching of the remaining speculative stages.
+        :param stage: name of the pipeline stage
+        :param match_func: pipeline matcher to wrap
+        :returns: wrapped matcher
+        """
+        @wraps(match_func)
+        def matcher(utterances, lang, message):
+            if stage in (self._speculative_stages or []) and \
+                    getattr(self._match_state, "speculate", False):
+                self._match_state.speculate = False
+                start = time.monotonic()
+                self._match_state.speculative = self._match_speculative(
+                    message, self._speculative_stages,
+                    self._speculative_executor)
+                message.context["timing"]["speculative_match"] = \
+                    time.monotonic() - start
+            speculative = getattr(self._match_state, "speculative", None)
+            if speculative is not None and stage in speculative:
+                return speculative[stage]
+            return match_func(utterances, lang, message)
+        return matcher
+
+    def _wrap_cached_matcher(self, stage: str, match_func: callable) -> \
+            callable:
+        """
+        Wrap a cacheable pipeline matcher to return a cached result for the
+        current utterance, or record the result of a new match.
+        :param stage: name of the pipeline stage
+        :param match_func: pipeline matcher to wrap
+        :returns: wrapped matcher
+        """
+        @wraps(match_func)
+        def matcher(utterances, lang, message):
+            cached = getattr(self._match_state, "cached", None)
+            if cached:
+                if cached["stage"] == stage:
+                    return cached["match"]
+                if stage in cached["skipped"]:
+                    return None
+            match = match_func(utterances, lang, message)
+            trace = getattr(self._match_state, "trace", None)
+            if trace is not None:
+                trace.append((stage, match))
+            return match
+        return matcher
+
+    def _wrap_budget_matcher(self, stage: str, match_func: callable) -> \
+            callable:
+        """
+        Wrap a pipeline matcher to return no match if it takes longer than
+        its time slice or the remaining time budget for the utterance. Stages
+        are skipped once the budget is used up. Stages with side effects are
+        never abandoned once started, and stages are skipped while
+        `max_abandoned` abandoned stages are still running. Overruns and
+        skipped stages are added to the message timing context.
+        :param stage: name of the pipeline stage
+        :param match_func: pipeline matcher to wrap
+        :returns: wrapped matcher
+        """
+        config = self._budget_config
+        if stage in (config.get("exempt") or []):
+            return match_func
+        # Stages that may act on an utterance cannot be abandoned safely
+        timed = not stage.startswith(SIDE_EFFECT_STAGES)
+        stage_limit = (config.get("stages") or {}).get(
+            stage, config.get("default_stage", 2))
+        max_abandoned = config.get("max_abandoned",
+                                   max(config.get("workers", 8) // 2, 1))
+
+        @wraps(match_func)
+        def matcher(utterances, lang, message):
+            deadline = getattr(self._match_state, "deadline", None)
+            if deadline is None:
+                return match_func(utterances, lang, message)
+            timing = message.context.setdefault("timing", dict())
+            timeout = min(stage_limit, deadline - time.monotonic())
+            if timeout <= 0:
+                LOG.warning(f"Time budget exhausted; skipping {stage}")
+                timing.setdefault("budget_skipped", list()).append(stage)
+                return None
+            if not timed:
+                return match_func(utterances, lang, message)
+            with self._budget_lock:
+                overloaded = self._budget_abandoned >= max_abandoned
+            if overloaded:
+                LOG.error(f"{self._budget_abandoned} stages are still running "
+                          f"after running out of time; skipping {stage}")
+                timing.setdefault("budget_skipped", list()).append(stage)
+                return None
+            future = self._budget_executor.submit(match_func, utterances,
+                                                  lang, message)
+            try:
+                return future.result(timeout)
+            except TimeoutError:
+                LOG.warning(f"{stage} exceeded {timeout}s; continuing")
+                timing.setdefault("budget_overruns", dict())[stage] = timeout
+                with self._budget_lock:
+                    self._budget_abandoned += 1
+                future.add_done_callback(self._release_abandoned_stage)
+                return None
+        return matcher
+
+    def _release_abandoned_stage(self, _):
+        with self._budget_lock:
+            self._budget_abandoned -= 1
+
+    def _wrap_stats_matcher(self, stage: str, match_func: callable) -> \
+            callable:
+        """
+        Wrap a pipeline matcher to record its result and duration for
+        pipeline statistics.
+        :param stage: name of the pipeline stage
+        :param match_func: pipeline matcher to wrap
+        :returns: wrapped matcher
+        """
+        @wraps(match_func)
+        def matcher(utterances, lang, message):
+            start = time.monotonic()
+            match = match_func(utterances, lang, message)
+            trace = getattr(self._match_state, "stage_trace", None)
+            if trace is not None:
+                trace.append((stage, bool(match), time.monotonic() - start))
+            return match
+        return matcher
+
+    def _get_neon_matchers(self) -> dict:
+        """
+        Get pipeline matchers added by Neon
+        :returns: dict of pipeline stage name to match function
+        """
+        matchers = dict()
+        if self.exact_match:
+            matchers["exact_high"] = self.exact_match.match
+        if self.parallel_converse.enabled:
+            matchers["converse"] = self.parallel_converse.match
+        if self.concurrent_fallback.enabled:
+            matchers["fallback_high"] = self.concurrent_fallback.high_prio
+            matchers["fallback_medium"] = self.concurrent_fallback.medium_prio
+            matchers["fallback_low"] = self.concurrent_fallback.low_prio
+        return matchers
+
+    def _get_stage_matchers(self, skips=None, session=None) -> list:
+        """
+        Get the unwrapped matchers for the stages of a session's pipeline
+        :param skips: list of stage names to exclude
+        :param session: Session to get the pipeline of
+        :returns: list of (stage name, match function) in pipeline order
+        """
+        session = session or SessionManager.get()
+        skips = skips or []
+        neon_matchers = self._get_neon_matchers()
+        matchers = dict(super().get_pipeline(list(skips) +
+                                             list(neon_matchers), session))
+        matchers.update(neon_matchers)
+        return [(stage, matchers[stage]) for stage in session.pipeline
+                if stage in matchers and stage not in skips]
+
+    def get_pipeline(self, skips=None, session=None):
+        pipeline = self._get_stage_matchers(skips, session)
+        if self._budget_config:
+            # Innermost wrapper; matchers may run on another thread
+            pipeline = [(stage, self._wrap_budget_matcher(stage, match_func))
+                        for stage, match_func in pipeline]
+        precomputed = (self._speculative_stages or []) + \
+            (self._prematch_stages or [])
+        if precomputed:
+            pipeline = [(stage, self._wrap_speculative_matcher(stage,
+                                                               match_func))
+                        if stage in precomputed else
+                        (stage, match_func) for stage, match_func in pipeline]
+        if self._match_cache is not None:
+            pipeline = [(stage, self._wrap_cached_matcher(stage, match_func))
+                        if stage.startswith(_CACHEABLE_STAGES) else
+                        (stage, match_func) for stage, match_func in pipeline]
+        message = getattr(self._match_state, "message", None)
+        if self._pipeline_stats and message is not None:
+            plan = self._pipeline_stats.plan(
+                message.data["lang"],
+                get_utterance_shape(message.data["utterances"]),
+                [stage for stage, _ in pipeline])
+            message.context["timing"]["adaptive_pipeline"] = plan
+            pipeline = dict(pipeline)
+            pipeline = [(stage, self._wrap_stats_matcher(stage,
+                                                         pipeline[stage]))
+                        for stage in plan["order"]]
+        return pipeline
+
+    def _calc_padatious(self, utterance: str, norm: str,
+                        lang: Optional[str]) -> Optional[dict]:
+        """
+        Get the padatious intent for an utterance, falling back to the
+        normalized utterance if the raw utterance doesn't match. Results are
+        cached until registered intents change.
+        :param utterance: raw utterance to match
+        :param norm: normalized utterance to match
+        :param lang: language of the utterance
+        :returns: dict intent data if matched, else None
+        """
+        if not self.padatious_service:
+            return None
+        key = (utterance, norm, lang, self._intent_version)
+        if self._padatious_cache is not None:
+            cached = self._padatious_cache.get(key)
+            if cached is not None:
+                return deepcopy(cached) or None
+        intent = self.padatious_service.calc_intent(utterance, lang)
+        if not intent and norm != utterance:
+            intent = self.padatious_service.calc_intent(norm, lang)
+        intent = dict(intent.__dict__) if intent else None
+        # Don't cache results while intents are training
+        if self._padatious_cache is not None and \
+                self.padatious_service.finished_training_event.is_set() and \
+                key[-1] == self._intent_version:
+            self._padatious_cache.put(key, deepcopy(intent) or dict())
+        return intent
+
     def handle_get_padatious(self, message):
         # TODO: Override to explicitly handle language
         utterance = message.data["utterance"]
         language = message.data.get("lang")
         norm = message.data.get('norm_utt', utterance)
-        if language not in self.padatious_service.containers:
+        if self._lazy_langs and language:
+            self._lazy_langs.ensure_loaded(language)
+        if self.padatious_service and \
+                language not in self.padatious_service.containers:
             LOG.warning(f"{language} not found in padatious containers "
                         f"{self.padatious_service.containers}")
-        intent = self.padatious_service.calc_intent(utterance, language)
-        if not intent and norm != utterance:
-            intent = self.padatious_service.calc_intent(norm, language)
-        if intent:
-            intent = intent.__dict__
+        intent = self._calc_padatious(utterance, norm, language)
         self.bus.emit(message.reply("intent.service.padatious.reply",
                                     {"intent": intent}))
+
+    def handle_get_padatious_batch(self, message):
+        """
+        Handle a request for the padatious intents of many utterances.
+        Emits `intent.service.padatious.batch.reply` with a list of intents
+        in the same order as the requested utterances.
+        :param message: Message with `utterances`, optional `norm_utts`, and
+            optional `lang`
+        """
+        utterances = message.data.get("utterances") or []
+        norm_utts = message.data.get("norm_utts") or utterances
+        language = message.data.get("lang")
+        if len(norm_utts) != len(utterances):
+            LOG.warning(f"Got {len(norm_utts)} normalized utterances for "
+                        f"{len(utterances)} utterances; ignoring norm_utts")
+            norm_utts = utterances
+        if self._lazy_langs and language:
+            self._lazy_langs.ensure_loaded(language)
+        if self.padatious_service and \
+                language not in self.padatious_service.containers:
+            LOG.warning(f"{language} not found in padatious containers "
+                        f"{self.padatious_service.containers}")
+        intents = [self._calc_padatious(utt, norm, language)
+                   for utt, norm in zip(utterances, norm_utts)]
+        self.bus.emit(message.reply("intent.service.padatious.batch.reply",
+                                    {"intents": intents}))
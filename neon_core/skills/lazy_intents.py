@@ -0,0 +1,263 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from os.path import isfile
+from threading import Event, RLock, Thread
+from time import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ovos_bus_client import Message
+from ovos_bus_client.util import get_message_lang
+from ovos_utils.log import LOG
+
+from neon_core.util.padatious_cache import get_intent_cache_dir
+
+
+class LazyIntentLanguages:
+    """
+    Creates Adapt engines and Padatious containers for non-default languages
+    on demand and evicts them after a period without use. Registrations for
+    these languages are recorded so that a language may be (re)loaded at any
+    time.
+    """
+    def __init__(self, bus, adapt_service, padatious_service=None,
+                 eager_langs: Iterable[str] = (), idle_timeout: float = 3600,
+                 padatious_config: Optional[dict] = None,
+                 on_container_created: Optional[callable] = None):
+        """
+        :param bus: MessageBusClient to listen for registrations on
+        :param adapt_service: AdaptService to manage engines for
+        :param padatious_service: PadatiousService to manage containers for
+        :param eager_langs: languages to keep loaded at all times
+        :param idle_timeout: seconds after last use to evict a language
+            (0 never evicts)
+        :param padatious_config: `padatious` configuration
+        :param on_container_created: callable that accepts each padatious
+            IntentContainer created for a lazy language
+        """
+        self.bus = bus
+        self.adapt_service = adapt_service
+        self.padatious_service = padatious_service
+        self.idle_timeout = idle_timeout
+        padatious_config = padatious_config or dict()
+        self._intent_cache = get_intent_cache_dir(padatious_config)
+        self._single_thread = padatious_config.get("single_thread", False)
+        self._on_container_created = on_container_created
+        self._lock = RLock()
+        self._eager = set(lang.lower() for lang in eager_langs)
+        # lang: last used timestamp for loaded lazy languages
+        self._loaded: Dict[str, float] = dict()
+        # lang: list of (registration type, data) to replay on load
+        self._registrations: Dict[str, List[Tuple[str, dict]]] = dict()
+        self.lazy_langs = self._unload_lazy_langs()
+
+        self.bus.on("register_vocab", self._record_vocab)
+        self.bus.on("padatious:register_intent", self._record_padatious)
+        self.bus.on("padatious:register_entity", self._record_padatious)
+        self.bus.on("detach_intent", self._handle_detach_intent)
+        self.bus.on("detach_skill", self._handle_detach_skill)
+
+        self._stopping = Event()
+        if self.idle_timeout:
+            Thread(target=self._evict_idle_loop, daemon=True,
+                   name="lazy_intent_eviction").start()
+
+    def _unload_lazy_langs(self) -> List[str]:
+        """
+        Remove empty engines and containers created at startup for languages
+        that are not loaded eagerly.
+        :returns: list of languages to load lazily
+        """
+        langs = set(lang.lower() for lang in self.adapt_service.engines)
+        if self.padatious_service:
+            langs.update(self.padatious_service.containers.keys())
+        lazy = sorted(langs - self._eager)
+        for lang in lazy:
+            self._drop(lang)
+            self._registrations[lang] = list()
+        LOG.info(f"Lazily loading intents for: {lazy}")
+        return lazy
+
+    def is_loaded(self, lang: str) -> bool:
+        """
+        Check if intents for a language are available to match
+        :param lang: language to check
+        :returns: True if the language is eager or currently loaded
+        """
+        lang = lang.lower()
+        return lang in self._eager or lang in self._loaded
+
+    def ensure_loaded(self, lang: str) -> bool:
+        """
+        Load intents for a language if it is lazy and not yet loaded, and
+        mark it as used.
+        :param lang: language of an utterance to be matched
+        :returns: True if the language was loaded by this call
+        """
+        lang = lang.lower()
+        if lang not in self._registrations:
+            return False
+        with self._lock:
+            if lang in self._loaded:
+                self._loaded[lang] = time()
+                return False
+            LOG.info(f"Loading intents for: {lang}")
+            self._load(lang)
+            self._loaded[lang] = time()
+        return True
+
+    def _load(self, lang: str):
+        registrations = list(self._registrations[lang])
+        engine = self._create_adapt_engine()
+        for kind, data in registrations:
+            if kind == "vocab":
+                if data.get("regex"):
+                    engine.register_regex_entity(data["regex"])
+                else:
+                    engine.register_entity(data.get("entity_value"),
+                                           data.get("entity_type"),
+                                           alias_of=data.get("alias_of"))
+        # Adapt intent parsers are registered for every language
+        default_engine = self.adapt_service.engines.get(
+            self.adapt_service.lang)
+        for parser in getattr(default_engine, "intent_parsers", []):
+            engine.register_intent_parser(parser)
+        with self.adapt_service.lock:
+            self.adapt_service.engines[lang] = engine
+
+        if not self.padatious_service:
+            return
+        container = self._create_padatious_container(lang)
+        if self._on_container_created:
+            self._on_container_created(container)
+        for kind, data in registrations:
+            if kind == "padatious:register_intent":
+                container.add_intent(data["name"], data["samples"])
+                if data["name"] not in \
+                        self.padatious_service.registered_intents:
+                    self.padatious_service.registered_intents.append(
+                        data["name"])
+            elif kind == "padatious:register_entity":
+                container.add_entity(data["name"], data["samples"])
+        container.train(single_thread=self._single_thread)
+        self.padatious_service.containers[lang] = container
+
+    def _create_adapt_engine(self):
+        from adapt.engine import IntentDeterminationEngine
+        return IntentDeterminationEngine()
+
+    def _create_padatious_container(self, lang: str):
+        from padatious import IntentContainer
+        return IntentContainer(f"{self._intent_cache}/{lang}")
+
+    def _drop(self, lang: str):
+        for engine_lang in list(self.adapt_service.engines):
+            if engine_lang.lower() == lang:
+                with self.adapt_service.lock:
+                    self.adapt_service.engines.pop(engine_lang, None)
+        if self.padatious_service:
+            self.padatious_service.containers.pop(lang, None)
+
+    def evict_idle(self) -> List[str]:
+        """
+        Evict any loaded lazy languages that have not been used within the
+        idle timeout.
+        :returns: list of evicted languages
+        """
+        evicted = list()
+        with self._lock:
+            for lang, last_used in list(self._loaded.items()):
+                if time() - last_used > self.idle_timeout:
+                    self._drop(lang)
+                    self._loaded.pop(lang)
+                    evicted.append(lang)
+        if evicted:
+            LOG.info(f"Evicted idle intent languages: {evicted}")
+        return evicted
+
+    def _evict_idle_loop(self):
+        interval = min(max(self.idle_timeout / 4, 1), 60)
+        while not self._stopping.wait(interval):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                LOG.exception(e)
+
+    def _record(self, lang: str, kind: str, data: dict):
+        lang = lang.lower()
+        if lang in self._registrations:
+            with self._lock:
+                self._registrations[lang].append((kind, data))
+
+    def _record_vocab(self, message: Message):
+        self._record(get_message_lang(message), "vocab", message.data)
+
+    def _record_padatious(self, message: Message):
+        lang = message.data.get("lang") or self.adapt_service.lang
+        data = dict(message.data)
+        if not data.get("samples"):
+            file_name = data.get("file_name")
+            if not file_name or not isfile(file_name):
+                return
+            with open(file_name) as f:
+                data["samples"] = [line.strip() for line in f.readlines()]
+        self._record(lang, message.msg_type, data)
+
+    def _handle_detach_intent(self, message: Message):
+        intent_name = message.data.get("intent_name")
+        with self._lock:
+            for lang, registrations in self._registrations.items():
+                self._registrations[lang] = [
+                    r for r in registrations
+                    if r[0] != "padatious:register_intent" or
+                    r[1].get("name") != intent_name]
+
+    def _handle_detach_skill(self, message: Message):
+        skill_id = message.data.get("skill_id")
+        if not skill_id:
+            return
+        # Adapt entity types are prefixed with a modified skill_id
+        entity_skill_id = skill_id[:-1].replace('.', '_').replace('-', '_')
+
+        def _is_skill_registration(kind: str, data: dict) -> bool:
+            if kind == "vocab":
+                return (data.get("entity_type") or "").startswith(
+                    entity_skill_id)
+            return skill_id in (data.get("name") or "")
+
+        with self._lock:
+            for lang, registrations in self._registrations.items():
+                self._registrations[lang] = [
+                    r for r in registrations
+                    if not _is_skill_registration(*r)]
+
+    def shutdown(self):
+        """
+        Stop evicting idle languages
+        """
+        self._stopping.set()
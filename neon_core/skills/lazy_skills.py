@@ -0,0 +1,180 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import os
+
+from importlib.metadata import distributions
+from os.path import isfile, join
+from threading import Lock
+from typing import Dict, List, Optional
+
+from ovos_bus_client import Message
+from ovos_utils.log import LOG
+from ovos_utils.xdg_utils import xdg_cache_home
+
+# Messages emitted by skills to register intents with the intent service
+REGISTRATION_MESSAGES = ("register_vocab", "register_intent",
+                         "padatious:register_intent",
+                         "padatious:register_entity")
+
+# Skills of these types handle requests outside of their registered intents
+# and are always loaded at startup
+EAGER_SKILL_TYPES = ("FallbackSkill", "FallbackSkillV1", "FallbackSkillV2",
+                     "CommonQuerySkill", "CommonPlaySkill",
+                     "OVOSCommonPlaybackSkill")
+
+
+def get_plugin_skill_versions() -> Dict[str, str]:
+    """
+    Get the installed package version of each plugin skill
+    :returns: dict of skill_id to package version
+    """
+    versions = dict()
+    for dist in distributions():
+        for ep in dist.entry_points:
+            if ep.group == "ovos.plugin.skill":
+                versions[ep.name] = dist.version
+    return versions
+
+
+def is_lazy_loadable(instance) -> bool:
+    """
+    Check if a skill instance can be loaded when one of its intents is
+    matched instead of at startup
+    :param instance: loaded skill instance
+    :returns: True if the skill only handles its registered intents
+    """
+    return not any(cls.__name__ in EAGER_SKILL_TYPES
+                   for cls in type(instance).__mro__)
+
+
+class SkillManifestStore:
+    """
+    Stores the intent registration messages of skills in a JSON manifest per
+    skill, so intents can be registered without loading the skill.
+    """
+    def __init__(self, path: Optional[str] = None):
+        """
+        :param path: directory to save manifests in
+        """
+        self.path = path or join(xdg_cache_home(), "neon", "skill_manifests")
+
+    def _get_file(self, skill_id: str) -> str:
+        return join(self.path, f"{skill_id}.json")
+
+    def get(self, skill_id: str, version: str) -> Optional[dict]:
+        """
+        Get the manifest for a skill
+        :param skill_id: skill to get the manifest for
+        :param version: installed version of the skill
+        :returns: manifest, or None if there is no manifest for this version
+        """
+        manifest_file = self._get_file(skill_id)
+        if not isfile(manifest_file):
+            return None
+        try:
+            with open(manifest_file) as f:
+                manifest = json.load(f)
+        except Exception as e:
+            LOG.error(f"Failed to read {manifest_file}: {e}")
+            return None
+        return manifest if manifest.get("version") == version else None
+
+    def save(self, skill_id: str, version: str, lazy: bool,
+             messages: List[dict]):
+        """
+        Save the manifest for a skill
+        :param skill_id: skill the manifest describes
+        :param version: installed version of the skill
+        :param lazy: True if the skill may be loaded on demand
+        :param messages: serialized registration messages
+        """
+        os.makedirs(self.path, exist_ok=True)
+        manifest_file = self._get_file(skill_id)
+        tmp_file = f"{manifest_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump({"skill_id": skill_id, "version": version,
+                       "lazy": lazy, "messages": messages}, f)
+        os.replace(tmp_file, manifest_file)
+
+
+class RegistrationRecorder:
+    """
+    Records the intent registration messages emitted by skills while they
+    are being loaded.
+    """
+    def __init__(self, bus):
+        """
+        :param bus: MessageBusClient skills emit registrations on
+        """
+        self.bus = bus
+        self._lock = Lock()
+        self._recording: Dict[str, List[dict]] = dict()
+        for msg_type in REGISTRATION_MESSAGES:
+            self.bus.on(msg_type, self._handle_registration)
+
+    def _handle_registration(self, message: Message):
+        skill_id = message.context.get("skill_id")
+        with self._lock:
+            if skill_id in self._recording:
+                self._recording[skill_id].append(
+                    {"type": message.msg_type, "data": message.data,
+                     "context": {"skill_id": skill_id}})
+
+    def start(self, skill_id: str):
+        """
+        Start recording registrations for a skill
+        :param skill_id: skill to record
+        """
+        with self._lock:
+            self._recording[skill_id] = list()
+
+    def stop(self, skill_id: str) -> List[dict]:
+        """
+        Stop recording registrations for a skill
+        :param skill_id: skill to stop recording
+        :returns: serialized registration messages
+        """
+        with self._lock:
+            return self._recording.pop(skill_id, list())
+
+    def shutdown(self):
+        for msg_type in REGISTRATION_MESSAGES:
+            self.bus.remove(msg_type, self._handle_registration)
+
+
+def get_manifest_intents(manifest: dict) -> List[str]:
+    """
+    Get the names of intents registered in a manifest
+    :param manifest: skill manifest
+    :returns: list of intent names (message types the skill handles)
+    """
+    return [msg["data"]["name"] for msg in manifest.get("messages") or []
+            if msg["type"] in ("register_intent", "padatious:register_intent")
+            and msg["data"].get("name")]
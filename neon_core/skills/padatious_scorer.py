@@ -0,0 +1,360 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import re
+
+from os.path import isfile, join
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from ovos_utils.log import LOG
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# FANN activation functions
+_LINEAR = 0
+_SIGMOID = 3
+_SIGMOID_STEPWISE = 4
+_SIGMOID_SYMMETRIC = 5
+_SIGMOID_SYMMETRIC_STEPWISE = 6
+
+# Breakpoints of FANN's stepwise sigmoid approximations
+_STEPWISE = {
+    _SIGMOID_STEPWISE: (
+        (-2.64665246009826660156e+00, -1.47221946716308593750e+00,
+         -5.49306154251098632812e-01, 5.49306154251098632812e-01,
+         1.47221934795379638672e+00, 2.64665293693542480469e+00),
+        (4.99999988824129104614e-03, 5.00000007450580596924e-02,
+         2.50000000000000000000e-01, 7.50000000000000000000e-01,
+         9.49999988079071044922e-01, 9.95000004768371582031e-01),
+        0.0, 1.0),
+    _SIGMOID_SYMMETRIC_STEPWISE: (
+        (-2.64665293693542480469e+00, -1.47221934795379638672e+00,
+         -5.49306154251098632812e-01, 5.49306154251098632812e-01,
+         1.47221934795379638672e+00, 2.64665293693542480469e+00),
+        (-9.90000009536743164062e-01, -8.99999976158142089844e-01,
+         -5.00000000000000000000e-01, 5.00000000000000000000e-01,
+         8.99999976158142089844e-01, 9.90000009536743164062e-01),
+        -1.0, 1.0)
+}
+
+# Padatious SimpleIntent special token IDs
+_UNKNOWN_TOKENS = ':0'
+_LENGTH_TOKENS = (':1', ':2', ':3', ':4')
+
+
+class FannLayer(NamedTuple):
+    # (inputs + bias, neurons)
+    weights: "np.ndarray"
+    activation: int
+    steepness: float
+
+
+def load_fann_net(path: str) -> List[FannLayer]:
+    """
+    Load the weights of a fully connected FANN network saved to a file
+    :param path: path to a `.net` file saved by FANN
+    :returns: list of layers after the input layer
+    """
+    values = dict()
+    with open(path) as f:
+        for line in f:
+            key, _, value = line.partition("=")
+            values[key.strip()] = value.strip()
+    layer_sizes = [int(s) for s in values["layer_sizes"].split()]
+    neurons = [(int(n), int(a), float(s)) for n, a, s in re.findall(
+        r"\((\d+), (\d+), ([^)]+)\)",
+        values["neurons (num_inputs, activation_function, "
+               "activation_steepness)"])]
+    connections = [(int(n), float(w)) for n, w in re.findall(
+        r"\((\d+), ([^)]+)\)",
+        values["connections (connected_to_neuron, weight)"])]
+    if len(neurons) != sum(layer_sizes):
+        raise ValueError(f"Invalid network file: {path}")
+
+    layers = list()
+    neuron_idx = layer_sizes[0]
+    connection_idx = 0
+    prev_start = 0
+    for prev_size, size in zip(layer_sizes, layer_sizes[1:]):
+        # The last neuron in each layer is a bias neuron with no inputs
+        weights = np.zeros((prev_size, size - 1), dtype=np.float32)
+        layer_neurons = neurons[neuron_idx:neuron_idx + size - 1]
+        for col, (num_inputs, _, _) in enumerate(layer_neurons):
+            for src, weight in connections[connection_idx:
+                                           connection_idx + num_inputs]:
+                weights[src - prev_start, col] = weight
+            connection_idx += num_inputs
+        activations = set(n[1] for n in layer_neurons)
+        steepnesses = set(n[2] for n in layer_neurons)
+        if len(activations) != 1 or len(steepnesses) != 1:
+            raise ValueError(f"Mixed activations not supported: {path}")
+        layers.append(FannLayer(weights, activations.pop(),
+                                steepnesses.pop()))
+        prev_start = neuron_idx
+        neuron_idx += size
+    return layers
+
+
+def activate(values: "np.ndarray", activation: "np.ndarray",
+             steepness: "np.ndarray") -> "np.ndarray":
+    """
+    Apply FANN activation functions to neuron sums
+    :param values: array of neuron sums with intents on axis -2
+    :param activation: FANN activation function of each intent
+    :param steepness: activation steepness of each intent
+    :returns: array of neuron outputs
+    """
+    values = values * steepness[:, None]
+    max_sum = (150 / steepness)[:, None]
+    values = np.clip(values, -max_sum, max_sum)
+    result = np.empty_like(values)
+    for func in np.unique(activation):
+        mask = activation == func
+        x = values[..., mask, :]
+        if func == _LINEAR:
+            result[..., mask, :] = x
+        elif func == _SIGMOID:
+            result[..., mask, :] = 1 / (1 + np.exp(-2 * x))
+        elif func == _SIGMOID_SYMMETRIC:
+            result[..., mask, :] = np.tanh(x)
+        elif func in _STEPWISE:
+            xp, fp, low, high = _STEPWISE[func]
+            result[..., mask, :] = np.where(
+                x < xp[-1], np.interp(x, xp, fp, left=low), high)
+        else:
+            raise ValueError(f"Unsupported activation function: {func}")
+    return result
+
+
+def _adj_token(token: str) -> str:
+    # Matches padatious IdManager.adj_token
+    if token.isdigit():
+        for i in range(10):
+            token = token.replace(str(i), '#')
+    return token
+
+
+class _ScorerModel:
+    """
+    Weights of all entity-free padatious intents in a container, packed so an
+    utterance is scored against every intent at once.
+    """
+    def __init__(self, intents: list, cache_dir: str):
+        names = list()
+        hidden = list()
+        output = list()
+        token_rows: Dict[str, List[Tuple[int, int]]] = dict()
+        row_weights = list()
+        self.fallback = list()
+        for intent in intents:
+            net_file = join(cache_dir, f"{intent.name}.intent.net")
+            if intent.pos_intents or not isfile(net_file):
+                self.fallback.append(intent)
+                continue
+            try:
+                layers = load_fann_net(net_file)
+                if len(layers) != 2:
+                    raise ValueError(f"Expected 3 layers: {net_file}")
+            except Exception as e:
+                LOG.warning(f"Scoring {intent.name} with padatious: {e}")
+                self.fallback.append(intent)
+                continue
+            idx = len(names)
+            names.append(intent.name)
+            hidden.append(layers[0])
+            output.append(layers[1])
+            for token, input_idx in intent.simple_intent.ids.ids.items():
+                if token == _UNKNOWN_TOKENS or token in _LENGTH_TOKENS:
+                    continue
+                token_rows.setdefault(token, list()).append(
+                    (idx, len(row_weights)))
+                row_weights.append(layers[0].weights[input_idx])
+        self.names = names
+        if not names:
+            return
+        num_hidden = max(layer.weights.shape[1] for layer in hidden)
+
+        def _pad(weights):
+            return np.pad(weights, (0, num_hidden - weights.shape[-1]))
+
+        self.token_rows = {token: (np.array([r[0] for r in rows]),
+                                   np.array([r[1] for r in rows]))
+                           for token, rows in token_rows.items()}
+        self.rows = np.array([_pad(w) for w in row_weights],
+                             dtype=np.float32).reshape(-1, num_hidden)
+        self.bias = np.array([_pad(layer.weights[-1]) for layer in hidden])
+        special = list()
+        for intent_name, layer in zip(names, hidden):
+            ids = next(i for i in intents
+                       if i.name == intent_name).simple_intent.ids.ids
+            special.append([_pad(layer.weights[ids[token]])
+                            for token in (_UNKNOWN_TOKENS,) + _LENGTH_TOKENS])
+        # (intents, 5, hidden)
+        self.special = np.array(special, dtype=np.float32)
+        self.hidden_activation = np.array([layer.activation
+                                           for layer in hidden])
+        self.hidden_steepness = np.array([layer.steepness
+                                          for layer in hidden],
+                                         dtype=np.float32)
+        # Padded neurons have no output weight
+        self.output = np.array([np.pad(layer.weights[:-1, 0],
+                                       (0, num_hidden + 1 -
+                                        layer.weights.shape[0]))
+                                for layer in output], dtype=np.float32)
+        self.output_bias = np.array([layer.weights[-1, 0]
+                                     for layer in output], dtype=np.float32)
+        self.output_activation = np.array([layer.activation
+                                           for layer in output])
+        self.output_steepness = np.array([layer.steepness
+                                          for layer in output],
+                                         dtype=np.float32)
+
+    def score(self, sents: List[List[str]]) -> "np.ndarray":
+        """
+        Get SimpleIntent scores of tokenized sentences for every intent
+        :param sents: list of tokenized sentences
+        :returns: array of scores with shape (sentences, intents)
+        """
+        num_intents = len(self.names)
+        sums = np.repeat(self.bias[None, :, :], len(sents), axis=0)
+        for idx, sent in enumerate(sents):
+            if not sent:
+                continue
+            known = np.zeros(num_intents, dtype=np.float32)
+            seen = set()
+            for token in sent:
+                token = _adj_token(token)
+                if token not in self.token_rows:
+                    continue
+                intent_idx, row_idx = self.token_rows[token]
+                known[intent_idx] += 1
+                if token not in seen:
+                    seen.add(token)
+                    sums[idx, intent_idx] += self.rows[row_idx]
+            length = float(len(sent))
+            features = np.empty((num_intents, 5), dtype=np.float32)
+            features[:, 0] = (length - known) / length
+            features[:, 1:] = [length, length / 2., length / 3.,
+                               length / 4.]
+            sums[idx] += np.einsum("if,ifh->ih", features, self.special)
+        hidden = activate(sums, self.hidden_activation, self.hidden_steepness)
+        out = np.einsum("bih,ih->bi", hidden, self.output) + self.output_bias
+        out = activate(out[..., None], self.output_activation,
+                       self.output_steepness)[..., 0]
+        return np.maximum(out, 0)
+
+
+class VectorizedIntentScorer:
+    """
+    Scores utterances against every intent in a padatious IntentContainer
+    with NumPy array operations instead of running each intent's network in
+    turn. Intents with entities are scored by padatious.
+    """
+    def __init__(self, container):
+        """
+        :param container: padatious IntentContainer to score intents of
+        """
+        if np is None:
+            raise ImportError("numpy is required for vectorized scoring")
+        self.container = container
+        self._calc_intents = container.calc_intents
+        self._lock = Lock()
+        self._model: Optional[_ScorerModel] = None
+        self._model_key = None
+
+    @classmethod
+    def attach(cls, container) -> "VectorizedIntentScorer":
+        """
+        Replace a container's `calc_intents` method with a vectorized scorer
+        :param container: padatious IntentContainer to score intents of
+        :returns: attached scorer
+        """
+        if isinstance(getattr(container.calc_intents, "__self__", None), cls):
+            return container.calc_intents.__self__
+        scorer = cls(container)
+        container.calc_intents = scorer.calc_intents
+        return scorer
+
+    def _get_model(self) -> _ScorerModel:
+        intents = list(self.container.intents.objects)
+        key = tuple(id(i) for i in intents)
+        with self._lock:
+            if key != self._model_key:
+                self._model = _ScorerModel(intents,
+                                           self.container.intents.cache)
+                self._model_key = key
+                LOG.debug(f"Vectorized {len(self._model.names)} intents")
+            return self._model
+
+    def calc_intents_batch(self, queries: List[str]) -> List[list]:
+        """
+        Get match data for every intent for each of a batch of queries
+        :param queries: list of input sentences to test against intents
+        :returns: list of `MatchData` lists, one per query
+        """
+        container = self.container
+        if container.must_train or (container.train_thread and
+                                    container.train_thread.is_alive()):
+            return [self._calc_intents(query) for query in queries]
+        from padatious.match_data import MatchData
+        from padatious.util import tokenize
+        model = self._get_model()
+        sents = [tokenize(query) for query in queries]
+        scores = model.score(sents) if model.names else None
+        results = list()
+        for idx, (query, sent) in enumerate(zip(queries, sents)):
+            intents = dict()
+            for intent_idx, name in enumerate(model.names):
+                # Entity-free intents match with a confidence of 0.5
+                match = MatchData(name, sent, conf=float(np.sqrt(
+                    0.5 * scores[idx, intent_idx])))
+                match.detokenize()
+                intents[name] = match
+            for intent in model.fallback:
+                match = intent.match(sent, container.entities)
+                match.detokenize()
+                intents[intent.name] = match
+            for perfect_match in container.padaos.calc_intents(query):
+                name = perfect_match['name']
+                intents[name] = MatchData(
+                    name, sent, matches=perfect_match['entities'], conf=1.0)
+            results.append(list(intents.values()))
+        return results
+
+    def calc_intents(self, query: str) -> list:
+        """
+        Get match data for every intent for a query, like
+        `IntentContainer.calc_intents`
+        :param query: input sentence to test against intents
+        :returns: list of `MatchData`
+        """
+        return self.calc_intents_batch([query])[0]
@@ -0,0 +1,192 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import time
+
+from threading import Event, Lock
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from ovos_bus_client import Message
+from ovos_bus_client.session import SessionManager, UtteranceState
+from ovos_plugin_manager.templates.pipeline import IntentMatch
+from ovos_utils import flatten_list
+from ovos_utils.log import LOG
+
+
+class ParallelConverseService:
+    """
+    Sends a converse request to every active skill at once and collects
+    responses until a deadline, instead of asking each skill in turn. The
+    accepting skill with the highest `converse_priorities` value is selected;
+    ties are broken by active skill order. Skills that have not answered by
+    the deadline are sent `ovos.skills.converse.force_timeout`. Requests carry
+    a `converse_poll_id` context that skills echo back in their reply, so
+    responses to other polls (e.g. of other sessions) are ignored.
+
+    Note that every polled skill receives the utterance, so a lower priority
+    skill may act on an utterance that is ultimately handled by another skill.
+    """
+    def __init__(self, bus, converse_service):
+        """
+        :param bus: MessageBusClient to send requests on
+        :param converse_service: ConverseService that tracks active skills
+        """
+        self.bus = bus
+        self.converse_service = converse_service
+
+    @property
+    def config(self) -> dict:
+        return self.converse_service.config.get("parallel") or {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.config.get("enabled"))
+
+    def _sort_by_priority(self, skill_ids: List[str]) -> List[str]:
+        """
+        Order skills by configured converse priority (highest first)
+        :param skill_ids: skill IDs in active skill order
+        :returns: skill IDs in the order responses should be considered
+        """
+        priorities = self.converse_service.config.get(
+            "converse_priorities") or {}
+        return sorted(skill_ids, key=lambda s: -priorities.get(s, 50))
+
+    @staticmethod
+    def _select(order: List[str],
+                results: Dict[str, bool]) -> Tuple[Optional[str], bool]:
+        """
+        Select a skill from the responses received so far
+        :param order: skill IDs in priority order
+        :param results: dict of skill ID to converse result
+        :returns: selected skill ID (or None), True if the selection is final
+        """
+        for skill_id in order:
+            if skill_id not in results:
+                return None, False
+            if results[skill_id]:
+                return skill_id, True
+        return None, True
+
+    def _poll_skills(self, skill_ids: List[str], utterances: List[str],
+                     lang: str, message: Message) -> Optional[str]:
+        """
+        Send a converse request to all skills and wait for a decision
+        :param skill_ids: skill IDs to request, in priority order
+        :param utterances: list of utterances to handle
+        :param lang: language of utterances
+        :param message: Message associated with the utterances
+        :returns: skill ID of the selected skill, if any
+        """
+        results = dict()
+        lock = Lock()
+        decided = Event()
+        poll_id = str(uuid4())
+
+        def handle_response(msg: Message):
+            if msg.context.get("converse_poll_id") != poll_id:
+                return
+            skill_id = msg.data.get("skill_id")
+            if skill_id not in skill_ids:
+                return
+            if msg.data.get("error"):
+                LOG.error(f"{skill_id}: {msg.data['error']}")
+            with lock:
+                results[skill_id] = not msg.data.get("error") and \
+                    bool(msg.data.get("result"))
+                if self._select(skill_ids, results)[1]:
+                    decided.set()
+
+        deadline = self.config.get("deadline", 3)
+        self.bus.on("skill.converse.response", handle_response)
+        try:
+            for skill_id in skill_ids:
+                self.bus.emit(message.reply(f"{skill_id}.converse.request",
+                                            {"utterances": utterances,
+                                             "lang": lang},
+                                            {"converse_poll_id": poll_id}))
+            decided.wait(deadline)
+        finally:
+            self.bus.remove("skill.converse.response", handle_response)
+
+        with lock:
+            results = dict(results)
+        for skill_id in skill_ids:
+            if skill_id not in results:
+                LOG.warning(f"{skill_id} did not answer converse within "
+                            f"{deadline}s")
+                self.bus.emit(message.forward(
+                    "ovos.skills.converse.force_timeout",
+                    {"skill_id": skill_id}))
+        selected, _ = self._select(skill_ids, results)
+        if not selected:
+            # Deadline passed; take the best skill that accepted in time
+            accepted = [s for s in skill_ids if results.get(s)]
+            selected = accepted[0] if accepted else None
+        return selected
+
+    def match(self, utterances: List[str], lang: str,
+              message: Message) -> Optional[IntentMatch]:
+        """
+        Give active skills a chance at the utterance
+        :param utterances: list of utterances to handle
+        :param lang: language of utterances
+        :param message: Message associated with the utterances
+        :returns: IntentMatch if a skill handled the utterance, else None
+        """
+        converse = self.converse_service
+        session = SessionManager.get(message)
+        session.lang = lang
+        utterances = flatten_list(utterances)
+        converse._check_converse_timeout(message)
+        skill_ids = [s for s in converse._collect_converse_skills(message)
+                     if s not in session.blacklisted_skills]
+
+        # Skills waiting on `get_response` take the utterance without polling
+        for skill_id in skill_ids:
+            if session.utterance_states.get(skill_id) == \
+                    UtteranceState.RESPONSE:
+                converse.converse(utterances, skill_id, lang, message)
+                return IntentMatch(intent_service='Converse',
+                                   intent_type=False, intent_data={},
+                                   skill_id=skill_id, utterance=utterances[0])
+
+        skill_ids = self._sort_by_priority(
+            [s for s in skill_ids if converse._converse_allowed(s)])
+        if not skill_ids:
+            return None
+        start = time.monotonic()
+        skill_id = self._poll_skills(skill_ids, utterances, lang, message)
+        LOG.debug(f"Polled {len(skill_ids)} skills in "
+                  f"{time.monotonic() - start}s; selected={skill_id}")
+        if not skill_id:
+            return None
+        return IntentMatch(intent_service='Converse', intent_type=True,
+                           intent_data={}, skill_id=skill_id,
+                           utterance=utterances[0])
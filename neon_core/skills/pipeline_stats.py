@@ -0,0 +1,240 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import os
+
+from os.path import dirname, isfile, join
+from threading import Event, Lock, Thread
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ovos_utils.log import LOG
+from ovos_utils.xdg_utils import xdg_data_home
+
+_TIERS = ("_high", "_medium", "_low")
+
+# Pipeline stages that may act on an utterance (speak, play, or stop) before
+# returning; these are never skipped or moved
+SIDE_EFFECT_STAGES = ("stop", "converse", "common_qa", "ocp_", "fallback_")
+
+
+def get_utterance_shape(utterances: List[str]) -> str:
+    """
+    Get a coarse description of an utterance used to group match statistics
+    :param utterances: list of utterance variants
+    :returns: word count bucket of the first utterance
+    """
+    words = len(utterances[0].split()) if utterances else 0
+    if words <= 1:
+        return "1"
+    if words <= 3:
+        return "2-3"
+    if words <= 6:
+        return "4-6"
+    return "7+"
+
+
+def _get_tier(stage: str) -> Optional[str]:
+    return next((tier for tier in _TIERS if stage.endswith(tier)), None)
+
+
+class PipelineStats:
+    """
+    Records which intent pipeline stages match utterances of each language
+    and shape, and plans pipelines that skip stages which never match and
+    optionally try likely, cheap stages first within a confidence tier.
+    Stages that may act on an utterance are always run in place. Statistics
+    are saved to disk periodically on a background thread.
+
+    Note that when more than one stage in a tier matches an utterance, the
+    first stage run wins, so reordering can change which intent handles it.
+    Only enable `reorder` if matches do not overlap or overlapping stages
+    are pinned.
+    """
+    def __init__(self, path: Optional[str] = None, min_samples: int = 50,
+                 explore_interval: int = 20, pinned: Iterable[str] = (),
+                 reorder: bool = False, save_interval: float = 60):
+        """
+        :param path: JSON file to persist statistics to
+        :param min_samples: utterances of a language and shape to observe
+            before changing its pipeline
+        :param explore_interval: run the full pipeline every nth utterance of
+            a language and shape to keep statistics current (0 never)
+        :param pinned: stages that are never skipped or moved, in addition
+            to `SIDE_EFFECT_STAGES`
+        :param reorder: if True, reorder stages within a confidence tier
+        :param save_interval: seconds between saves of new statistics
+        """
+        self.path = path or join(xdg_data_home(), "neon",
+                                 "pipeline_stats.json")
+        self.min_samples = min_samples
+        self.explore_interval = explore_interval
+        self.pinned = set(pinned)
+        self.reorder = reorder
+        self._save_interval = save_interval
+        self._unsaved = 0
+        self._lock = Lock()
+        # "lang|shape": {"total": int,
+        #                "stages": {stage: {"runs", "matches", "time"}}}
+        self._stats: Dict[str, dict] = dict()
+        self.load()
+        self._stopping = Event()
+        Thread(target=self._save_loop, daemon=True,
+               name="pipeline_stats_save").start()
+
+    def load(self):
+        """
+        Load statistics from disk
+        """
+        if not isfile(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                stats = json.load(f)
+            with self._lock:
+                self._stats = stats
+        except Exception as e:
+            LOG.error(f"Failed to load pipeline stats from {self.path}: {e}")
+
+    def save(self):
+        """
+        Write statistics to disk
+        """
+        with self._lock:
+            stats = json.dumps(self._stats)
+            self._unsaved = 0
+        try:
+            os.makedirs(dirname(self.path), exist_ok=True)
+            tmp_file = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w') as f:
+                f.write(stats)
+            os.replace(tmp_file, self.path)
+        except OSError as e:
+            LOG.error(f"Failed to save pipeline stats to {self.path}: {e}")
+
+    def _save_loop(self):
+        while not self._stopping.wait(self._save_interval):
+            if self._unsaved:
+                self.save()
+
+    def shutdown(self):
+        """
+        Stop periodic saves and save any new statistics
+        """
+        self._stopping.set()
+        if self._unsaved:
+            self.save()
+
+    def reset(self, lang: Optional[str] = None):
+        """
+        Remove statistics that may no longer describe registered intents
+        :param lang: language to reset statistics for, else all languages
+        """
+        with self._lock:
+            if lang:
+                self._stats = {key: entry for key, entry in self._stats.items()
+                               if key.split('|')[0] != lang}
+            else:
+                self._stats = dict()
+            self._unsaved += 1
+
+    def _is_pinned(self, stage: str) -> bool:
+        return stage in self.pinned or stage.startswith(SIDE_EFFECT_STAGES)
+
+    def record(self, lang: str, shape: str,
+               trace: List[Tuple[str, bool, float]]):
+        """
+        Record the result of running a pipeline
+        :param lang: language of the utterance
+        :param shape: shape of the utterance
+        :param trace: list of (stage, matched, seconds) for each stage run
+        """
+        with self._lock:
+            entry = self._stats.setdefault(f"{lang}|{shape}",
+                                           {"total": 0, "stages": dict()})
+            entry["total"] += 1
+            for stage, matched, duration in trace:
+                stats = entry["stages"].setdefault(
+                    stage, {"runs": 0, "matches": 0, "time": 0.0})
+                stats["runs"] += 1
+                stats["matches"] += int(matched)
+                stats["time"] += duration
+            self._unsaved += 1
+
+    def plan(self, lang: str, shape: str, stages: List[str]) -> dict:
+        """
+        Plan the pipeline for an utterance
+        :param lang: language of the utterance
+        :param shape: shape of the utterance
+        :param stages: configured pipeline stages in order
+        :returns: dict `order` of stages to run, `skipped` stages, `shape`,
+            and whether this is an `explore` run of the full pipeline
+        """
+        plan = {"shape": shape, "order": list(stages), "skipped": [],
+                "explore": False}
+        with self._lock:
+            entry = self._stats.get(f"{lang}|{shape}")
+            if not entry or entry["total"] < self.min_samples:
+                return plan
+            if self.explore_interval and \
+                    entry["total"] % self.explore_interval == 0:
+                plan["explore"] = True
+                return plan
+            stats = {stage: dict(s) for stage, s in entry["stages"].items()}
+
+        def _never_matches(stage):
+            s = stats.get(stage)
+            return not self._is_pinned(stage) and s is not None and \
+                s["runs"] >= self.min_samples and s["matches"] == 0
+
+        def _priority(stage):
+            s = stats.get(stage)
+            if not s or not s["runs"]:
+                return 0.0
+            # Prefer stages likely to match relative to the time they take
+            return -(s["matches"] / s["runs"]) / \
+                max(s["time"] / s["runs"], 1e-6)
+
+        order = list()
+        run = list()
+        for stage in stages + [None]:
+            if run and (stage is None or self._is_pinned(stage) or
+                        _get_tier(stage) != _get_tier(run[0])):
+                order.extend(sorted(run, key=_priority) if self.reorder
+                             else run)
+                run = list()
+            if stage is None:
+                break
+            if _never_matches(stage):
+                plan["skipped"].append(stage)
+            elif self._is_pinned(stage) or not _get_tier(stage):
+                order.append(stage)
+            else:
+                run.append(stage)
+        plan["order"] = order
+        return plan
@@ -141,8 +141,12 @@ class NeonSkillService(Thread):
         """
         Get a list of paths to every loaded skill in load order (priority last)
         """
-        plugin_dirs, _ = get_plugin_skills()
         skill_base_dirs = get_skill_directories(self.config)
+        skill_index = self.skill_manager.skill_index
+        if skill_index:
+            return skill_index.get_plugin_dirs(skill_base_dirs) + \
+                skill_index.get_skill_dirs(skill_base_dirs)
+        plugin_dirs, _ = get_plugin_skills()
         # TODO: Get ovos_plugin_common_play too
         skill_dirs = [join(base_dir, d) for base_dir in skill_base_dirs
                       for d in listdir(base_dir)]
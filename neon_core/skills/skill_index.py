@@ -0,0 +1,262 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import importlib.util
+import json
+import os
+import sys
+
+from importlib.metadata import EntryPoint, distributions
+from os.path import basename, dirname, isdir, isfile, join
+from threading import Lock
+from typing import Dict, List, Optional
+
+from ovos_utils.log import LOG
+from ovos_utils.xdg_utils import xdg_cache_home
+
+SKILL_ENTRY_POINT_GROUP = "ovos.plugin.skill"
+SKILL_MAIN_MODULE = "__init__.py"
+INDEX_VERSION = 1
+
+
+def _get_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_plugin_skill_entry_points() -> Dict[str, str]:
+    """
+    Get the entry point of each installed plugin skill without importing it
+    :returns: dict of skill_id to entry point value (`module:attr`)
+    """
+    entry_points = dict()
+    for dist in distributions():
+        for ep in dist.entry_points:
+            if ep.group == SKILL_ENTRY_POINT_GROUP:
+                entry_points[ep.name] = ep.value
+    return entry_points
+
+
+def get_plugin_skill_dir(entry_point: str) -> Optional[str]:
+    """
+    Get the package directory of a plugin skill
+    :param entry_point: entry point value (`module:attr`)
+    :returns: directory containing the skill module
+    """
+    module = entry_point.split(":")[0].strip()
+    try:
+        return dirname(importlib.util.find_spec(module).origin)
+    except Exception as e:
+        LOG.error(f"Failed to locate {entry_point}: {e}")
+        return None
+
+
+def get_packages_fingerprint() -> Dict[str, Optional[int]]:
+    """
+    Get the modification times of `sys.path` directories containing package
+    metadata. Installing, removing, or upgrading a package changes the mtime
+    of the directory containing its metadata.
+    :returns: dict of path to mtime
+    """
+    fingerprint = dict()
+    for path in sys.path:
+        if not path or not isdir(path):
+            continue
+        try:
+            if any(f.endswith((".dist-info", ".egg-info"))
+                   for f in os.listdir(path)):
+                fingerprint[path] = _get_mtime(path)
+        except OSError:
+            continue
+    return fingerprint
+
+
+def _packages_changed(plugins: Optional[dict]) -> bool:
+    """
+    Check if installed packages changed since plugins were indexed
+    :param plugins: indexed plugins
+    :returns: True if plugins need to be indexed again
+    """
+    if not plugins or plugins["sys_path"] != sys.path:
+        return True
+    return any(_get_mtime(path) != mtime
+               for path, mtime in plugins["fingerprint"].items())
+
+
+def get_skill_dir_fingerprint(base_dir: str) -> Dict[str, Optional[int]]:
+    """
+    Get the modification times of a skill base directory and the skill
+    directories in it. Adding or removing a skill changes the mtime of the
+    base directory; adding or removing a skill's `__init__.py` changes the
+    mtime of the skill directory.
+    :param base_dir: directory containing skill directories
+    :returns: dict of path to mtime, in directory listing order
+    """
+    if not isdir(base_dir):
+        return dict()
+    fingerprint = {base_dir: _get_mtime(base_dir)}
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                fingerprint[entry.path] = _get_mtime(entry.path)
+    return fingerprint
+
+
+class SkillIndex:
+    """
+    Caches installed plugin skills and skill directories so they are only
+    scanned when an installed package or skill directory changes. The index
+    is saved to disk so unchanged skills are not scanned on the next start.
+    """
+    def __init__(self, path: Optional[str] = None):
+        """
+        :param path: file to save the index in
+        """
+        self.path = path or join(xdg_cache_home(), "neon", "skill_index.json")
+        self._lock = Lock()
+        self._plugin_classes = dict()
+        self._failed_plugins = set()
+        self._index = self._read()
+
+    def _read(self) -> dict:
+        index = {"version": INDEX_VERSION, "plugins": None,
+                 "skill_dirs": dict()}
+        if not isfile(self.path):
+            return index
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except Exception as e:
+            LOG.error(f"Failed to read {self.path}: {e}")
+            return index
+        return saved if saved.get("version") == INDEX_VERSION else index
+
+    def _write(self):
+        try:
+            os.makedirs(dirname(self.path), exist_ok=True)
+            tmp_file = f"{self.path}.tmp"
+            with open(tmp_file, "w") as f:
+                json.dump(self._index, f)
+            os.replace(tmp_file, self.path)
+        except Exception as e:
+            LOG.error(f"Failed to write {self.path}: {e}")
+
+    def get(self, skill_base_dirs: List[str]) -> dict:
+        """
+        Get the skill index, scanning installed skills if anything changed
+        since the index was built. Every call still lists each skill base
+        directory and stats the skill directories in it to fingerprint them
+        (see `get_skill_dir_fingerprint`); skill directory mtimes are needed
+        to notice a skill's `__init__.py` being added after the directory
+        was created. Only changed directories are checked for skills.
+        :param skill_base_dirs: directories containing skill directories
+        :returns: dict with `plugins` (skill_id to `entry_point` and `dir`)
+            and `skill_dirs` (base directory to a dict of skill directory
+            name to True if the directory contains a skill)
+        """
+        base_dirs = {d: get_skill_dir_fingerprint(d) for d in skill_base_dirs}
+        with self._lock:
+            changed = False
+            if _packages_changed(self._index["plugins"]):
+                LOG.debug("Installed packages changed; indexing plugins")
+                fingerprint = get_packages_fingerprint()
+                entry_points = get_plugin_skill_entry_points()
+                self._index["plugins"] = {
+                    "sys_path": list(sys.path), "fingerprint": fingerprint,
+                    "skills": {skill_id: {"entry_point": value,
+                                          "dir": get_plugin_skill_dir(value)}
+                               for skill_id, value in entry_points.items()}}
+                LOG.info(f"Indexed plugin skills: {list(entry_points)}")
+                # Entry points may resolve differently after an upgrade
+                self._plugin_classes = dict()
+                self._failed_plugins = set()
+                changed = True
+            skill_dirs = self._index["skill_dirs"]
+            for base_dir, fingerprint in base_dirs.items():
+                cached = skill_dirs.get(base_dir)
+                if cached and cached["fingerprint"] == fingerprint:
+                    continue
+                LOG.debug(f"Skills changed in {base_dir}; indexing skills")
+                skill_dirs[base_dir] = {
+                    "fingerprint": fingerprint,
+                    "skills": {basename(path): isfile(join(path,
+                                                           SKILL_MAIN_MODULE))
+                               for path in fingerprint if path != base_dir}}
+                changed = True
+            if changed:
+                self._write()
+            return {"plugins": self._index["plugins"]["skills"],
+                    "skill_dirs": {d: skill_dirs[d]["skills"]
+                                   for d in base_dirs}}
+
+    def get_plugin_dirs(self, skill_base_dirs: List[str]) -> List[str]:
+        """
+        Get the package directories of installed plugin skills
+        :param skill_base_dirs: directories containing skill directories
+        :returns: list of plugin skill directories
+        """
+        return [p["dir"] for p in
+                self.get(skill_base_dirs)["plugins"].values() if p["dir"]]
+
+    def get_skill_dirs(self, skill_base_dirs: List[str]) -> List[str]:
+        """
+        Get every skill directory in the skill base directories in load order
+        :param skill_base_dirs: directories containing skill directories
+        :returns: list of skill directories
+        """
+        skill_dirs = self.get(skill_base_dirs)["skill_dirs"]
+        return [join(base_dir, d) for base_dir in skill_base_dirs
+                for d in skill_dirs[base_dir]]
+
+    def get_plugins(self, skill_base_dirs: List[str]) -> dict:
+        """
+        Get installed plugin skill classes, importing any plugins that were
+        not loaded yet
+        :param skill_base_dirs: directories containing skill directories
+        :returns: dict of skill_id to skill class
+        """
+        plugins = dict()
+        for skill_id, plugin in self.get(skill_base_dirs)["plugins"].items():
+            key = (skill_id, plugin["entry_point"])
+            if key not in self._plugin_classes:
+                if key in self._failed_plugins:
+                    continue
+                try:
+                    self._plugin_classes[key] = EntryPoint(
+                        skill_id, plugin["entry_point"],
+                        SKILL_ENTRY_POINT_GROUP).load()
+                except Exception as e:
+                    # This runs periodically, only log each failure once
+                    self._failed_plugins.add(key)
+                    LOG.error(f"Failed to load plugin entry point "
+                              f"{skill_id}: {e}")
+                    continue
+            plugins[skill_id] = self._plugin_classes[key]
+        return plugins
@@ -26,15 +26,176 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import re
+import sys
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from importlib.metadata import distributions
 from os import makedirs
-from os.path import isdir, join, expanduser
+from os.path import basename, dirname, isdir, join, expanduser, relpath
+from threading import Event, Lock, Thread, Timer
+from time import monotonic
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from ovos_bus_client import Message
+from ovos_plugin_manager.skills import find_skill_plugins, \
+    get_skill_directories
+from ovos_utils.gui import is_gui_connected
 from ovos_utils.xdg_utils import xdg_data_home
 from ovos_utils.log import LOG
 
 from ovos_core.skill_manager import SkillManager
 
+from neon_core.skills.lazy_skills import RegistrationRecorder, \
+    SkillManifestStore, get_manifest_intents, get_plugin_skill_versions, \
+    is_lazy_loadable
+from neon_core.skills.skill_index import SkillIndex, \
+    get_packages_fingerprint
+from neon_core.skills.skill_watcher import SkillChangeWatcher, \
+    is_skill_source
+
+
+class _PollStopEvent(Event):
+    """
+    Stop event of the skill manager, which waits on it between checks for
+    added and removed skills. `get_interval` is called with the requested
+    interval and returns the interval to use (None to wait indefinitely);
+    it is checked again every requested interval, so a shorter interval
+    applies once changes are no longer watched.
+    """
+    def __init__(self, get_interval: Callable[[float], Optional[float]]):
+        Event.__init__(self)
+        self._get_interval = get_interval
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        if timeout is None:
+            return Event.wait(self)
+        start = monotonic()
+        while True:
+            interval = self._get_interval(timeout)
+            remaining = timeout if interval is None else \
+                min(timeout, interval - (monotonic() - start))
+            if remaining <= 0:
+                return self.is_set()
+            if Event.wait(self, remaining):
+                return True
+
+
+def _normalize_dist_name(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def get_plugin_skill_dependencies() -> Dict[str, Set[str]]:
+    """
+    Get dependencies between installed plugin skills from package metadata.
+    A skill depends on another skill if its package requires the package
+    providing the other skill.
+    :returns: dict of skill_id to set of skill_ids it depends on
+    """
+    skill_dists = dict()
+    requirements = dict()
+    for dist in distributions():
+        skill_ids = [ep.name for ep in dist.entry_points
+                     if ep.group == "ovos.plugin.skill"]
+        if not skill_ids:
+            continue
+        dist_requires = set()
+        for requirement in dist.requires or []:
+            if re.search(r"extra\s*==", requirement):
+                # Optional dependencies are not required to load a skill
+                continue
+            name = re.split(r"[\s;<>=!~\[(]", requirement.strip())[0]
+            dist_requires.add(_normalize_dist_name(name))
+        for skill_id in skill_ids:
+            skill_dists[skill_id] = _normalize_dist_name(dist.metadata["Name"])
+            requirements[skill_id] = dist_requires
+    return {skill_id: {dep for dep, dist in skill_dists.items()
+                       if dist in requires and dep != skill_id}
+            for skill_id, requires in requirements.items()}
+
+
+def run_dependency_graph(tasks: Dict[str, Callable],
+                         dependencies: Dict[str, Set[str]],
+                         workers: int = 4) -> Dict[str, Any]:
+    """
+    Run tasks on a thread pool, starting each task after the tasks it depends
+    on have completed. Tasks are started in the order of `tasks` when their
+    dependencies are met. Dependencies that are not in `tasks` are ignored;
+    tasks in a dependency cycle are started together.
+    :param tasks: dict of task name to callable
+    :param dependencies: dict of task name to names of tasks it depends on
+    :param workers: number of threads to run tasks on
+    :returns: dict of task name to task return value (None if it raised)
+    """
+    pending = {name: {d for d in dependencies.get(name) or []
+                      if d in tasks and d != name} for name in tasks}
+    results = dict()
+    running = dict()
+    with ThreadPoolExecutor(max(workers, 1),
+                            thread_name_prefix="skill_loader") as executor:
+        while pending or running:
+            ready = [name for name, deps in pending.items()
+                     if not deps - results.keys()]
+            if not ready and not running:
+                LOG.warning(f"Circular dependencies between: {list(pending)}")
+                ready = list(pending)
+            for name in ready:
+                pending.pop(name)
+                running[executor.submit(tasks[name])] = name
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    LOG.exception(f"{name} failed: {e}")
+                    results[name] = None
+    return results
+
 
 class NeonSkillManager(SkillManager):
+    def __init__(self, *args, **kwargs):
+        SkillManager.__init__(self, *args, **kwargs)
+        # Optionally register intents from a manifest and load skills when
+        # one of their intents is matched
+        lazy_config = self.skills_config.get("lazy_load") or {}
+        self._lazy_config = lazy_config if lazy_config.get("enabled") \
+            else None
+        self._lazy_lock = Lock()
+        # skill_id: {"plugin": skill class, "intents": [intent names]}
+        self._lazy_skills: Dict[str, dict] = dict()
+        # intent name: skill_id
+        self._lazy_intents: Dict[str, str] = dict()
+        # skill_id: intent Messages to replay once the skill is loaded
+        self._lazy_loading: Dict[str, list] = dict()
+        self._skill_versions = None
+        self._manifests = SkillManifestStore(
+            lazy_config.get("manifest_dir")) if self._lazy_config else None
+        self._recorder = RegistrationRecorder(self.bus) if \
+            self._lazy_config else None
+        # Cache installed skills instead of scanning them on every update
+        index_config = self.skills_config.get("index") or {}
+        self.skill_index = SkillIndex(index_config.get("path")) if \
+            index_config.get("enabled") else None
+        # Optionally watch for skill changes instead of waiting to poll
+        watch_config = self.skills_config.get("watch") or {}
+        self._watch_config = watch_config if watch_config.get("enabled") \
+            else None
+        self._watcher = None
+        if self._watch_config:
+            self._stop_event = _PollStopEvent(self._get_poll_interval)
+        self._package_dirs = set()
+        self._plugin_versions = dict()
+
+    @property
+    def parallel_load_config(self) -> dict:
+        """
+        Configuration for loading skills in parallel, or an empty dict if
+        skills should be loaded serially
+        """
+        config = self.skills_config.get("parallel_load") or {}
+        return config if config.get("enabled") else {}
 
     def get_default_skills_dir(self):
         """
@@ -61,9 +222,287 @@ class NeonSkillManager(SkillManager):
 
         return skill_dir
 
-    def _load_new_skills(self, *args, **kwargs):
-        # Override load method for config module checks
-        SkillManager._load_new_skills(self, *args, **kwargs)
+    def load_priority(self):
+        if self.parallel_load_config:
+            # Priority skills are loaded first in `_load_new_skills`
+            return
+        SkillManager.load_priority(self)
+
+    def _load_new_skills(self, network=None, internet=None, gui=None):
+        if not self.parallel_load_config:
+            return SkillManager._load_new_skills(self, network, internet, gui)
+        if network is None:
+            network = self._network_event.is_set()
+        if internet is None:
+            internet = self._connected_event.is_set()
+        if gui is None:
+            gui = self._gui_event.is_set() or is_gui_connected(self.bus)
+
+        with self._lock:
+            tasks = self._get_skill_load_tasks(network, internet, gui)
+            if not tasks:
+                return
+            self._load_skills_parallel(tasks)
+
+    @staticmethod
+    def _get_skill_base_dirs() -> List[str]:
+        """
+        Get directories containing skill directories, matching
+        `SkillManager._get_skill_directories`
+        """
+        return ["/opt/mycroft/skills"] + get_skill_directories()
+
+    def _find_skill_plugins(self) -> Dict[str, Any]:
+        """
+        Get installed plugin skills from the skill index if enabled
+        :returns: dict of skill_id to skill class
+        """
+        if not self.skill_index:
+            return find_skill_plugins()
+        return self.skill_index.get_plugins(self._get_skill_base_dirs())
+
+    def _get_skill_directories(self):
+        if not self.skill_index:
+            return SkillManager._get_skill_directories(self)
+        skill_map = dict()
+        index = self.skill_index.get(self._get_skill_base_dirs())
+        for base_dir, skills in index["skill_dirs"].items():
+            for skill_id, is_skill in skills.items():
+                skill_map[skill_id] = (join(base_dir, skill_id), is_skill)
+        for skill_dir, is_skill in skill_map.values():
+            if is_skill:
+                self.empty_skill_dirs.discard(skill_dir)
+            elif skill_dir not in self.empty_skill_dirs:
+                self.empty_skill_dirs.add(skill_dir)
+                LOG.debug(f"Found skills directory with no skill: "
+                          f"{skill_dir}")
+        return [skill_dir for skill_dir, _ in skill_map.values()]
+
+    def load_plugin_skills(self, network=None, internet=None):
+        if network is None:
+            network = self._network_event.is_set()
+        if internet is None:
+            internet = self._connected_event.is_set()
+        for load_skill in self._get_plugin_skill_load_tasks(
+                network, internet).values():
+            load_skill()
+
+    def _get_plugin_skill_load_tasks(self, network: bool,
+                                     internet: bool) -> Dict[str, Callable]:
+        """
+        Get plugin skills to load for the current connection state. This
+        matches the checks done by `SkillManager.load_plugin_skills`
+        :param network: True if network is connected
+        :param internet: True if internet is connected
+        :returns: dict of skill_id to callable that loads the skill
+        """
+        tasks = dict()
+        loaded_skill_ids = [basename(p) for p in self.skill_loaders]
+        for skill_id, plugin in self._find_skill_plugins().items():
+            if skill_id in self.blacklist:
+                if skill_id not in self._logged_skill_warnings:
+                    self._logged_skill_warnings.append(skill_id)
+                    LOG.warning(f"{skill_id} is blacklisted, it will NOT be "
+                                f"loaded")
+                continue
+            if skill_id in self.plugin_skills or \
+                    skill_id in loaded_skill_ids:
+                continue
+            requirements = self._get_plugin_skill_loader(
+                skill_id, init_bus=False).runtime_requirements
+            if not network and requirements.network_before_load:
+                continue
+            if not internet and requirements.internet_before_load:
+                continue
+            tasks[skill_id] = partial(self._load_plugin_skill, skill_id,
+                                      plugin)
+        return tasks
+
+    def _get_skill_load_tasks(self, network: bool, internet: bool,
+                              gui: bool) -> Dict[str, Callable]:
+        """
+        Get skills to load for the current connection state, unloading skills
+        that are replaced by a new version. This matches the checks done by
+        `SkillManager._load_new_skills`. Must be called with `self._lock`
+        :param network: True if network is connected
+        :param internet: True if internet is connected
+        :param gui: True if a GUI is connected
+        :returns: dict of skill_id to callable that loads the skill
+        """
+        tasks = self._get_plugin_skill_load_tasks(network, internet)
+        for skill_dir in self._get_skill_directories():
+            skill_id = basename(skill_dir)
+            requirements = self._get_skill_loader(
+                skill_dir, init_bus=False).runtime_requirements
+            if not network and requirements.network_before_load:
+                continue
+            if not internet and requirements.internet_before_load:
+                continue
+            if not gui and requirements.gui_before_load:
+                continue
+            # A local source install replaces a plugin with the same ID
+            if skill_id in self.plugin_skills:
+                LOG.info(f"{skill_id} plugin will be replaced by a local "
+                         f"version: {skill_dir}")
+                self._unload_plugin_skill(skill_id)
+            tasks.pop(skill_id, None)
+            for old_skill_dir in [d for d, loader in self.skill_loaders.items()
+                                  if d != skill_dir and
+                                  loader.skill_id == skill_id]:
+                self._unload_skill(old_skill_dir)
+            if skill_dir not in self.skill_loaders:
+                tasks[skill_id] = partial(self._load_skill, skill_dir)
+        return tasks
+
+    def _load_skills_parallel(self, tasks: Dict[str, Callable]):
+        """
+        Load skills on a thread pool. `priority_skills` are loaded before any
+        other skills, and skills are loaded after the skills they depend on.
+        Dependencies are read from the `dependencies` config and plugin
+        package metadata. Returns after all skills are loaded.
+        :param tasks: dict of skill_id to callable that loads the skill
+        """
+        config = self.parallel_load_config
+        priority = [s for s in self.skills_config.get("priority_skills") or []
+                    if s in tasks]
+        tasks = {**{s: tasks[s] for s in priority}, **tasks}
+        try:
+            dependencies = get_plugin_skill_dependencies()
+        except Exception as e:
+            LOG.error(f"Failed to read skill dependencies: {e}")
+            dependencies = dict()
+        for skill_id, deps in (config.get("dependencies") or {}).items():
+            dependencies.setdefault(skill_id, set()).update(deps)
+        for skill_id in tasks:
+            if skill_id not in priority:
+                dependencies.setdefault(skill_id, set()).update(priority)
+        start = monotonic()
+        results = run_dependency_graph(tasks, dependencies,
+                                       config.get("workers", 4))
+        LOG.info(f"Loaded {len([r for r in results.values() if r])}/"
+                 f"{len(tasks)} skills in {monotonic() - start}s")
+
+    def _get_plugin_skill_version(self, skill_id: str) -> str:
+        """
+        Get the installed version of a plugin skill
+        :param skill_id: plugin skill to get the version of
+        :returns: package version, or an empty string if unknown
+        """
+        if self._skill_versions is None or \
+                skill_id not in self._skill_versions:
+            self._skill_versions = get_plugin_skill_versions()
+        return self._skill_versions.get(skill_id, "")
+
+    def _load_plugin_skill(self, skill_id, skill_plugin):
+        if not self._lazy_config or \
+                skill_id in (self._lazy_config.get("exclude") or []):
+            return SkillManager._load_plugin_skill(self, skill_id,
+                                                   skill_plugin)
+        version = self._get_plugin_skill_version(skill_id)
+        manifest = self._manifests.get(skill_id, version)
+        if manifest and manifest.get("lazy") and \
+                get_manifest_intents(manifest):
+            return self._register_lazy_skill(skill_id, skill_plugin,
+                                             manifest)
+        # Record intents to load this skill on demand next time
+        self._recorder.start(skill_id)
+        loader = SkillManager._load_plugin_skill(self, skill_id, skill_plugin)
+        if loader:
+            timer = Timer(self._lazy_config.get("record_delay", 5),
+                          self._save_manifest,
+                          (skill_id, version,
+                           is_lazy_loadable(loader.instance)))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._recorder.stop(skill_id)
+        return loader
+
+    def _save_manifest(self, skill_id: str, version: str, lazy: bool):
+        """
+        Save the intent registrations recorded while loading a skill
+        :param skill_id: loaded skill
+        :param version: installed version of the skill
+        :param lazy: True if the skill may be loaded on demand
+        """
+        messages = self._recorder.stop(skill_id)
+        try:
+            self._manifests.save(skill_id, version, lazy, messages)
+            LOG.debug(f"Saved manifest for {skill_id} ({len(messages)} "
+                      f"registrations)")
+        except Exception as e:
+            LOG.error(f"Failed to save manifest for {skill_id}: {e}")
+
+    def _register_lazy_skill(self, skill_id: str, skill_plugin,
+                             manifest: dict):
+        """
+        Register a skill's intents from its manifest without loading it
+        :param skill_id: skill to register
+        :param skill_plugin: skill class to load when an intent is matched
+        :param manifest: skill manifest
+        :returns: PluginSkillLoader for the skill, which is not yet loaded
+        """
+        intents = get_manifest_intents(manifest)
+        with self._lazy_lock:
+            self._lazy_skills[skill_id] = {"plugin": skill_plugin,
+                                           "intents": intents}
+            for intent in intents:
+                self._lazy_intents[intent] = skill_id
+                self.bus.on(intent, self._handle_lazy_intent)
+        for msg in manifest["messages"]:
+            self.bus.emit(Message(msg["type"], msg["data"], msg["context"]))
+        loader = self._get_plugin_skill_loader(skill_id)
+        self.plugin_skills[skill_id] = loader
+        LOG.info(f"Registered {len(intents)} intents for {skill_id}; the "
+                 f"skill will be loaded on first use")
+        return loader
+
+    def _handle_lazy_intent(self, message: Message):
+        """
+        Handle an intent of a skill that is not loaded yet
+        :param message: intent Message for a lazy skill
+        """
+        skill_id = self._lazy_intents.get(message.msg_type)
+        if skill_id:
+            Thread(target=self._activate_lazy_skill, args=(skill_id, message),
+                   daemon=True).start()
+
+    def _activate_lazy_skill(self, skill_id: str, message: Message):
+        """
+        Load a skill that was registered from its manifest and replay the
+        intent Messages received while it was loading
+        :param skill_id: skill to load
+        :param message: intent Message that triggered loading
+        """
+        with self._lazy_lock:
+            if skill_id in self._lazy_loading:
+                self._lazy_loading[skill_id].append(message)
+                return
+            lazy = self._lazy_skills.pop(skill_id, None)
+            if not lazy:
+                # Skill is already loaded
+                return
+            self._lazy_loading[skill_id] = [message]
+        LOG.info(f"Loading {skill_id} to handle {message.msg_type}")
+        # Remove registrations replayed from the manifest; the skill registers
+        # its intents and vocabulary again as it loads
+        self.bus.emit(Message("detach_skill", {"skill_id": skill_id}))
+        start = monotonic()
+        with self._lock:
+            loader = SkillManager._load_plugin_skill(self, skill_id,
+                                                     lazy["plugin"])
+        with self._lazy_lock:
+            for intent in lazy["intents"]:
+                self.bus.remove(intent, self._handle_lazy_intent)
+                self._lazy_intents.pop(intent, None)
+            pending = self._lazy_loading.pop(skill_id)
+        if not loader:
+            LOG.error(f"Failed to load {skill_id}; dropping {len(pending)} "
+                      f"requests")
+            return
+        LOG.info(f"Loaded {skill_id} in {monotonic() - start}s")
+        for msg in pending:
+            self.bus.emit(msg)
 
     def _get_plugin_skill_loader(self, skill_id, init_bus=True):
         assert self.bus is not None
@@ -71,10 +510,121 @@ class NeonSkillManager(SkillManager):
             LOG.debug("Ignoring request not to bind bus")
         return SkillManager._get_plugin_skill_loader(self, skill_id, True)
 
+    def _start_watcher(self):
+        """
+        Watch skill directories and installed package metadata for changes.
+        If changes cannot be watched, skills are only updated by polling.
+        """
+        try:
+            watcher = SkillChangeWatcher(self._handle_skill_changes,
+                                         self._watch_config.get("debounce",
+                                                                2))
+            for base_dir in self._get_skill_base_dirs():
+                if isdir(base_dir):
+                    watcher.watch(base_dir, recursive=True)
+            self._package_dirs = set(get_packages_fingerprint())
+            for package_dir in self._package_dirs:
+                watcher.watch(package_dir)
+            self._plugin_versions = get_plugin_skill_versions()
+            watcher.start()
+        except Exception as e:
+            LOG.warning(f"Failed to watch for skill changes, polling for "
+                        f"changes instead: {e}")
+            return
+        self._watcher = watcher
+        LOG.info("Watching for skill changes")
+
+    def _get_poll_interval(self, interval: float) -> Optional[float]:
+        """
+        Get the seconds between checks for added and removed skills
+        :param interval: default interval used when changes are not watched
+        :returns: `poll_interval` from watch config while changes are
+            watched (None to not check), else `interval`
+        """
+        if not self._watcher:
+            return interval
+        if not self._watcher.is_alive():
+            LOG.warning("Stopped watching for skill changes, polling for "
+                        "changes instead")
+            self._watcher.shutdown()
+            self._watcher = None
+            return interval
+        return self._watch_config.get("poll_interval", 3600)
+
+    def _handle_skill_changes(self, paths: Iterable[str]):
+        """
+        Reload changed skills and update installed skills
+        :param paths: changed files and directories
+        """
+        base_dirs = self._get_skill_base_dirs()
+        changed_skills = set()
+        packages_changed = False
+        for path in paths:
+            if dirname(path) in self._package_dirs:
+                packages_changed = True
+                continue
+            for base_dir in base_dirs:
+                if path.startswith(base_dir.rstrip("/") + "/"):
+                    rel_path = relpath(path, base_dir).split("/")
+                    # Skill directories that were added or removed are
+                    # handled, but files in them only if they are sources
+                    if len(rel_path) == 1 or is_skill_source(path):
+                        changed_skills.add(join(base_dir, rel_path[0]))
+        LOG.debug(f"Skill changes detected: {changed_skills}, "
+                  f"packages_changed={packages_changed}")
+        if not changed_skills and not packages_changed:
+            return
+        with self._lock:
+            for skill_dir in changed_skills:
+                loader = self.skill_loaders.get(skill_dir)
+                if loader and isdir(skill_dir):
+                    LOG.info(f"{loader.skill_id} changed; reloading")
+                    try:
+                        loader.reload()
+                    except Exception as e:
+                        LOG.exception(f"Failed to reload {skill_dir}: {e}")
+            if packages_changed:
+                self._unload_changed_plugin_skills()
+        # New skills are loaded and removed skills are unloaded
+        self._unload_removed_skills()
+        self._load_new_skills()
+
+    def _unload_changed_plugin_skills(self):
+        """
+        Unload plugin skills whose package was removed or changed version.
+        Modules of changed skills are removed so an upgraded skill is
+        imported again when it is loaded. Must be called with `self._lock`
+        """
+        versions = get_plugin_skill_versions()
+        for skill_id, version in self._plugin_versions.items():
+            if versions.get(skill_id) == version:
+                continue
+            LOG.info(f"{skill_id} changed from {version} to "
+                     f"{versions.get(skill_id)}")
+            loader = self.plugin_skills.get(skill_id)
+            module = type(loader.instance).__module__ if \
+                loader and loader.instance else None
+            self._unload_plugin_skill(skill_id)
+            if module:
+                package = module.split(".")[0]
+                for name in [m for m in sys.modules if m == package or
+                             m.startswith(f"{package}.")]:
+                    sys.modules.pop(name, None)
+        self._plugin_versions = versions
+
+    def stop(self):
+        SkillManager.stop(self)
+        if self._recorder:
+            self._recorder.shutdown()
+        if self._watcher:
+            self._watcher.shutdown()
+
     def run(self):
         """Load skills and update periodically from disk and internet."""
         from os import environ
         environ.setdefault('OVOS_CONFIG_BASE_FOLDER', "neon")
         environ.setdefault('OVOS_CONFIG_FILENAME', "neon.yaml")
         LOG.debug("set default configuration to `neon/neon.yaml`")
+        if self._watch_config:
+            self._start_watcher()
         SkillManager.run(self)
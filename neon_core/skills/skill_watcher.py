@@ -0,0 +1,169 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from os.path import basename
+from threading import Lock, Timer
+from typing import Callable, Optional, Set
+
+from ovos_utils.log import LOG
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+# Events that indicate a file or directory was added, changed, or removed
+CHANGE_EVENTS = ("created", "deleted", "modified", "moved")
+# Files written by skills at runtime or by editors and package installers
+IGNORED_FILES = ("settings.json",)
+IGNORED_SUFFIXES = (".pyc", ".pyo", ".swp", ".tmp", "~")
+# Skill source and resource files; changes to other files in a skill
+# directory (i.e. data written by the skill) do not reload the skill
+SOURCE_SUFFIXES = (".py", ".voc", ".dialog", ".intent", ".entity", ".rx",
+                   ".value", ".word", ".list", ".qml")
+SOURCE_FILES = ("skill.json", "settingsmeta.json", "settingsmeta.yaml",
+                "settingsmeta.yml", "requirements.txt", "manifest.yml")
+
+
+def is_skill_change(path: str) -> bool:
+    """
+    Check if a changed path may change installed skills
+    :param path: path of a created, modified, or removed file
+    :returns: False if the change should be ignored
+    """
+    if "__pycache__" in path:
+        return False
+    name = basename(path)
+    return not (name.startswith(".") or name in IGNORED_FILES or
+                name.endswith(IGNORED_SUFFIXES))
+
+
+def is_skill_source(path: str) -> bool:
+    """
+    Check if a changed file in a skill directory may change the skill
+    :param path: path of a created, modified, or removed file
+    :returns: True if the file is skill source code or a resource file
+    """
+    name = basename(path)
+    return name in SOURCE_FILES or name.endswith(SOURCE_SUFFIXES)
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    def __init__(self, on_change: Callable[[str], None]):
+        FileSystemEventHandler.__init__(self)
+        self._on_change = on_change
+
+    def on_any_event(self, event):
+        if event.event_type not in CHANGE_EVENTS:
+            return
+        if event.is_directory and event.event_type == "modified":
+            # Changes to directory contents are handled as separate events
+            return
+        for path in (event.src_path, getattr(event, "dest_path", None)):
+            if path and is_skill_change(path):
+                self._on_change(path)
+
+
+class SkillChangeWatcher:
+    """
+    Watches skill directories and installed package metadata for changes.
+    Changes are collected until no changes are made for `debounce` seconds,
+    so a burst of changes (i.e. a pip install) results in one callback.
+    """
+    def __init__(self, callback: Callable[[Set[str]], None],
+                 debounce: float = 2.0):
+        """
+        :param callback: called with the set of changed paths
+        :param debounce: seconds without changes to wait before calling back
+        """
+        if Observer is None:
+            raise ImportError("watchdog is required to watch for changes")
+        self.callback = callback
+        self.debounce = debounce
+        self._lock = Lock()
+        self._changes = set()
+        self._timer: Optional[Timer] = None
+        self._handler = _ChangeHandler(self._add_change)
+        self._observer = Observer()
+        self._observer.daemon = True
+
+    def watch(self, path: str, recursive: bool = False):
+        """
+        Watch a directory for changes
+        :param path: directory to watch
+        :param recursive: if True, watch subdirectories too
+        """
+        self._observer.schedule(self._handler, path, recursive=recursive)
+
+    def start(self):
+        """
+        Start watching for changes
+        """
+        self._observer.start()
+
+    def is_alive(self) -> bool:
+        """
+        Check if changes are being watched
+        :returns: True if the observer thread is running
+        """
+        return self._observer.is_alive()
+
+    def _add_change(self, path: str):
+        with self._lock:
+            self._changes.add(path)
+            if self._timer:
+                self._timer.cancel()
+            self._timer = Timer(self.debounce, self._notify)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _notify(self):
+        with self._lock:
+            changes = self._changes
+            self._changes = set()
+            self._timer = None
+        if not changes:
+            return
+        try:
+            self.callback(changes)
+        except Exception as e:
+            LOG.exception(f"Failed to handle skill changes: {e}")
+
+    def shutdown(self):
+        """
+        Stop watching for changes and discard any pending changes
+        """
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+            self._changes = set()
+        self._observer.stop()
+        if self._observer.is_alive():
+            self._observer.join(5)
@@ -0,0 +1,196 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import shutil
+import wave
+
+from datetime import datetime
+from hashlib import sha1
+from queue import Queue, Empty, Full
+from threading import Event, Thread
+from typing import List, NamedTuple, Optional
+
+from ovos_utils.log import LOG
+from ovos_utils.xdg_utils import xdg_data_home
+
+
+class TranscriptRecord(NamedTuple):
+    user: str
+    utterance: str
+    timestamp: float
+    audio_file: Optional[str]
+    # Source audio path if it still needs to be copied to `audio_file`
+    audio_source: Optional[str] = None
+
+
+class TranscriptWriter:
+    """
+    Writes transcripts on a background thread so utterance handling does not
+    wait on disk or database writes. Audio files are hard-linked from their
+    temporary path where possible, else copied to disk in the background.
+    Records are passed to the backend `write_transcripts` in batches.
+    """
+    def __init__(self, backend, audio_dir: Optional[str] = None,
+                 max_queued: int = 256, batch_size: int = 16,
+                 flush_interval: float = 1.0):
+        """
+        :param backend: transcript backend implementing `write_transcripts`,
+            or `write_transcript` accepting audio frames
+        :param audio_dir: directory to save audio files to
+        :param max_queued: max records waiting to be written (0 unbounded)
+        :param batch_size: max records to pass to the backend at once
+        :param flush_interval: max seconds to wait for a batch to fill
+        """
+        self._backend = backend
+        self.audio_dir = audio_dir or os.path.join(xdg_data_home(), "neon",
+                                                   "transcripts", "audio")
+        self._batch_size = max(batch_size, 1)
+        self._flush_interval = flush_interval
+        self._queue = Queue(max_queued)
+        self._stopping = Event()
+        self._thread = Thread(target=self._run, daemon=True,
+                              name="transcript_writer")
+        self._thread.start()
+
+    def get_audio_file(self, user: str, utterance: str,
+                       timestamp: float) -> str:
+        """
+        Get the path an utterance's audio is saved to. The path depends only
+        on the passed values, so it is known before the audio is written.
+        :param user: username associated with the utterance
+        :param utterance: transcribed utterance
+        :param timestamp: time the utterance was transcribed
+        :returns: path to the audio file
+        """
+        key = sha1(f"{user}|{timestamp}|{utterance}".encode()).hexdigest()
+        name = datetime.fromtimestamp(timestamp).strftime("%Y%m%d-%H%M%S")
+        return os.path.join(self.audio_dir, user or "local",
+                            f"{name}-{key[:12]}.wav")
+
+    def submit(self, user: str, utterance: str, timestamp: float,
+               audio: Optional[str] = None) -> Optional[str]:
+        """
+        Queue a transcript to be written.
+        :param user: username associated with the utterance
+        :param utterance: transcribed utterance
+        :param timestamp: time the utterance was transcribed
+        :param audio: path to a (temporary) audio file of the utterance
+        :returns: path the audio will be written to, if audio was provided
+        """
+        if self._stopping.is_set():
+            LOG.warning(f"Transcript writer stopped; dropped: {utterance}")
+            return None
+        audio_file = None
+        source = None
+        if audio:
+            audio_file = self.get_audio_file(user, utterance, timestamp)
+            try:
+                os.makedirs(os.path.dirname(audio_file), exist_ok=True)
+                os.link(audio, audio_file)
+            except FileExistsError:
+                pass
+            except OSError:
+                # Different filesystem; copy in the background
+                source = audio
+        try:
+            self._queue.put_nowait(TranscriptRecord(user, utterance,
+                                                    timestamp, audio_file,
+                                                    source))
+        except Full:
+            LOG.warning(f"Transcript queue full; dropped: {utterance}")
+            if audio_file and not source:
+                self._remove(audio_file)
+            return None
+        return audio_file
+
+    def _run(self):
+        while not (self._stopping.is_set() and self._queue.empty()):
+            record = self._queue.get()
+            batch = list()
+            while record is not None:
+                batch.append(record)
+                if len(batch) >= self._batch_size:
+                    break
+                try:
+                    record = self._queue.get(
+                        timeout=0 if self._stopping.is_set() else
+                        self._flush_interval)
+                except Empty:
+                    break
+            if batch:
+                self._write_batch(batch)
+
+    def _write_batch(self, batch: List[TranscriptRecord]):
+        for record in batch:
+            if record.audio_source:
+                try:
+                    shutil.copyfile(record.audio_source, record.audio_file)
+                except OSError as e:
+                    LOG.error(f"Failed to save audio "
+                              f"{record.audio_source}: {e}")
+        try:
+            if hasattr(self._backend, "write_transcripts"):
+                self._backend.write_transcripts(batch)
+                return
+        except Exception as e:
+            LOG.exception(f"Failed to write {len(batch)} transcripts: {e}")
+            return
+        # Backends without batch support take audio frames per record
+        for record in batch:
+            try:
+                audio = None
+                if record.audio_file:
+                    with wave.open(record.audio_file, 'r') as f:
+                        audio = f.readframes(f.getnframes())
+                self._backend.write_transcript(record.user, record.utterance,
+                                               record.timestamp, audio)
+            except Exception as e:
+                LOG.exception(f"Failed to write transcript "
+                              f"{record.utterance}: {e}")
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def shutdown(self, timeout: float = 10):
+        """
+        Write any queued transcripts and stop the writer thread.
+        :param timeout: max seconds to wait for queued writes
+        """
+        self._stopping.set()
+        try:
+            # Wake the writer if it is waiting on an empty queue. If the queue
+            # is full, the writer exits once it has been drained.
+            self._queue.put_nowait(None)
+        except Full:
+            pass
+        self._thread.join(timeout)
@@ -0,0 +1,295 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import deque
+from enum import Enum
+from queue import Queue
+from threading import Event, Lock, Thread
+from time import monotonic, time
+from typing import Dict, Hashable, Optional, Tuple
+
+from neon_utils.message_utils import get_message_user
+from ovos_bus_client import Message
+from ovos_utils.log import LOG
+
+
+class ShedPolicy(str, Enum):
+    """
+    Policy for shedding utterances when the intake queue is full
+    """
+    REJECT_NEWEST = "reject_newest"
+    DROP_OLDEST = "drop_oldest"
+
+
+def get_session_id(message: Message) -> str:
+    """
+    Get the session ID associated with a message
+    :param message: Message to get the session of
+    :returns: session ID or `default`
+    """
+    return (message.context.get("session") or {}).get("session_id") or \
+        "default"
+
+
+def get_coalesce_key(message: Message) -> Hashable:
+    """
+    Get a key identifying duplicate requests of the same utterance
+    :param message: utterance Message before any transformers are applied
+    :returns: tuple of user, normalized utterances, and language
+    """
+    utterances = tuple(" ".join(u.lower().split()) for u in
+                       message.data.get("utterances") or [] if u.strip())
+    return (get_message_user(message) or get_session_id(message), utterances,
+            (message.data.get("lang") or "").lower())
+
+
+class UtteranceCoalescer:
+    """
+    Tracks utterances that are being handled so duplicate requests from the
+    same user can be dropped instead of being handled again. Optionally
+    treats requests received shortly after a duplicate was handled as
+    duplicates too.
+    """
+    def __init__(self, window: float = 0):
+        """
+        :param window: seconds after handling an utterance to keep treating
+            identical requests as duplicates
+        """
+        self._window = window
+        self._lock = Lock()
+        # key: number of requests coalesced into the in-flight request
+        self._in_flight: Dict[Hashable, int] = dict()
+        # key: monotonic time the request was handled
+        self._completed: Dict[Hashable, float] = dict()
+
+    def start(self, key: Hashable) -> bool:
+        """
+        Register a request as in flight, unless it duplicates another request
+        :param key: key returned by `get_coalesce_key`
+        :returns: True if the request should be handled, False if duplicate
+        """
+        now = monotonic()
+        with self._lock:
+            for expired in [k for k, t in self._completed.items()
+                            if now - t > self._window]:
+                self._completed.pop(expired)
+            if key in self._in_flight:
+                self._in_flight[key] += 1
+                return False
+            if key in self._completed:
+                return False
+            self._in_flight[key] = 0
+            return True
+
+    def finish(self, key: Hashable, handled: bool = True) -> int:
+        """
+        Mark an in-flight request as complete
+        :param key: key passed to `start`
+        :param handled: False if the request was dropped without handling
+        :returns: number of duplicate requests coalesced into this one
+        """
+        with self._lock:
+            duplicates = self._in_flight.pop(key, 0)
+            if self._window and handled:
+                self._completed[key] = monotonic()
+        return duplicates
+
+
+class UtteranceWorkerPool:
+    """
+    Handles utterances from different sessions in parallel on a pool of
+    worker threads, preserving the order of utterances within each session.
+    Optionally bounds the number of queued utterances, shedding utterances
+    according to a `ShedPolicy` when a limit is reached.
+    """
+    def __init__(self, handler: callable, workers: int = 4,
+                 max_queued: int = 0, max_queued_per_user: int = 0,
+                 shed_policy: ShedPolicy = ShedPolicy.REJECT_NEWEST,
+                 on_shed: Optional[callable] = None):
+        """
+        :param handler: callable that accepts an utterance Message
+        :param workers: number of worker threads
+        :param max_queued: max utterances waiting for a worker (0 unbounded)
+        :param max_queued_per_user: max utterances waiting for any one user
+            (0 unbounded)
+        :param shed_policy: policy for shedding utterances over a limit
+        :param on_shed: callable that accepts a shed Message and reason
+        """
+        self._handler = handler
+        self._max_queued = max_queued
+        self._max_per_user = max_queued_per_user
+        self._shed_policy = ShedPolicy(shed_policy)
+        self._on_shed = on_shed
+        self._lock = Lock()
+        # session_id: queued (timestamp, Message, user, on_done) for sessions
+        # with work
+        self._sessions: Dict[str, deque] = dict()
+        self._users: Dict[str, int] = dict()
+        self._ready = Queue()
+        self._pending = 0
+        self._queued = 0
+        self._idle = Event()
+        self._idle.set()
+        self._threads = [Thread(target=self._run, daemon=True,
+                                name=f"utterance_worker_{i}")
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def depth(self) -> int:
+        """
+        Number of utterances queued or being handled
+        """
+        return self._pending
+
+    def submit(self, message: Message,
+               on_done: Optional[callable] = None) -> bool:
+        """
+        Queue an utterance to be handled after any earlier utterances in the
+        same session. Queue depth is added to the message timing context.
+        :param message: utterance Message to handle
+        :param on_done: callable that accepts the Message and an error string
+            (None if handled), called once the utterance is handled or shed
+        :returns: True if the utterance was queued, False if it was shed
+        """
+        session_id = get_session_id(message)
+        user = get_message_user(message) or session_id
+        shed = None
+        with self._lock:
+            if self._max_per_user and \
+                    self._users.get(user, 0) >= self._max_per_user:
+                shed = self._shed(message, on_done, "user_limit", user)
+            elif self._max_queued and self._queued >= self._max_queued:
+                shed = self._shed(message, on_done, "queue_full")
+            queued = shed is None or shed[0] is not message
+            if queued:
+                self._enqueue(session_id, user, message, on_done)
+        if shed:
+            shed_message, shed_done, reason = shed
+            LOG.warning(f"Shed utterance ({reason}): "
+                        f"{shed_message.data.get('utterances')}")
+            if self._on_shed:
+                self._on_shed(shed_message, reason)
+            if shed_done:
+                shed_done(shed_message, reason)
+        return queued
+
+    def _enqueue(self, session_id: str, user: str, message: Message,
+                 on_done: Optional[callable]):
+        self._pending += 1
+        self._queued += 1
+        self._users[user] = self._users.get(user, 0) + 1
+        self._idle.clear()
+        message.context.setdefault("timing", dict())
+        message.context["timing"]["queue_depth"] = self._pending
+        if session_id in self._sessions:
+            # Session is queued or being handled; handle after current
+            self._sessions[session_id].append((time(), message, user,
+                                               on_done))
+        else:
+            self._sessions[session_id] = deque([(time(), message, user,
+                                                 on_done)])
+            self._ready.put(session_id)
+
+    def _shed(self, message: Message, on_done: Optional[callable],
+              reason: str, user: Optional[str] = None) -> \
+            Tuple[Message, Optional[callable], str]:
+        """
+        Select an utterance to shed according to the configured policy.
+        Must be called with `self._lock` held.
+        :param message: new utterance Message
+        :param on_done: completion callback of the new utterance
+        :param reason: reason the queue limit was reached
+        :param user: user whose limit was reached, None for the whole queue
+        :returns: shed Message, its completion callback, and reason
+        """
+        if self._shed_policy == ShedPolicy.REJECT_NEWEST:
+            return message, on_done, reason
+        candidates = [(item[0], session_id, item)
+                      for session_id, queue in self._sessions.items()
+                      for item in queue if user is None or item[2] == user]
+        if not candidates:
+            return message, on_done, reason
+        _, session_id, item = min(candidates, key=lambda c: c[0])
+        self._sessions[session_id].remove(item)
+        self._dequeued(item[2])
+        self._pending -= 1
+        return item[1], item[3], reason
+
+    def _dequeued(self, user: str):
+        self._queued -= 1
+        self._users[user] -= 1
+        if not self._users[user]:
+            self._users.pop(user)
+
+    def _run(self):
+        while True:
+            session_id = self._ready.get()
+            if session_id is None:
+                break
+            with self._lock:
+                if not self._sessions.get(session_id):
+                    # Queued utterances were shed
+                    self._sessions.pop(session_id, None)
+                    continue
+                queued, message, user, on_done = \
+                    self._sessions[session_id].popleft()
+                self._dequeued(user)
+            message.context["timing"]["queue_wait"] = time() - queued
+            error = None
+            try:
+                self._handler(message)
+            except Exception as e:
+                LOG.exception(e)
+                error = repr(e)
+            if on_done:
+                try:
+                    on_done(message, error)
+                except Exception as e:
+                    LOG.exception(e)
+            with self._lock:
+                self._pending -= 1
+                if self._sessions[session_id]:
+                    self._ready.put(session_id)
+                else:
+                    self._sessions.pop(session_id)
+                if not self._pending:
+                    self._idle.set()
+
+    def shutdown(self, timeout: float = 10):
+        """
+        Stop worker threads after queued utterances are handled
+        :param timeout: max seconds to wait for queued utterances
+        """
+        if not self._idle.wait(timeout):
+            LOG.warning(f"Stopping with {self._pending} utterances pending")
+        for _ in self._threads:
+            self._ready.put(None)
+        for thread in self._threads:
+            thread.join(1)
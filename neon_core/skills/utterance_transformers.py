@@ -0,0 +1,140 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+from typing import List, Optional, Tuple
+
+from neon_transformers.text_transformers import UtteranceTransformersService
+from ovos_utils.json_helper import merge_dict
+from ovos_utils.log import LOG
+
+
+class NeonUtteranceTransformersService(UtteranceTransformersService):
+    """
+    Utterance transformers service that runs consecutive transformers which
+    do not depend on earlier transformers' output concurrently. A transformer
+    is independent if its config sets `independent: True` or the plugin
+    class defines `independent = True`. If more than one transformer in a
+    concurrent stage changes the utterances, the later ones are run again on
+    the changed utterances, as they would be if run in order.
+    """
+    def __init__(self, bus, config=None, workers: int = 0):
+        """
+        :param bus: MessageBusClient to bind to
+        :param config: Core configuration
+        :param workers: max threads for independent transformers (0 serial)
+        """
+        UtteranceTransformersService.__init__(self, bus, config)
+        self._executor = ThreadPoolExecutor(
+            workers, "utterance_transformer") if workers else None
+
+    def is_independent(self, name: str) -> bool:
+        """
+        Check if a transformer may run concurrently with other transformers
+        :param name: name of a loaded transformer plugin
+        :returns: True if the transformer does not depend on earlier output
+        """
+        config = self.config.get(name) or {}
+        if "independent" in config:
+            return config["independent"] is True
+        return getattr(self.loaded_modules[name], "independent", False) is True
+
+    def _get_stages(self) -> List[List[str]]:
+        """
+        Group loaded transformers into stages in priority order. Consecutive
+        independent transformers are grouped into a single stage.
+        :returns: list of stages, each a list of transformer names
+        """
+        names = sorted(self.loaded_modules,
+                       key=lambda n: self.loaded_modules[n].priority,
+                       reverse=True)
+        stages = list()
+        for name in names:
+            if self._executor and stages and self.is_independent(name) and \
+                    self.is_independent(stages[-1][-1]):
+                stages[-1].append(name)
+            else:
+                stages.append([name])
+        return stages
+
+    def _transform(self, name: str, utterances: List[str],
+                   context: dict) -> Tuple[Optional[list], dict, float]:
+        """
+        Run a single transformer
+        :returns: transformed utterances (None on error), context, duration
+        """
+        module = self.loaded_modules[name]
+        start = time()
+        try:
+            utterances, data = module.transform(utterances, context)
+            LOG.debug(f"{name}: {data}")
+        except Exception as e:
+            LOG.warning(f"{name} transform exception: {e}")
+            utterances, data = None, {}
+        return utterances, data, time() - start
+
+    def transform(self, utterances: List[str], context: Optional[dict] = None):
+        context = context or {}
+        timing = dict()
+        for stage in self._get_stages():
+            if len(stage) == 1:
+                results = [self._transform(stage[0], utterances, context)]
+            else:
+                futures = [self._executor.submit(self._transform, name,
+                                                 list(utterances),
+                                                 dict(context))
+                           for name in stage]
+                results = [future.result() for future in futures]
+            # Apply results in priority order, as in serial execution
+            stage_input = list(utterances)
+            rewriter = None
+            for name, (transformed, data, duration) in zip(stage, results):
+                changed = transformed is not None and \
+                    (len(stage) == 1 or transformed != stage_input)
+                if changed and rewriter:
+                    LOG.warning(f"{name} and {rewriter} both changed "
+                                f"utterances; running {name} on the output "
+                                f"of {rewriter}. Set `independent: False` "
+                                f"for one of them to run them in order")
+                    transformed, data, rerun = self._transform(
+                        name, list(utterances), dict(context))
+                    duration += rerun
+                    changed = transformed is not None
+                timing[name] = duration
+                if changed:
+                    utterances = transformed
+                    rewriter = name
+                context = merge_dict(context, data)
+        context.setdefault("timing", dict())["transformers"] = timing
+        return utterances, context
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False)
+        UtteranceTransformersService.shutdown(self)
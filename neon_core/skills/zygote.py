@@ -0,0 +1,259 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import gc
+import importlib
+import logging
+import os
+import signal
+import sys
+import threading
+
+from threading import Event, Timer
+from time import monotonic
+from typing import Any, Callable, Iterable, List, Optional
+
+from ovos_utils.log import LOG
+
+from neon_core.skills.skill_index import get_packages_fingerprint, \
+    get_plugin_skill_entry_points
+
+# Modules imported by every skills service that are slow to import
+DEFAULT_PRELOAD_MODULES = ("ovos_bus_client",
+                           "ovos_config.config",
+                           "ovos_core.intent_services",
+                           "ovos_core.skill_manager",
+                           "ovos_workshop.skill_launcher",
+                           "ovos_workshop.skills",
+                           "lingua_franca",
+                           "lingua_franca.format",
+                           "lingua_franca.parse",
+                           "padatious",
+                           "padacioso",
+                           "neon_core.skills.intent_service",
+                           "neon_core.skills.service")
+
+
+def preload_modules(modules: Iterable[str]) -> List[str]:
+    """
+    Import modules so they are shared with forked processes
+    :param modules: names of modules to import
+    :returns: names of imported modules
+    """
+    loaded = list()
+    for module in modules:
+        try:
+            importlib.import_module(module)
+            loaded.append(module)
+        except Exception as e:
+            # Optional dependencies may not be installed
+            LOG.debug(f"Not preloading {module}: {e}")
+    return loaded
+
+
+def get_plugin_skill_modules() -> List[str]:
+    """
+    Get the modules providing installed plugin skills
+    :returns: list of module names
+    """
+    return [value.split(":")[0].strip()
+            for value in get_plugin_skill_entry_points().values()]
+
+
+class SkillsZygote:
+    """
+    Imports shared modules once and forks a worker process to run the
+    skills service. The worker is forked again when it crashes or when the
+    zygote receives SIGHUP, so a restart does not import everything again.
+    Preloaded modules are shared with each worker as copy-on-write memory.
+    """
+    def __init__(self, worker: Callable[[], Any],
+                 preload: Optional[List[str]] = None,
+                 preload_skills: bool = False, restart_delay: float = 1.0,
+                 max_restart_delay: float = 60.0, stop_timeout: float = 30.0):
+        """
+        :param worker: function to call in each worker process
+        :param preload: modules to preload in addition to defaults
+        :param preload_skills: if True, preload plugin skill modules
+        :param restart_delay: seconds to wait before restarting a worker
+            that crashed. The delay doubles for each consecutive crash
+        :param max_restart_delay: maximum seconds to wait before restarting
+        :param stop_timeout: seconds to wait for a worker to stop before
+            killing it
+        """
+        self.worker = worker
+        self.preload_modules = list(DEFAULT_PRELOAD_MODULES) + \
+            list(preload or [])
+        self.preload_skills = preload_skills
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.stop_timeout = stop_timeout
+        self._stop_event = Event()
+        self._restart_requested = False
+        self._kill_timer: Optional[Timer] = None
+        self._pid: Optional[int] = None
+        self._packages = None
+
+    def preload(self):
+        """
+        Import shared modules and freeze them so garbage collection in
+        workers does not copy their memory
+        """
+        start = monotonic()
+        modules = self.preload_modules
+        if self.preload_skills:
+            modules = modules + get_plugin_skill_modules()
+        loaded = preload_modules(modules)
+        self._packages = get_packages_fingerprint()
+        gc.collect()
+        gc.freeze()
+        if threading.active_count() > 1:
+            LOG.warning(f"Threads started while preloading will not run in "
+                        f"workers: {threading.enumerate()}")
+        LOG.info(f"Preloaded {len(loaded)} modules in {monotonic() - start}s")
+
+    def run(self):
+        """
+        Preload modules and run workers until stopped. Returns when a
+        worker exits cleanly or the zygote receives SIGINT or SIGTERM.
+        """
+        if not hasattr(os, "fork"):
+            LOG.warning("fork is not supported, running without a zygote")
+            self.worker()
+            return
+        self.preload()
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_restart)
+        delay = self.restart_delay
+        while not self._stop_event.is_set():
+            if get_packages_fingerprint() != self._packages:
+                LOG.info("Installed packages changed, restarting zygote")
+                self._reexec()
+            started = monotonic()
+            self._pid = self._fork_worker()
+            LOG.info(f"Started skills worker: {self._pid}")
+            exit_code = self._wait(self._pid)
+            self._pid = None
+            if self._kill_timer:
+                self._kill_timer.cancel()
+            if self._stop_event.is_set():
+                break
+            if self._restart_requested:
+                LOG.info("Restarting skills worker")
+                self._restart_requested = False
+                delay = self.restart_delay
+                continue
+            if exit_code == 0:
+                LOG.info("Skills worker exited")
+                break
+            if monotonic() - started > self.max_restart_delay:
+                # Worker ran normally before crashing
+                delay = self.restart_delay
+            LOG.error(f"Skills worker exited with code {exit_code}, "
+                      f"restarting in {delay}s")
+            self._stop_event.wait(delay)
+            delay = min(delay * 2, self.max_restart_delay)
+        LOG.info("Skills zygote stopped")
+
+    def _fork_worker(self) -> int:
+        """
+        Fork a worker process
+        :returns: PID of the worker
+        """
+        pid = os.fork()
+        if pid:
+            return pid
+        exit_code = 1
+        try:
+            signal.signal(signal.SIGHUP, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            # Configuration may have changed since the zygote started
+            from ovos_config.config import Configuration
+            Configuration.reload()
+            self.worker()
+            exit_code = 0
+        except Exception as e:
+            LOG.exception(f"Skills worker failed: {e}")
+        finally:
+            logging.shutdown()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
+
+    @staticmethod
+    def _wait(pid: int) -> int:
+        """
+        Wait for a worker to exit
+        :param pid: PID of the worker
+        :returns: exit code, or negative signal number if killed by a signal
+        """
+        _, status = os.waitpid(pid, 0)
+        return os.waitstatus_to_exitcode(status)
+
+    def _signal_worker(self, signum: int):
+        pid = self._pid
+        if not pid:
+            return
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            return
+        if signum == signal.SIGTERM:
+            self._kill_timer = Timer(self.stop_timeout, self._kill_worker,
+                                     (pid,))
+            self._kill_timer.daemon = True
+            self._kill_timer.start()
+
+    def _kill_worker(self, pid: int):
+        if self._pid == pid:
+            LOG.warning(f"Skills worker did not stop, killing {pid}")
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def _handle_stop(self, signum, frame):
+        LOG.info(f"Stopping on signal {signal.Signals(signum).name}")
+        self._stop_event.set()
+        self._signal_worker(signal.SIGTERM)
+
+    def _handle_restart(self, signum, frame):
+        self._restart_requested = True
+        self._signal_worker(signal.SIGTERM)
+
+    @staticmethod
+    def _reexec():
+        """
+        Replace this process with a new zygote so changed packages are
+        imported
+        """
+        argv = getattr(sys, "orig_argv", None) or [sys.executable] + sys.argv
+        logging.shutdown()
+        os.execv(sys.executable, argv)
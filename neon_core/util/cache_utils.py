@@ -0,0 +1,85 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from threading import RLock
+from time import time
+from typing import Any, Hashable, Optional
+
+from neon_utils.cache_utils import LRUCache
+
+
+class TimedLRUCache(LRUCache):
+    """
+    Thread-safe LRU cache where entries expire `ttl` seconds after insertion.
+    A `ttl` of `0` or `None` disables expiration.
+    """
+    def __init__(self, capacity: int = 128, ttl: Optional[float] = None):
+        LRUCache.__init__(self, capacity)
+        self.ttl = ttl
+        self._lock = RLock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value, counting a miss if the key is missing or expired
+        :param key: key to look up
+        :returns: cached value or None
+        """
+        with self._lock:
+            entry = LRUCache.get(self, key)
+            if entry is None:
+                return None
+            inserted, value = entry
+            if self.ttl and time() - inserted > self.ttl:
+                self.cache.pop(key, None)
+                self._hits -= 1
+                self._missed += 1
+                return None
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Add or replace a cached value
+        :param key: key to cache `value` under
+        :param value: value to cache
+        """
+        with self._lock:
+            LRUCache.put(self, key, (time(), value))
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """
+        Remove a key from the cache without affecting hit/miss metrics
+        :param key: key to remove
+        :returns: removed value or None
+        """
+        with self._lock:
+            entry = self.cache.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self):
+        with self._lock:
+            LRUCache.clear(self)
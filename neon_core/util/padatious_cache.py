@@ -0,0 +1,214 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import os
+import shutil
+
+from hashlib import sha256
+from os.path import expanduser, isdir, isfile, join, dirname
+from tempfile import mkdtemp
+from typing import Dict, List, Optional
+
+from ovos_config.meta import get_xdg_base
+from ovos_utils.log import LOG
+from ovos_utils.xdg_utils import xdg_data_home
+
+_MANIFEST = "manifest.json"
+_CURRENT = "current"
+_FORMAT_VERSION = 1
+
+
+def get_intent_cache_dir(padatious_config: dict) -> str:
+    """
+    Get the padatious intent cache directory, with the same default as the
+    padatious intent service
+    :param padatious_config: `padatious` configuration
+    :returns: intent cache directory
+    """
+    return expanduser(padatious_config.get("intent_cache") or
+                      f"{xdg_data_home()}/{get_xdg_base()}/intent_cache")
+
+
+def _hash_file(path: str) -> str:
+    """
+    Get the sha256 hash of a file's contents
+    :param path: file to hash
+    :returns: hex digest of the file contents
+    """
+    digest = sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _get_cache_files(intent_cache: str) -> Dict[str, str]:
+    """
+    Get all files in a padatious intent cache
+    :param intent_cache: padatious intent cache directory
+    :returns: dict of relative file path to content hash
+    """
+    files = dict()
+    for root, _, filenames in os.walk(intent_cache):
+        for filename in filenames:
+            path = join(root, filename)
+            files[os.path.relpath(path, intent_cache)] = _hash_file(path)
+    return files
+
+
+def build_intent_cache_artifact(intent_cache: str, artifact_dir: str,
+                                keep: int = 3) -> str:
+    """
+    Package a trained padatious intent cache as a read-only artifact named by
+    the hash of its contents and mark it as the current artifact. Superseded
+    artifacts are removed once the new artifact is current.
+    :param intent_cache: trained padatious intent cache directory
+    :param artifact_dir: directory to write artifacts to
+    :param keep: number of most recent artifacts to keep (0 keeps all)
+    :returns: path to the built artifact
+    """
+    intent_cache = expanduser(intent_cache)
+    artifact_dir = expanduser(artifact_dir)
+    if not isdir(intent_cache):
+        raise FileNotFoundError(f"Intent cache not found: {intent_cache}")
+    files = _get_cache_files(intent_cache)
+    if not files:
+        raise ValueError(f"Intent cache is empty: {intent_cache}")
+    digest = sha256(json.dumps(files, sort_keys=True).encode()).hexdigest()
+    artifact = join(artifact_dir, digest)
+    os.makedirs(artifact_dir, exist_ok=True)
+    if not isdir(artifact):
+        tmp_dir = mkdtemp(prefix=".build-", dir=artifact_dir)
+        try:
+            for file in files:
+                path = join(tmp_dir, file)
+                os.makedirs(dirname(path), exist_ok=True)
+                shutil.copyfile(join(intent_cache, file), path)
+                os.chmod(path, 0o444)
+            with open(join(tmp_dir, _MANIFEST), 'w') as f:
+                json.dump({"version": _FORMAT_VERSION, "files": files}, f,
+                          indent=2)
+            os.chmod(join(tmp_dir, _MANIFEST), 0o444)
+            os.rename(tmp_dir, artifact)
+            LOG.info(f"Built intent cache artifact: {artifact}")
+        except OSError as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not isdir(artifact):
+                raise e
+            # Another instance built the same artifact
+    else:
+        # Mark a rebuilt artifact as the most recent
+        os.utime(artifact)
+    pointer = join(artifact_dir, f".{_CURRENT}.{os.getpid()}")
+    with open(pointer, 'w') as f:
+        f.write(digest)
+    os.replace(pointer, join(artifact_dir, _CURRENT))
+    if keep:
+        prune_intent_cache_artifacts(artifact_dir, keep)
+    return artifact
+
+
+def prune_intent_cache_artifacts(artifact_dir: str, keep: int = 3) -> \
+        List[str]:
+    """
+    Remove all but the most recently built intent cache artifacts. The
+    current artifact is never removed.
+    :param artifact_dir: directory artifacts are written to
+    :param keep: number of most recent artifacts to keep
+    :returns: list of removed artifact paths
+    """
+    artifact_dir = expanduser(artifact_dir)
+    current = get_current_artifact(artifact_dir)
+    artifacts = [join(artifact_dir, name) for name in os.listdir(artifact_dir)
+                 if not name.startswith('.') and
+                 isfile(join(artifact_dir, name, _MANIFEST))]
+    artifacts.sort(key=lambda path: os.stat(path).st_mtime, reverse=True)
+    removed = list()
+    for artifact in artifacts[max(keep, 1):]:
+        if artifact == current:
+            continue
+        # Rename first so a partially removed artifact is never read
+        tmp_dir = join(artifact_dir, f".remove-{os.path.basename(artifact)}")
+        try:
+            os.rename(artifact, tmp_dir)
+        except OSError as e:
+            LOG.warning(f"Failed to remove {artifact}: {e}")
+            continue
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        removed.append(artifact)
+    if removed:
+        LOG.info(f"Removed {len(removed)} superseded intent cache artifacts")
+    return removed
+
+
+def get_current_artifact(artifact_dir: str) -> Optional[str]:
+    """
+    Get the current intent cache artifact
+    :param artifact_dir: directory artifacts are written to
+    :returns: path to the current artifact if one exists, else None
+    """
+    artifact_dir = expanduser(artifact_dir)
+    pointer = join(artifact_dir, _CURRENT)
+    if not isfile(pointer):
+        return None
+    with open(pointer) as f:
+        artifact = join(artifact_dir, f.read().strip())
+    if not isfile(join(artifact, _MANIFEST)):
+        LOG.warning(f"Invalid intent cache artifact: {artifact}")
+        return None
+    return artifact
+
+
+def install_intent_cache_artifact(artifact: str, intent_cache: str) -> int:
+    """
+    Copy any files from an intent cache artifact that are missing or changed
+    in the local intent cache. Padatious loads intents with a matching hash
+    from the cache, so only intents with changed source files are retrained.
+    :param artifact: path to an intent cache artifact
+    :param intent_cache: padatious intent cache directory to update
+    :returns: number of files copied
+    """
+    intent_cache = expanduser(intent_cache)
+    with open(join(artifact, _MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest.get("version") != _FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact version: "
+                         f"{manifest.get('version')}")
+    installed = 0
+    for file, file_hash in manifest["files"].items():
+        path = join(intent_cache, file)
+        if isfile(path) and _hash_file(path) == file_hash:
+            continue
+        os.makedirs(dirname(path), exist_ok=True)
+        tmp_file = f"{path}.{os.getpid()}.tmp"
+        shutil.copyfile(join(artifact, file), tmp_file)
+        os.replace(tmp_file, path)
+        installed += 1
+    LOG.info(f"Installed {installed} files from {artifact} to {intent_cache}")
+    return installed
@@ -98,6 +98,46 @@ class LanguageTests(unittest.TestCase):
         lang = detector.detect("hello")
         self.assertEqual(lang, "en")
 
+    def test_translation_cache(self):
+        from unittest.mock import Mock
+        from neon_core.language.translation_cache import TranslationCache, \
+            CachedTranslator, CachedDetector
+        db_path = os.path.join(self.CONFIG_PATH, "translation_cache.sqlite")
+        cache = TranslationCache(persistent=True, path=db_path)
+        self.assertTrue(os.path.isfile(db_path))
+
+        plugin = Mock(spec=LanguageTranslator)
+        plugin.translate.return_value = "hola"
+        plugin.available_languages = {"en", "es"}
+        translator = CachedTranslator(plugin, cache)
+        self.assertEqual(translator.translate("hello", "es-es", "en-us"),
+                         "hola")
+        self.assertEqual(translator.translate("hello", "es-es", "en-us"),
+                         "hola")
+        plugin.translate.assert_called_once_with("hello", "es-es", "en-us")
+        self.assertEqual(translator.available_languages, {"en", "es"})
+
+        # Keys include source and target languages
+        translator.translate("hello", "fr-fr", "en-us")
+        self.assertEqual(plugin.translate.call_count, 2)
+
+        detector_plugin = Mock(spec=LanguageDetector)
+        detector_plugin.detect.return_value = "en"
+        detector = CachedDetector(detector_plugin, cache)
+        self.assertEqual(detector.detect("hello"), "en")
+        self.assertEqual(detector.detect("hello"), "en")
+        detector_plugin.detect.assert_called_once_with("hello")
+        cache.shutdown()
+
+        # Persistent entries are available after a restart
+        cache = TranslationCache(persistent=True, path=db_path)
+        plugin.translate.reset_mock()
+        translator = CachedTranslator(plugin, cache)
+        self.assertEqual(translator.translate("hello", "es-es", "en-us"),
+                         "hola")
+        plugin.translate.assert_not_called()
+        cache.shutdown()
+
 
 if __name__ == '__main__':
     unittest.main()
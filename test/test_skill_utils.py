@@ -30,7 +30,8 @@ import os
 import shutil
 import sys
 import unittest
-from os.path import dirname, join, exists, isdir
+from os.path import dirname, join, exists, isdir, isfile
+from time import time
 from unittest.mock import patch
 from unittest import skip
 
@@ -245,5 +246,90 @@ class SkillUtilsTests(unittest.TestCase):
         self.assertFalse(isdir(join(mock_config['data_dir'], "text", "uk-ua")))
 
 
+class PadatiousCacheTests(unittest.TestCase):
+    test_dir = join(dirname(__file__), "intent_cache_test")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_intent_cache_artifact(self):
+        from neon_core.util.padatious_cache import \
+            build_intent_cache_artifact, get_current_artifact, \
+            install_intent_cache_artifact, prune_intent_cache_artifacts
+        trained = join(self.test_dir, "trained")
+        artifacts = join(self.test_dir, "artifacts")
+        local = join(self.test_dir, "local")
+        os.makedirs(join(trained, "en-us"))
+        for name in ("test.intent", "other.intent"):
+            for ext, content in ((".hash", name), (".net", f"{name} net")):
+                with open(join(trained, "en-us", name + ext), 'w') as f:
+                    f.write(content)
+
+        self.assertIsNone(get_current_artifact(artifacts))
+        artifact = build_intent_cache_artifact(trained, artifacts)
+        self.assertEqual(get_current_artifact(artifacts), artifact)
+        self.assertTrue(isfile(join(artifact, "en-us", "test.intent.net")))
+        self.assertFalse(os.stat(join(artifact, "en-us",
+                                      "test.intent.net")).st_mode & 0o222)
+
+        # Identical contents produce the same artifact
+        self.assertEqual(build_intent_cache_artifact(trained, artifacts),
+                         artifact)
+
+        # Install into an empty cache
+        self.assertEqual(install_intent_cache_artifact(artifact, local), 4)
+        with open(join(local, "en-us", "other.intent.net")) as f:
+            self.assertEqual(f.read(), "other.intent net")
+
+        # Only changed files are installed
+        with open(join(local, "en-us", "test.intent.hash"), 'w') as f:
+            f.write("changed")
+        self.assertEqual(install_intent_cache_artifact(artifact, local), 1)
+        with open(join(local, "en-us", "test.intent.hash")) as f:
+            self.assertEqual(f.read(), "test.intent")
+        self.assertEqual(install_intent_cache_artifact(artifact, local), 0)
+
+        # Changed contents produce a new current artifact
+        with open(join(trained, "en-us", "test.intent.hash"), 'w') as f:
+            f.write("retrained")
+        new_artifact = build_intent_cache_artifact(trained, artifacts)
+        self.assertNotEqual(new_artifact, artifact)
+        self.assertEqual(get_current_artifact(artifacts), new_artifact)
+        self.assertTrue(isdir(artifact))
+
+        # Only the most recent artifacts are kept
+        built = [artifact, new_artifact]
+        os.utime(artifact, (0, 0))
+        for i in range(3):
+            with open(join(trained, "en-us", "test.intent.hash"), 'w') as f:
+                f.write(f"retrained {i}")
+            os.utime(built[-1], (time() - 10 + i, time() - 10 + i))
+            built.append(build_intent_cache_artifact(trained, artifacts,
+                                                     keep=2))
+        self.assertEqual(get_current_artifact(artifacts), built[-1])
+        self.assertEqual(sorted(name for name in os.listdir(artifacts)
+                                if not name.startswith('.')),
+                         sorted([os.path.basename(a) for a in built[-2:]] +
+                                ["current"]))
+
+        # The current artifact is never removed
+        os.utime(built[-1], (0, 0))
+        self.assertEqual(prune_intent_cache_artifacts(artifacts, 1), [])
+        self.assertTrue(isdir(built[-1]))
+
+        with self.assertRaises(FileNotFoundError):
+            build_intent_cache_artifact(join(self.test_dir, "missing"),
+                                        artifacts)
+
+    def test_get_intent_cache_dir(self):
+        from neon_core.util.padatious_cache import get_intent_cache_dir
+        from ovos_config.meta import get_xdg_base
+        from ovos_utils.xdg_utils import xdg_data_home
+        self.assertEqual(get_intent_cache_dir({}),
+                         f"{xdg_data_home()}/{get_xdg_base()}/intent_cache")
+        self.assertEqual(get_intent_cache_dir({"intent_cache": "~/cache"}),
+                         os.path.expanduser("~/cache"))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -26,6 +26,7 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import math
 import os
 import shutil
 import sys
@@ -33,11 +34,13 @@ import unittest
 import wave
 
 from copy import deepcopy
+from functools import partial
 from os.path import join, dirname, expanduser, isdir
-from threading import Event
-from time import time
+from threading import Barrier, Event, Thread, Timer, current_thread
+from time import sleep, time
+from types import SimpleNamespace
 
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 from ovos_bus_client import Message
 from ovos_utils.messagebus import FakeBus
 from ovos_utils.xdg_utils import xdg_data_home
@@ -180,6 +183,47 @@ class TestSkillService(unittest.TestCase):
                               "skill-test-1.neongeckocom"))
 
 
+    @patch("neon_core.skills.skill_index.get_plugin_skill_dir")
+    @patch("neon_core.skills.skill_index.get_plugin_skill_entry_points")
+    @patch("neon_core.skills.service.get_skill_directories")
+    def test_get_skill_dirs_index(self, skill_dirs, entry_points, plugin_dir):
+        from neon_core.skills.service import NeonSkillService
+        from neon_core.skills.skill_index import SkillIndex
+
+        test_dir = join(dirname(__file__), "get_skill_dirs_skills")
+        skill_dirs.return_value = [join(test_dir, "extra_dir_1"),
+                                   join(test_dir, "extra_dir_2")]
+        entry_points.return_value = {
+            "skill-plugin.neongeckocom": "skill_plugin:TestSkill"}
+        plugin_dir.return_value = join(test_dir, "plugins", "skill-plugin")
+
+        service = NeonSkillService(bus=FakeBus())
+        index_file = join(test_dir, "skill_index.json")
+        service.skill_manager.skill_index = SkillIndex(index_file)
+        skill_dirs = service._get_skill_dirs()
+        # Unchanged skills are not scanned again
+        self.assertEqual(service._get_skill_dirs(), skill_dirs)
+        entry_points.assert_called_once()
+        os.remove(index_file)
+        # listdir doesn't guarantee order, base skill directory order matters
+        self.assertEqual(set(skill_dirs),
+                         {join(test_dir, "plugins", "skill-plugin"),
+                          join(test_dir, "extra_dir_1",
+                               "skill-test-1.neongeckocom"),
+                          join(test_dir, "extra_dir_1",
+                               "skill-test-2.neongeckocom"),
+                          join(test_dir, "extra_dir_1",
+                               "skill-test-3.neongeckocom"),
+                          join(test_dir, "extra_dir_2",
+                               "skill-test-1.neongeckocom")
+                          })
+        self.assertEqual(skill_dirs[0],
+                         join(test_dir, "plugins", "skill-plugin"))
+        self.assertEqual(skill_dirs[-1],
+                         join(test_dir, "extra_dir_2",
+                              "skill-test-1.neongeckocom"))
+
+
 class TestIntentService(unittest.TestCase):
     bus = FakeBus()
     test_config_dir = join(dirname(__file__), "test_config")
@@ -224,26 +268,41 @@ class TestIntentService(unittest.TestCase):
         shutil.rmtree(cls.test_config_dir)
 
     def test_save_utterance_transcription(self):
-        self.intent_service.transcript_service = Mock()
+        from neon_core.skills.transcript_writer import TranscriptWriter
+        audio_dir = join(dirname(__file__), "transcript_audio")
+        backend = Mock(spec=["write_transcripts"])
+        self.intent_service.transcript_service = \
+            TranscriptWriter(backend, audio_dir, flush_interval=0.1)
         transcribe_time = time()
         test_message = Message("recognizer_loop:utterance",
                                {"utterances": ["test 1", "test one"],
                                 "lang": "en-us"},
                                {"timing": {"transcribed": transcribe_time}})
         self.intent_service._save_utterance_transcription(test_message)
-        self.intent_service.transcript_service.write_transcript. \
-            assert_called_once_with(None, test_message.data["utterances"][0],
-                                    transcribe_time, None)
+        self.assertIsNone(test_message.context["audio_file"])
 
         test_audio = os.path.join(os.path.dirname(__file__),
                                   "audio_files", "stop.wav")
         test_message.context["raw_audio"] = test_audio
-        audio = wave.open(test_audio, 'r')
-        audio = audio.readframes(audio.getnframes())
         self.intent_service._save_utterance_transcription(test_message)
-        self.intent_service.transcript_service.write_transcript. \
-            assert_called_with(None, test_message.data["utterances"][0],
-                               transcribe_time, audio)
+        # Audio path is known without waiting for the writer
+        audio_file = test_message.context["audio_file"]
+        self.assertEqual(audio_file, self.intent_service.transcript_service.
+                         get_audio_file(None, "test 1", transcribe_time))
+        with wave.open(audio_file, 'r') as saved, \
+                wave.open(test_audio, 'r') as audio:
+            self.assertEqual(saved.readframes(saved.getnframes()),
+                             audio.readframes(audio.getnframes()))
+
+        self.intent_service.transcript_service.shutdown()
+        self.intent_service.transcript_service = None
+        records = [r for c in backend.write_transcripts.call_args_list
+                   for r in c.args[0]]
+        self.assertEqual([(r.user, r.utterance, r.timestamp, r.audio_file)
+                          for r in records],
+                         [(None, "test 1", transcribe_time, None),
+                          (None, "test 1", transcribe_time, audio_file)])
+        shutil.rmtree(audio_dir)
 
     def test_get_transformers_service_context(self):
         utterances = ["test 1", "test one"]
@@ -285,6 +344,231 @@ class TestIntentService(unittest.TestCase):
         self.assertTrue(all([p for p in valid_parsers if p in
                              self.intent_service.transformers.loaded_modules]))
 
+    def test_parallel_transformers(self):
+        from neon_transformers.text_transformers import UtteranceTransformer
+        barrier = Barrier(2, timeout=5)
+
+        class _Transformer(UtteranceTransformer):
+            def __init__(self, name, priority, independent, suffix=None):
+                UtteranceTransformer.__init__(self, name, priority, {})
+                self.independent = independent
+                self.suffix = suffix
+                self.calls = 0
+
+            def transform(self, utterances, context=None):
+                self.calls += 1
+                if self.independent and self.calls == 1:
+                    # Independent transformers run concurrently
+                    barrier.wait()
+                if self.suffix:
+                    utterances = [f"{u} {self.suffix}" for u in utterances]
+                return utterances, {"parser_context": self.name,
+                                    self.name: True}
+
+        transformers = self.intent_service.transformers
+        real_modules = transformers.loaded_modules
+        transformers.loaded_modules = {
+            "first": _Transformer("first", 100, False, "first"),
+            "detector": _Transformer("detector", 50, True),
+            "rewriter": _Transformer("rewriter", 40, True, "rewritten"),
+            "last": _Transformer("last", 1, False, "last")}
+        self.assertEqual(transformers._get_stages(),
+                         [["first"], ["detector", "rewriter"], ["last"]])
+
+        utterances, context = transformers.transform(["test"], {})
+        self.assertEqual(utterances, ["test first rewritten last"])
+        self.assertEqual(context["parser_context"], "last")
+        self.assertTrue(all(context[name] for name in
+                            ("first", "detector", "rewriter", "last")))
+        self.assertEqual(set(context["timing"]["transformers"].keys()),
+                         {"first", "detector", "rewriter", "last"})
+
+        # Config overrides plugin declaration
+        transformers.config["rewriter"] = {"independent": False}
+        self.assertEqual(len(transformers._get_stages()), 4)
+        transformers.config.pop("rewriter")
+
+        # Concurrent rewrites are applied as if run in order
+        barrier = Barrier(3, timeout=5)
+        transformers.loaded_modules = {
+            "detector": _Transformer("detector", 50, True),
+            "rewriter": _Transformer("rewriter", 40, True, "rewritten"),
+            "other": _Transformer("other", 30, True, "other")}
+        self.assertEqual(len(transformers._get_stages()), 1)
+        utterances, _ = transformers.transform(["test"], {})
+        self.assertEqual(utterances, ["test rewritten other"])
+        self.assertEqual(transformers.loaded_modules["rewriter"].calls, 1)
+        self.assertEqual(transformers.loaded_modules["other"].calls, 2)
+        transformers.loaded_modules = real_modules
+
+    def test_init_translation_cache(self):
+        from neon_core.language.translation_cache import CachedTranslator, \
+            CachedDetector
+        translator = self.intent_service.transformers.loaded_modules.get(
+            'neon_utterance_translator_plugin')
+        self.assertIsNotNone(self.intent_service.translation_cache)
+        self.assertIsInstance(translator.translator, CachedTranslator)
+        self.assertIsInstance(translator.lang_detector, CachedDetector)
+
+    def test_get_padatious(self):
+        real_padatious = self.intent_service.padatious_service
+        padatious = Mock(containers={"en-us": Mock()})
+        padatious.finished_training_event = Event()
+        padatious.finished_training_event.set()
+
+        def _calc_intent(utt, lang):
+            if utt.startswith("what "):
+                return SimpleNamespace(name="test.intent", sent=utt,
+                                       conf=0.9)
+            return None
+
+        padatious.calc_intent = Mock(side_effect=_calc_intent)
+        self.intent_service.padatious_service = padatious
+        self.intent_service._lazy_langs = Mock()
+        replies = list()
+        self.bus.on("intent.service.padatious.reply",
+                    lambda m: replies.append(m.data["intent"]))
+        self.bus.on("intent.service.padatious.batch.reply",
+                    lambda m: replies.append(m.data["intents"]))
+        try:
+            query = Message("intent.service.padatious.get",
+                            {"utterance": "whats the time",
+                             "norm_utt": "what is the time",
+                             "lang": "en-us"})
+            self.bus.emit(query)
+            self.assertEqual(replies[-1]["sent"], "what is the time")
+            self.assertEqual(padatious.calc_intent.call_count, 2)
+            # Intents of lazy languages are loaded
+            self.intent_service._lazy_langs.ensure_loaded.\
+                assert_called_once_with("en-us")
+
+            # Repeated lookups are cached
+            self.bus.emit(query)
+            self.assertEqual(replies[-1]["sent"], "what is the time")
+            self.assertEqual(padatious.calc_intent.call_count, 2)
+
+            # Batch lookups share the cache
+            self.bus.emit(Message("intent.service.padatious.batch.get",
+                                  {"utterances": ["whats the time", "test",
+                                                  "what day is it"],
+                                   "norm_utts": ["what is the time", "test",
+                                                 "what day is it"],
+                                   "lang": "en-us"}))
+            self.assertEqual(padatious.calc_intent.call_count, 4)
+            intents = replies[-1]
+            self.assertEqual(len(intents), 3)
+            self.assertEqual(intents[0]["sent"], "what is the time")
+            self.assertIsNone(intents[1])
+            self.assertEqual(intents[2]["sent"], "what day is it")
+            self.assertEqual(
+                self.intent_service._lazy_langs.ensure_loaded.call_count, 3)
+
+            # No-match results are cached
+            self.bus.emit(Message("intent.service.padatious.get",
+                                  {"utterance": "test", "lang": "en-us"}))
+            self.assertIsNone(replies[-1])
+            self.assertEqual(padatious.calc_intent.call_count, 4)
+
+            # Intent changes invalidate the cache
+            self.bus.emit(Message("mycroft.skills.trained"))
+            self.bus.emit(query)
+            self.assertEqual(padatious.calc_intent.call_count, 6)
+
+            # Results are not cached during training
+            padatious.finished_training_event.clear()
+            self.bus.emit(Message("mycroft.skills.trained"))
+            self.bus.emit(query)
+            self.bus.emit(query)
+            self.assertEqual(padatious.calc_intent.call_count, 10)
+        finally:
+            self.intent_service.padatious_service = real_padatious
+            self.intent_service._lazy_langs = None
+
+    def test_get_pipeline(self):
+        from ovos_bus_client.session import Session
+        from neon_core.skills.exact_match import ExactMatchService
+        default_pipeline = self.intent_service.config["intents"]["pipeline"]
+        # `exact_high` is opt-in
+        self.assertNotIn("exact_high", default_pipeline)
+        self.assertIsNone(self.intent_service.exact_match)
+        pipeline = list(default_pipeline)
+        pipeline.insert(pipeline.index("padatious_high"), "exact_high")
+        session = Session("test", pipeline=pipeline)
+        real_padatious = self.intent_service.padatious_service
+        self.intent_service.padatious_service = None
+        try:
+            self.assertNotIn("exact_high", dict(
+                self.intent_service.get_pipeline(session=session)))
+            self.intent_service.exact_match = ExactMatchService(FakeBus())
+            self.addCleanup(setattr, self.intent_service, "exact_match", None)
+            pipeline = self.intent_service.get_pipeline(session=session)
+            skipped = self.intent_service.get_pipeline(skips=["exact_high"],
+                                                       session=session)
+        finally:
+            self.intent_service.padatious_service = real_padatious
+        stages = [stage for stage, _ in pipeline]
+        self.assertEqual(stages, [s for s in session.pipeline
+                                  if s in stages])
+        self.assertIn("exact_high", stages)
+        self.assertLess(stages.index("exact_high"),
+                        stages.index("padatious_high"))
+        self.assertEqual(dict(pipeline)["exact_high"],
+                         self.intent_service.exact_match.match)
+        self.assertNotIn("exact_high", dict(skipped))
+        self.assertIn("padatious_high", dict(skipped))
+
+    def test_wrapped_matcher_names(self):
+        def match_high(utterances, lang, message):
+            return None
+
+        # Wrapped matchers keep the name `intent.service.intent.get` reports
+        self.intent_service._budget_config = {"enabled": True}
+        try:
+            for wrap in (self.intent_service._wrap_speculative_matcher,
+                         self.intent_service._wrap_cached_matcher,
+                         self.intent_service._wrap_budget_matcher,
+                         self.intent_service._wrap_stats_matcher):
+                matcher = wrap("padatious_high", match_high)
+                self.assertEqual(matcher.__name__, "match_high")
+                self.assertIs(matcher.__wrapped__, match_high)
+        finally:
+            self.intent_service._budget_config = None
+
+    def test_resolve_lang(self):
+        from neon_core.skills.intent_service import ResolvedLang
+
+        def _resolve(lang):
+            message = Message("recognizer_loop:utterance",
+                              {"utterances": ["test"], "lang": lang})
+            resolved = self.intent_service._resolve_lang(message)
+            self.assertEqual(message.data["lang"], resolved)
+            return resolved
+
+        user_lang = self.intent_service.language_config["user"]
+        self.assertEqual(self.intent_service._lang_table[None].lang,
+                         user_lang)
+        self.assertEqual(_resolve(None), user_lang)
+        self.assertEqual(_resolve("en"), "en-us")
+        self.assertEqual(_resolve("es-mx"), "es-es")
+        self.assertEqual(_resolve("xx-yy"), "xx-yy")
+        self.assertEqual(self.intent_service._lookup_lang("en-us"),
+                         ResolvedLang("en-us", True))
+        self.assertEqual(self.intent_service._lookup_lang("es-mx"),
+                         ResolvedLang("es-es", False))
+
+        # Known languages are resolved without lingua_franca
+        with patch("neon_core.skills.intent_service.get_full_lang_code") as \
+                get_full_lang_code:
+            self.assertEqual(_resolve("es-mx"), "es-es")
+            self.assertEqual(_resolve(user_lang), user_lang)
+            get_full_lang_code.assert_not_called()
+
+        # Configuration changes rebuild the table
+        self.intent_service._lang_table["es-mx"] = ResolvedLang("test", True)
+        self.bus.emit(Message("configuration.updated"))
+        self.assertNotIn("es-mx", self.intent_service._lang_table)
+        self.assertEqual(_resolve("es-mx"), "es-es")
+
     @patch("ovos_core.intent_services.IntentService.handle_utterance")
     def test_handle_utterance(self, patched):
         test_message_invalid = Message("test", {"utterances": [' ', '  ']})
@@ -308,6 +592,568 @@ class TestIntentService(unittest.TestCase):
         self.bus.emit(message)
         patched.assert_called_once_with(message)
 
+    @patch("ovos_core.intent_services.IntentService.handle_utterance")
+    def test_handle_utterance_batch(self, patched):
+        responses = []
+        self.bus.on("neon.utterances.batch.result", responses.append)
+        acknowledged = []
+        self.bus.on("neon.utterances.batch.response", acknowledged.append)
+        message = Message("neon.utterances.batch",
+                          {"requests": [
+                              {"utterances": ["Test one"], "lang": "en-us"},
+                              {"utterances": [" "]},
+                              {"utterances": ["test three"], "lang": "en",
+                               "context": {"timing": {"client_sent": 1.0}}}
+                          ]}, {"source": "client", "destination": "skills"})
+        self.intent_service.handle_utterance_batch(message)
+        self.assertEqual(patched.call_count, 2)
+        self.assertEqual([r.data["index"] for r in responses], [0, 1, 2])
+        self.assertIn("test one", responses[0].data["utterances"])
+        self.assertEqual(responses[1].data["utterances"], [])
+        for response in responses:
+            self.assertIn('-', response.data["lang"])
+            self.assertIsInstance(response.context["timing"]
+                                  ["transform_utterance"], float)
+            self.assertEqual(response.context["destination"], "client")
+        self.assertIn("client_to_core", responses[2].context["timing"])
+        self.assertNotIn("client_to_core", responses[0].context["timing"])
+        self.assertEqual(acknowledged[0].data["count"], 3)
+
+        # Requests go through the worker pool, admission control and the
+        # duplicate coalescer
+        from neon_core.skills.utterance_queue import UtteranceCoalescer, \
+            UtteranceWorkerPool
+        release = Event()
+        threads = []
+
+        def _handle(msg):
+            threads.append(current_thread().name)
+            release.wait(5)
+
+        patched.reset_mock()
+        patched.side_effect = _handle
+        responses.clear()
+        aborted = []
+        self.bus.on("intent_aborted", aborted.append)
+        self.intent_service._coalescer = UtteranceCoalescer()
+        self.intent_service._utterance_pool = UtteranceWorkerPool(
+            self.intent_service._handle_utterance, 1, max_queued=2,
+            on_shed=self.intent_service._handle_shed_utterance)
+        # Block the worker so batch requests stay queued
+        self.intent_service._utterance_pool.submit(
+            Message("recognizer_loop:utterance",
+                    {"utterances": ["blocking"], "lang": "en-us"},
+                    {"session": {"session_id": "blocking"}}))
+        while not threads:
+            sleep(0.01)
+        message = Message("neon.utterances.batch",
+                          {"requests": [
+                              {"utterances": ["one"], "lang": "en-us"},
+                              {"utterances": ["One "], "lang": "en-us"},
+                              {"utterances": ["two"], "lang": "en-us"},
+                              {"utterances": ["three"], "lang": "en-us"}
+                          ]}, {"source": "client", "destination": "skills"})
+        self.intent_service.handle_utterance_batch(message)
+        self.assertEqual({r.data["index"]: r.data["error"]
+                          for r in responses},
+                         {1: "duplicate", 3: "queue_full"})
+        release.set()
+        self.intent_service._utterance_pool.shutdown()
+        self.intent_service._utterance_pool = None
+        self.intent_service._coalescer = None
+        self.assertEqual(patched.call_count, 3)
+        self.assertTrue(all(t.startswith("utterance_worker") for t in threads))
+        self.assertEqual(sorted(r.data["index"] for r in responses),
+                         [0, 1, 2, 3])
+        self.assertEqual({r.data.get("reason") for r in aborted},
+                         {"duplicate", "queue_full"})
+        self.bus.remove("intent_aborted", aborted.append)
+        self.bus.remove("neon.utterances.batch.result", responses.append)
+        self.bus.remove("neon.utterances.batch.response", acknowledged.append)
+
+    def test_handle_shed_utterance(self):
+        aborted = []
+        self.bus.on("intent_aborted", aborted.append)
+        message = Message("recognizer_loop:utterance",
+                          {"utterances": ["test"], "lang": "en-us"},
+                          {"source": "client", "destination": "skills"})
+        self.intent_service._handle_shed_utterance(message, "queue_full")
+        self.assertEqual(len(aborted), 1)
+        self.assertEqual(aborted[0].data["reason"], "queue_full")
+        self.assertEqual(aborted[0].data["utterances"], ["test"])
+        self.assertEqual(aborted[0].context["destination"], "client")
+        self.bus.remove("intent_aborted", aborted.append)
+
+    @patch("ovos_core.intent_services.IntentService.handle_utterance")
+    def test_coalesce_duplicates(self, patched):
+        from neon_core.skills.utterance_queue import UtteranceCoalescer
+        aborted = []
+        self.bus.on("intent_aborted", aborted.append)
+        self.intent_service._coalescer = UtteranceCoalescer()
+
+        def _get_message(utterance, username="test_user"):
+            return Message("recognizer_loop:utterance",
+                           {"utterances": [utterance], "lang": "en-us"},
+                           {"username": username})
+
+        def _handle(_):
+            # Duplicates received while the first request is in flight
+            patched.side_effect = None
+            self.intent_service.handle_utterance(_get_message("What  time"))
+            self.intent_service.handle_utterance(_get_message("what time",
+                                                              "other_user"))
+
+        patched.side_effect = _handle
+        self.intent_service.handle_utterance(_get_message("what time"))
+        self.assertEqual(patched.call_count, 2)
+        self.assertEqual(len(aborted), 1)
+        self.assertEqual(aborted[0].data["reason"], "duplicate")
+
+        # Requests after the first one is handled are not duplicates
+        self.intent_service.handle_utterance(_get_message("what time"))
+        self.assertEqual(patched.call_count, 3)
+        self.assertEqual(len(aborted), 1)
+
+        self.intent_service._coalescer = None
+        self.bus.remove("intent_aborted", aborted.append)
+
+    @patch("ovos_core.intent_services.IntentService.get_pipeline")
+    def test_match_cache(self, get_pipeline):
+        from ovos_plugin_manager.templates.pipeline import IntentMatch
+        from neon_core.util.cache_utils import TimedLRUCache
+        match = IntentMatch("Adapt", "test_skill:test_intent", {},
+                            "test_skill", "what time is it")
+        converse = Mock(return_value=None)
+        padatious = Mock(return_value=None)
+        adapt = Mock(return_value=match)
+        get_pipeline.return_value = [("converse", converse),
+                                     ("padatious_high", padatious),
+                                     ("adapt_high", adapt)]
+        handled = []
+        self.bus.on("test_skill:test_intent", handled.append)
+
+        real_cache = self.intent_service._match_cache
+        self.intent_service._match_cache = TimedLRUCache(8, 60)
+
+        def _utterance():
+            session = {"session_id": "test_match_cache",
+                       "active_skills": [["test_skill", time()]]}
+            return Message("recognizer_loop:utterance",
+                           {"utterances": ["What time is it"],
+                            "lang": "en-us"}, {"session": session})
+
+        # First utterance runs the whole pipeline
+        message = _utterance()
+        self.intent_service.handle_utterance(message)
+        self.assertEqual(len(handled), 1)
+        padatious.assert_called_once()
+        adapt.assert_called_once()
+        self.assertFalse(message.context["timing"]["match_cache_hit"])
+
+        # Repeated utterance skips intent matchers but not converse
+        message = _utterance()
+        self.intent_service.handle_utterance(message)
+        self.assertEqual(len(handled), 2)
+        padatious.assert_called_once()
+        adapt.assert_called_once()
+        self.assertEqual(converse.call_count, 2)
+        self.assertTrue(message.context["timing"]["match_cache_hit"])
+
+        # Aggregate metrics are available on request
+        stats = self.bus.wait_for_response(
+            Message("neon.get_match_cache_stats"))
+        self.assertEqual(stats.data, {"enabled": True, "hits": 1,
+                                      "misses": 1, "entries": 1})
+
+        # Registered intent changes invalidate the cache
+        version = self.intent_service._intent_version
+        self.bus.emit(Message("detach_intent",
+                              {"intent_name": "other_skill:intent"}))
+        self.assertEqual(self.intent_service._intent_version, version + 1)
+        self.assertEqual(len(self.intent_service._match_cache), 0)
+        self.intent_service.handle_utterance(_utterance())
+        self.assertEqual(len(handled), 3)
+        self.assertEqual(adapt.call_count, 2)
+
+        self.bus.remove("test_skill:test_intent", handled.append)
+        self.intent_service._match_cache = real_cache
+
+    @patch("ovos_core.intent_services.IntentService.get_pipeline")
+    def test_adaptive_pipeline(self, get_pipeline):
+        from ovos_plugin_manager.templates.pipeline import IntentMatch
+        from neon_core.skills.pipeline_stats import PipelineStats
+        match = IntentMatch("Adapt", "test_skill:adaptive_intent", {},
+                            "test_skill", "what time is it")
+        padatious = Mock(return_value=None)
+        adapt = Mock(return_value=match)
+        fallback = Mock(return_value=None)
+        get_pipeline.return_value = [("padatious_high", padatious),
+                                     ("adapt_high", adapt),
+                                     ("fallback_low", fallback)]
+        stats_file = join(dirname(__file__), "pipeline_stats.json")
+        self.intent_service._pipeline_stats = PipelineStats(
+            stats_file, min_samples=2, explore_interval=0,
+            pinned=["fallback_low"])
+
+        def _utterance():
+            return Message("recognizer_loop:utterance",
+                           {"utterances": ["What time is it"],
+                            "lang": "en-us"},
+                           {"session": {"session_id": "test_adaptive",
+                                        "pipeline": ["padatious_high",
+                                                     "adapt_high",
+                                                     "fallback_low"]}})
+
+        try:
+            for _ in range(2):
+                message = _utterance()
+                self.intent_service.handle_utterance(message)
+                self.assertEqual(
+                    message.context["timing"]["adaptive_pipeline"]["order"],
+                    ["padatious_high", "adapt_high", "fallback_low"])
+            self.assertEqual(padatious.call_count, 2)
+
+            # Matching stage is tried first after enough samples
+            message = _utterance()
+            self.intent_service.handle_utterance(message)
+            plan = message.context["timing"]["adaptive_pipeline"]
+            self.assertEqual(plan["shape"], "4-6")
+            self.assertEqual(plan["order"], ["adapt_high", "fallback_low"])
+            self.assertEqual(plan["skipped"], ["padatious_high"])
+            self.assertEqual(padatious.call_count, 2)
+            self.assertEqual(adapt.call_count, 3)
+            fallback.assert_not_called()
+
+            # Statistics are persisted
+            self.intent_service._pipeline_stats.save()
+            stats = PipelineStats(stats_file, min_samples=2,
+                                  explore_interval=0)
+            self.assertEqual(stats.plan("en-us", "4-6", ["padatious_high",
+                                                        "adapt_high"]),
+                             {"shape": "4-6", "order": ["adapt_high"],
+                              "skipped": ["padatious_high"],
+                              "explore": False})
+
+            # Statistics are reset when intents change
+            self.intent_service.handle_intents_changed(
+                Message("padatious:register_intent", {"lang": "en-us"}))
+            message = _utterance()
+            self.intent_service.handle_utterance(message)
+            self.assertEqual(
+                message.context["timing"]["adaptive_pipeline"]["order"],
+                ["padatious_high", "adapt_high", "fallback_low"])
+        finally:
+            self.intent_service._pipeline_stats.shutdown()
+            self.intent_service._pipeline_stats = None
+            if os.path.isfile(stats_file):
+                os.remove(stats_file)
+
+    @patch("ovos_core.intent_services.IntentService.get_pipeline")
+    def test_time_budget(self, get_pipeline):
+        from concurrent.futures import Future, TimeoutError
+        from ovos_plugin_manager.templates.pipeline import IntentMatch
+        match = IntentMatch("Adapt", "test_skill:budget_intent", {},
+                            "test_skill", "what time is it")
+        # Stage durations are simulated on a fake clock
+        clock = [0.0]
+
+        def _converse(*args):
+            clock[0] += 0.125
+            return None
+
+        converse = Mock(side_effect=_converse)
+        padatious_high = Mock(return_value=None)
+        padatious_medium = Mock(return_value=None)
+        adapt = Mock(return_value=match)
+        fallback = Mock(return_value=None)
+        get_pipeline.return_value = [("converse", converse),
+                                     ("padatious_high", padatious_high),
+                                     ("padatious_medium", padatious_medium),
+                                     ("adapt_high", adapt),
+                                     ("fallback_low", fallback)]
+        handled = []
+        self.bus.on("test_skill:budget_intent", handled.append)
+
+        class _BlockedFuture(Future):
+            def result(self, timeout=None):
+                # The stage uses up its time without returning
+                clock[0] += timeout
+                raise TimeoutError()
+
+        class _Executor:
+            """
+            Runs stages immediately; padatious stages never finish until
+            their futures are resolved
+            """
+            def __init__(self):
+                self.submitted = list()
+                self.blocked = list()
+
+            def submit(self, func, *args):
+                self.submitted.append(func)
+                if func in (padatious_high, padatious_medium):
+                    future = _BlockedFuture()
+                    self.blocked.append(future)
+                else:
+                    future = Future()
+                    future.set_result(func(*args))
+                return future
+
+        def _utterance():
+            pipeline = [s for s, _ in get_pipeline.return_value]
+            return Message("recognizer_loop:utterance",
+                           {"utterances": ["What time is it"],
+                            "lang": "en-us"},
+                           {"session": {"session_id": "test_budget",
+                                        "pipeline": pipeline}})
+
+        self.intent_service._budget_config = {
+            "enabled": True, "total": 1.0, "default_stage": 0.125,
+            "stages": {"padatious_medium": 0.25, "converse": 0.125},
+            "exempt": ["fallback_low"], "max_abandoned": 8}
+        executor = _Executor()
+        self.intent_service._budget_executor = executor
+        try:
+            with patch("neon_core.skills.intent_service.time") as mock_time:
+                mock_time.monotonic.side_effect = lambda: clock[0]
+                mock_time.time.side_effect = time
+                # Slow stages are cut short and the pipeline continues;
+                # stages with side effects are not cut short
+                message = _utterance()
+                self.intent_service.handle_utterance(message)
+                self.assertEqual(len(handled), 1)
+                converse.assert_called_once()
+                adapt.assert_called_once()
+                self.assertEqual(message.context["timing"]["budget_overruns"],
+                                 {"padatious_high": 0.125,
+                                  "padatious_medium": 0.25})
+                self.assertEqual(self.intent_service._budget_abandoned, 2)
+
+                # Stages are skipped once the budget is used up; exempt
+                # stages run. `padatious_medium` is limited to the remaining
+                # budget
+                self.intent_service._budget_config["total"] = 0.5
+                self.intent_service._budget_config["stages"][
+                    "padatious_medium"] = 1
+                adapt.return_value = None
+                message = _utterance()
+                self.intent_service.handle_utterance(message)
+                self.assertEqual(message.context["timing"]["budget_skipped"],
+                                 ["adapt_high"])
+                self.assertEqual(message.context["timing"]["budget_overruns"],
+                                 {"padatious_high": 0.125,
+                                  "padatious_medium": 0.25})
+                self.assertEqual(adapt.call_count, 1)
+                fallback.assert_called_once()
+                self.assertEqual(len(handled), 1)
+                self.assertEqual(self.intent_service._budget_abandoned, 4)
+
+                # Stages are skipped while too many abandoned stages are
+                # running
+                self.intent_service._budget_config["total"] = 1.0
+                self.intent_service._budget_config["max_abandoned"] = 4
+                message = _utterance()
+                self.intent_service.handle_utterance(message)
+                self.assertEqual(message.context["timing"]["budget_skipped"],
+                                 ["padatious_high", "padatious_medium",
+                                  "adapt_high"])
+                self.assertEqual(executor.submitted.count(padatious_high), 2)
+                self.assertEqual(converse.call_count, 3)
+                self.assertEqual(fallback.call_count, 2)
+
+            # Abandoned stages are released as they finish
+            for future in executor.blocked:
+                future.set_result(None)
+            self.assertEqual(self.intent_service._budget_abandoned, 0)
+        finally:
+            self.intent_service._budget_config = None
+            self.intent_service._budget_executor = None
+            self.bus.remove("test_skill:budget_intent", handled.append)
+
+    @patch("ovos_core.intent_services.IntentService.get_pipeline")
+    def test_speculative_match(self, get_pipeline):
+        from concurrent.futures import ThreadPoolExecutor
+        from ovos_plugin_manager.templates.pipeline import IntentMatch
+        high_match = IntentMatch("Padatious", "test_skill:time.intent", {},
+                                 "test_skill", "what's the time")
+
+        def _high(utterances, lang, message):
+            return high_match if utterances == ["what's the time"] else None
+
+        def _medium(utterances, lang, message):
+            conf = {"what time is it": 0.6, "watt time": 0.9}
+            if utterances[0] in conf:
+                return IntentMatch("Padatious", "test_skill:time.intent",
+                                   {"confidence": conf[utterances[0]]},
+                                   "test_skill", utterances[0])
+
+        converse = Mock(return_value=None)
+        padatious_high = Mock(side_effect=_high)
+        adapt = Mock(return_value=None)
+        padatious_medium = Mock(side_effect=_medium)
+        get_pipeline.return_value = [("converse", converse),
+                                     ("padatious_high", padatious_high),
+                                     ("adapt_high", adapt),
+                                     ("padatious_medium", padatious_medium)]
+        handled = []
+        self.bus.on("test_skill:time.intent", handled.append)
+
+        def _utterance(utterances):
+            pipeline = [s for s, _ in get_pipeline.return_value]
+            return Message("recognizer_loop:utterance",
+                           {"utterances": utterances, "lang": "en-us"},
+                           {"session": {"session_id": "test_speculative",
+                                        "pipeline": pipeline}})
+
+        self.intent_service._speculative_stages = ["padatious_high",
+                                                   "padatious_medium"]
+        self.intent_service._speculative_executor = ThreadPoolExecutor(4)
+        try:
+            # Any hypothesis matching an earlier stage is selected
+            message = _utterance(["What time is it", "what's the time",
+                                  "watt time"])
+            self.intent_service.handle_utterance(message)
+            self.assertEqual(len(handled), 1)
+            self.assertEqual(handled[0].data["utterance"], "what's the time")
+            self.assertIsInstance(message.context["timing"]
+                                  ["speculative_match"], float)
+            converse.assert_called_once()
+            # Normalized variants may be added to the hypotheses
+            utterances = message.data["utterances"]
+            self.assertEqual(converse.call_args[0][0], utterances)
+            self.assertEqual(padatious_high.call_count, len(utterances))
+            self.assertEqual(padatious_medium.call_count,
+                             len(utterances) - 1)
+            adapt.assert_not_called()
+
+            # Only the first stage matched by any hypothesis is selected;
+            # later stages are matched normally
+            message.data["utterances"] = ["what time is it",
+                                          "what's the time", "watt time"]
+            self.intent_service._lazy_langs = Mock()
+            self.assertEqual(self.intent_service._match_speculative(
+                message, ["padatious_high", "padatious_medium"]),
+                {"padatious_high": high_match})
+            # Intents of lazy languages are loaded before matching
+            self.intent_service._lazy_langs.ensure_loaded.\
+                assert_called_once_with("en-us")
+
+            # Converse is handled before hypotheses are matched
+            converse.return_value = IntentMatch("Converse", True, {},
+                                                "test_skill", "watt time")
+            high_calls = padatious_high.call_count
+            message = _utterance(["What time is it", "watt time"])
+            self.intent_service.handle_utterance(message)
+            self.assertEqual(padatious_high.call_count, high_calls)
+            self.assertNotIn("speculative_match", message.context["timing"])
+            converse.return_value = None
+
+            # Highest confidence match is selected within a stage
+            message = _utterance(["What time is it", "watt time"])
+            self.intent_service.handle_utterance(message)
+            self.assertEqual(len(handled), 2)
+            self.assertEqual(handled[1].data["utterance"], "watt time")
+            adapt.assert_called_once()
+
+            # Single hypotheses are matched normally
+            message = _utterance(["hello"])
+            self.intent_service.handle_utterance(message)
+            self.assertEqual(message.data["utterances"], ["hello"])
+            self.assertEqual(len(handled), 2)
+            self.assertNotIn("speculative_match", message.context["timing"])
+            self.assertEqual(padatious_high.call_args[0][0],
+                             message.data["utterances"])
+        finally:
+            self.intent_service._lazy_langs = None
+            self.intent_service._speculative_executor.shutdown()
+            self.intent_service._speculative_stages = None
+            self.intent_service._speculative_executor = None
+            self.bus.remove("test_skill:time.intent", handled.append)
+
+    @patch("ovos_core.intent_services.IntentService.get_pipeline")
+    def test_partial_prematch(self, get_pipeline):
+        from ovos_plugin_manager.templates.pipeline import IntentMatch
+        from neon_core.skills.intent_service import NeonIntentService
+
+        def _match(utterances, lang, message):
+            if utterances == ["hello there"]:
+                return IntentMatch("Padatious", "test_skill:hello.intent", {},
+                                   "test_skill", "hello there")
+
+        converse = Mock(return_value=None)
+        padatious_high = Mock(side_effect=_match)
+        get_pipeline.return_value = [("converse", converse),
+                                     ("padatious_high", padatious_high)]
+
+        # Disabled by default
+        self.assertIsNone(self.intent_service._prematch_cache)
+        self.assertIsNone(self.intent_service._prematch_executor)
+
+        config = deepcopy(dict(self.intent_service.config))
+        config["intents"]["partial_prematch"] = {
+            "enabled": True, "stages": ["padatious_high"], "max_entries": 8,
+            "ttl": 30, "workers": 1}
+        bus = FakeBus()
+        with patch("neon_core.skills.intent_service.Configuration",
+                   return_value=config):
+            intent_service = NeonIntentService(bus)
+        self.assertIsNotNone(intent_service._prematch_executor)
+
+        handled = []
+        bus.on("test_skill:hello.intent", handled.append)
+        predicted = Event()
+        predictions = []
+
+        def _on_predicted(message):
+            predictions.append(message)
+            predicted.set()
+
+        bus.on("neon.intent.predicted", _on_predicted)
+
+        def _utterance(utterance, msg_type="recognizer_loop:utterance"):
+            return Message(msg_type, {"utterances": [utterance],
+                                      "lang": "en-us"},
+                           {"session": {"session_id": "test_partial",
+                                        "pipeline": ["converse",
+                                                     "padatious_high"]}})
+
+        real_transform = intent_service.transformers.transform
+        transform = Mock(side_effect=real_transform)
+        intent_service.transformers.transform = transform
+        try:
+            # Partial transcript is transformed and matched in the background
+            bus.emit(_utterance("Hello there", "neon.utterance.partial"))
+            self.assertTrue(predicted.wait(10))
+            self.assertEqual(predictions[0].data,
+                             {"skill_id": "test_skill",
+                              "intent_type": "test_skill:hello.intent",
+                              "utterance": "hello there",
+                              "stage": "padatious_high"})
+            transform.assert_called_once()
+            padatious_high.assert_called_once()
+            converse.assert_not_called()
+
+            # Matching final utterance reuses partial results
+            message = _utterance("Hello there")
+            intent_service.handle_utterance(message)
+            self.assertEqual(len(handled), 1)
+            self.assertTrue(message.context["timing"]["prematched"])
+            self.assertEqual(message.context["lang"], "en-us")
+            transform.assert_called_once()
+            padatious_high.assert_called_once()
+            converse.assert_called_once()
+
+            # Partial results are only used for one final utterance
+            message = _utterance("Hello there")
+            intent_service.handle_utterance(message)
+            self.assertNotIn("prematched", message.context["timing"])
+            self.assertEqual(transform.call_count, 2)
+            self.assertEqual(padatious_high.call_count, 2)
+            self.assertEqual(len(handled), 2)
+        finally:
+            intent_service.transformers.transform = real_transform
+            intent_service.shutdown()
+
     def test_handle_supported_languages(self):
         handled = Event()
         response: Message = None
@@ -362,6 +1208,742 @@ class TestIntentService(unittest.TestCase):
         translator.translator = real_plug
 
 
+class TestUtteranceWorkerPool(unittest.TestCase):
+    def test_session_ordering(self):
+        from neon_core.skills.utterance_queue import UtteranceWorkerPool
+        handled = []
+        release = Event()
+        fast_handled = Event()
+
+        def _handler(message):
+            if message.data["utterance"] == "slow":
+                release.wait(5)
+            handled.append(message)
+            if message.data["utterance"] == "fast":
+                fast_handled.set()
+
+        def _message(session_id, utterance):
+            return Message("recognizer_loop:utterance",
+                           {"utterance": utterance},
+                           {"session": {"session_id": session_id}})
+
+        pool = UtteranceWorkerPool(_handler, 2)
+        pool.submit(_message("session_1", "slow"))
+        pool.submit(_message("session_1", "second"))
+        fast = _message("session_2", "fast")
+        pool.submit(fast)
+        self.assertEqual(fast.context["timing"]["queue_depth"], 3)
+
+        # Other sessions are not blocked by a slow utterance
+        self.assertTrue(fast_handled.wait(5))
+        self.assertEqual(len(handled), 1)
+        self.assertEqual(pool.depth, 2)
+
+        # Utterances in a session are handled in order
+        release.set()
+        pool.shutdown()
+        self.assertEqual([m.data["utterance"] for m in handled],
+                         ["fast", "slow", "second"])
+        self.assertEqual(pool.depth, 0)
+        self.assertGreater(handled[2].context["timing"]["queue_wait"],
+                           handled[0].context["timing"]["queue_wait"])
+
+
+    def test_utterance_coalescer(self):
+        from neon_core.skills.utterance_queue import UtteranceCoalescer, \
+            get_coalesce_key
+        message = Message("recognizer_loop:utterance",
+                          {"utterances": [" What Time ", ""],
+                           "lang": "en-US"}, {"username": "test_user"})
+        key = get_coalesce_key(message)
+        self.assertEqual(key, ("test_user", ("what time",), "en-us"))
+        self.assertEqual(get_coalesce_key(Message("test", {"utterances": []})),
+                         ("default", (), ""))
+
+        coalescer = UtteranceCoalescer(window=0.2)
+        self.assertTrue(coalescer.start(key))
+        self.assertFalse(coalescer.start(key))
+        self.assertFalse(coalescer.start(key))
+        self.assertEqual(coalescer.finish(key), 2)
+        # Recently handled requests are duplicates until the window expires
+        self.assertFalse(coalescer.start(key))
+        sleep(0.3)
+        self.assertTrue(coalescer.start(key))
+        # Dropped requests do not start a window
+        coalescer.finish(key, handled=False)
+        self.assertTrue(coalescer.start(key))
+
+    def test_admission_control(self):
+        from neon_core.skills.utterance_queue import UtteranceWorkerPool, \
+            ShedPolicy
+        release = Event()
+        started = Event()
+        handled = []
+        shed = []
+
+        def _handler(message):
+            started.set()
+            release.wait(5)
+            handled.append(message.data["utterance"])
+
+        def _message(utterance, user="test_user", session_id=None):
+            return Message("recognizer_loop:utterance",
+                           {"utterance": utterance},
+                           {"username": user,
+                            "session": {"session_id": session_id or
+                                        utterance}})
+
+        def _on_shed(message, reason):
+            shed.append((message.data["utterance"], reason))
+
+        # Reject newest when the queue is full
+        pool = UtteranceWorkerPool(_handler, 1, max_queued=2,
+                                   on_shed=_on_shed)
+        self.assertTrue(pool.submit(_message("active")))
+        self.assertTrue(started.wait(5))
+        self.assertTrue(pool.submit(_message("one")))
+        self.assertTrue(pool.submit(_message("two")))
+        self.assertFalse(pool.submit(_message("three")))
+        self.assertEqual(shed, [("three", "queue_full")])
+        release.set()
+        pool.shutdown()
+        self.assertEqual(handled, ["active", "one", "two"])
+
+        # Drop oldest when the queue is full
+        release.clear()
+        started.clear()
+        handled.clear()
+        shed.clear()
+        pool = UtteranceWorkerPool(_handler, 1, max_queued=2,
+                                   shed_policy=ShedPolicy.DROP_OLDEST,
+                                   on_shed=_on_shed)
+        pool.submit(_message("active"))
+        self.assertTrue(started.wait(5))
+        pool.submit(_message("one"))
+        pool.submit(_message("two"))
+        self.assertTrue(pool.submit(_message("three")))
+        self.assertEqual(shed, [("one", "queue_full")])
+        release.set()
+        pool.shutdown()
+        self.assertEqual(handled, ["active", "two", "three"])
+
+        # Per-user limits
+        release.clear()
+        started.clear()
+        handled.clear()
+        shed.clear()
+        pool = UtteranceWorkerPool(_handler, 1, max_queued_per_user=1,
+                                   on_shed=_on_shed)
+        pool.submit(_message("active"))
+        self.assertTrue(started.wait(5))
+        self.assertTrue(pool.submit(_message("one")))
+        self.assertFalse(pool.submit(_message("two")))
+        self.assertTrue(pool.submit(_message("other", "other_user")))
+        self.assertEqual(shed, [("two", "user_limit")])
+        release.set()
+        pool.shutdown()
+        self.assertEqual(handled, ["active", "one", "other"])
+
+
+class TestTranscriptWriter(unittest.TestCase):
+    def test_transcript_writer(self):
+        from neon_core.skills.transcript_writer import TranscriptWriter
+        test_dir = join(dirname(__file__), "transcript_test")
+        os.makedirs(test_dir, exist_ok=True)
+        temp_audio = join(test_dir, "temp.wav")
+        with open(temp_audio, "wb") as f:
+            f.write(b"audio")
+
+        backend = Mock(spec=["write_transcripts"])
+        writer = TranscriptWriter(backend, join(test_dir, "audio"),
+                                  batch_size=2, flush_interval=5)
+        timestamp = time()
+        audio_file = writer.get_audio_file("test_user", "one", timestamp)
+        self.assertEqual(audio_file, writer.get_audio_file("test_user", "one",
+                                                           timestamp))
+        self.assertTrue(audio_file.startswith(join(test_dir, "audio",
+                                                   "test_user")))
+
+        # Audio is linked before the transcript is written
+        self.assertEqual(writer.submit("test_user", "one", timestamp,
+                                       temp_audio), audio_file)
+        with open(audio_file, "rb") as f:
+            self.assertEqual(f.read(), b"audio")
+        self.assertIsNone(writer.submit("test_user", "two", timestamp))
+        self.assertIsNone(writer.submit("test_user", "three", timestamp))
+        writer.shutdown()
+        self.assertFalse(writer._thread.is_alive())
+        self.assertIsNone(writer.submit("test_user", "stopped", timestamp))
+
+        # Records are written in batches
+        self.assertEqual(backend.write_transcripts.call_count, 2)
+        batches = [c.args[0] for c in backend.write_transcripts.call_args_list]
+        self.assertEqual([[r.utterance for r in b] for b in batches],
+                         [["one", "two"], ["three"]])
+        self.assertEqual(batches[0][0].audio_file, audio_file)
+        self.assertIsNone(batches[0][1].audio_file)
+
+        # Full queue drops records and shutdown does not block on it
+        release = Event()
+        backend = Mock(spec=["write_transcripts"])
+        backend.write_transcripts.side_effect = lambda _: release.wait(5)
+        writer = TranscriptWriter(backend, join(test_dir, "audio"),
+                                  max_queued=1, batch_size=1)
+        writer.submit("test_user", "writing", timestamp)
+        while writer._queue.qsize():
+            sleep(0.01)
+        writer.submit("test_user", "queued", timestamp)
+        self.assertIsNone(writer.submit("test_user", "dropped", timestamp,
+                                        temp_audio))
+        self.assertFalse(os.path.isfile(
+            writer.get_audio_file("test_user", "dropped", timestamp)))
+        writer.shutdown(0.1)
+        release.set()
+        writer._thread.join(5)
+        self.assertFalse(writer._thread.is_alive())
+        self.assertEqual([c.args[0][0].utterance for c in
+                          backend.write_transcripts.call_args_list],
+                         ["writing", "queued"])
+        shutil.rmtree(test_dir)
+
+
+class TestLazyIntentLanguages(unittest.TestCase):
+    def test_lazy_intent_languages(self):
+        from adapt.engine import IntentDeterminationEngine
+        from adapt.intent import IntentBuilder
+        from ovos_core.intent_services.adapt_service import AdaptService
+        from neon_core.skills.lazy_intents import LazyIntentLanguages
+        bus = FakeBus()
+        adapt = AdaptService()
+        adapt.lang = "en-us"
+        adapt.engines = {"en-us": IntentDeterminationEngine(),
+                         "uk-ua": IntentDeterminationEngine()}
+        padatious = Mock(containers={"en-us": Mock(), "uk-ua": Mock()},
+                         registered_intents=[])
+        containers = list()
+
+        def _create_container(lang):
+            containers.append(Mock(lang=lang))
+            return containers[-1]
+
+        lazy = LazyIntentLanguages(bus, adapt, padatious, ["en-us"], 0)
+        lazy._create_padatious_container = _create_container
+        self.assertEqual(lazy.lazy_langs, ["uk-ua"])
+        self.assertEqual(set(adapt.engines), {"en-us"})
+        self.assertEqual(set(padatious.containers), {"en-us"})
+        self.assertTrue(lazy.is_loaded("en-us"))
+        self.assertFalse(lazy.is_loaded("uk-ua"))
+
+        # Registrations for lazy languages are recorded
+        bus.emit(Message("register_vocab", {"entity_value": "привіт",
+                                            "entity_type": "test_skillHello",
+                                            "lang": "uk-ua"}))
+        bus.emit(Message("register_vocab", {"entity_value": "hello",
+                                            "entity_type": "test_skillHello",
+                                            "lang": "en-us"}))
+        bus.emit(Message("padatious:register_intent",
+                         {"name": "test.skill:time.intent",
+                          "samples": ["котра година"], "lang": "uk-ua"}))
+        bus.emit(Message("padatious:register_intent",
+                         {"name": "other.skill:test.intent",
+                          "samples": ["тест"], "lang": "uk-ua"}))
+        adapt.engines["en-us"].register_intent_parser(
+            IntentBuilder("test_skill:HelloIntent").require(
+                "test_skillHello").build())
+
+        # Languages are loaded on first use
+        self.assertFalse(lazy.ensure_loaded("en-us"))
+        self.assertTrue(lazy.ensure_loaded("uk-ua"))
+        self.assertFalse(lazy.ensure_loaded("uk-ua"))
+        self.assertTrue(lazy.is_loaded("uk-ua"))
+        self.assertEqual(containers[0].lang, "uk-ua")
+        self.assertEqual(padatious.containers["uk-ua"], containers[0])
+        self.assertEqual(containers[0].add_intent.call_count, 2)
+        containers[0].train.assert_called_once()
+        self.assertIn("test.skill:time.intent", padatious.registered_intents)
+        match = adapt.match_intent(("привіт",), "uk-ua")
+        self.assertEqual(match.intent_type, "test_skill:HelloIntent")
+
+        # Idle languages are evicted
+        lazy.idle_timeout = 60
+        self.assertEqual(lazy.evict_idle(), [])
+        lazy._loaded["uk-ua"] -= 120
+        self.assertEqual(lazy.evict_idle(), ["uk-ua"])
+        self.assertNotIn("uk-ua", adapt.engines)
+        self.assertNotIn("uk-ua", padatious.containers)
+
+        # Detached skills are not reloaded
+        bus.emit(Message("detach_skill", {"skill_id": "test.skill"}))
+        self.assertTrue(lazy.ensure_loaded("uk-ua"))
+        containers[1].add_intent.assert_called_once_with(
+            "other.skill:test.intent", ["тест"])
+        lazy.shutdown()
+
+
+class TestExactMatchService(unittest.TestCase):
+    def test_exact_match(self):
+        from neon_core.skills.exact_match import ExactMatchService, \
+            normalize_phrase
+        self.assertEqual(normalize_phrase(" What's  the TIME? "),
+                         "what's the time")
+        bus = FakeBus()
+        service = ExactMatchService(bus, "en-us")
+        message = Message("recognizer_loop:utterance")
+
+        bus.emit(Message("padatious:register_intent",
+                         {"name": "test.skill:time.intent", "lang": "en-us",
+                          "samples": ["(what is|what's) the time [please]",
+                                      "what time is it in {location}"]}))
+        match = service.match(["hello", "what is the time please"], "en-us",
+                              message)
+        self.assertEqual(match.intent_service, "Padatious")
+        self.assertEqual(match.intent_type, "test.skill:time.intent")
+        self.assertEqual(match.skill_id, "test.skill")
+        self.assertEqual(match.utterance, "what is the time please")
+        self.assertIsNone(service.match(["what time is it in paris"],
+                                        "en-us", message))
+        self.assertIsNone(service.match(["what is the time"], "uk-ua",
+                                        message))
+
+        # Adapt intents with one required keyword
+        bus.emit(Message("register_intent",
+                         {"name": "test.skill:HelloIntent",
+                          "requires": [["test_skillHello",
+                                        "test_skillHello"]],
+                          "at_least_one": [], "optional": []}))
+        bus.emit(Message("register_intent",
+                         {"name": "test.skill:OtherIntent",
+                          "requires": [["test_skillHello",
+                                        "test_skillHello"]],
+                          "at_least_one": [],
+                          "optional": [["test_skillName",
+                                        "test_skillName"]]}))
+        bus.emit(Message("register_vocab",
+                         {"entity_value": "Hello there",
+                          "entity_type": "test_skillHello", "lang": "en-us"}))
+        match = service.match(["hello there"], "en-us", message)
+        self.assertEqual(match.intent_service, "Adapt")
+        self.assertEqual(match.intent_type, "test.skill:HelloIntent")
+        self.assertEqual(match.intent_data["test_skillHello"], "hello there")
+
+        # Ambiguous phrases are not matched
+        bus.emit(Message("padatious:register_intent",
+                         {"name": "other.skill:time.intent", "lang": "en-us",
+                          "samples": ["what is the time"]}))
+        self.assertIsNone(service.match(["what is the time"], "en-us",
+                                        message))
+        bus.emit(Message("detach_intent",
+                         {"intent_name": "other.skill:time.intent"}))
+        self.assertEqual(service.match(["what is the time"], "en-us",
+                                       message).intent_type,
+                         "test.skill:time.intent")
+
+        # Detached skills are removed
+        bus.emit(Message("detach_skill", {"skill_id": "test.skill"}))
+        self.assertIsNone(service.match(["what is the time"], "en-us",
+                                        message))
+        self.assertIsNone(service.match(["hello there"], "en-us", message))
+        self.assertEqual(service._index, {"en-us": {}})
+
+
+class TestParallelConverseService(unittest.TestCase):
+    def test_parallel_converse(self):
+        from neon_core.skills.parallel_converse import \
+            ParallelConverseService
+        from threading import Thread, Timer
+        bus = FakeBus()
+        converse = Mock()
+        converse.config = {"converse_priorities": {"skill_c": 80},
+                           "parallel": {"enabled": True, "deadline": 2}}
+        converse._collect_converse_skills.return_value = \
+            ["skill_a", "skill_b", "skill_c"]
+        converse._converse_allowed.return_value = True
+        service = ParallelConverseService(bus, converse)
+        self.assertTrue(service.enabled)
+        self.assertEqual(service._sort_by_priority(
+            ["skill_a", "skill_b", "skill_c"]),
+            ["skill_c", "skill_a", "skill_b"])
+
+        requests = list()
+        timeouts = list()
+        responses = {"skill_a": (0.2, True), "skill_b": (0, True),
+                     "skill_c": (0, False)}
+
+        def _respond(msg, skill_id):
+            requests.append(skill_id)
+            if skill_id == "skill_b":
+                # Responses to other requests are ignored
+                bus.emit(Message("skill.converse.response",
+                                 {"skill_id": "skill_c", "result": True},
+                                 {"session": {"session_id": "other"}}))
+                bus.emit(msg.reply("skill.converse.response",
+                                   {"skill_id": "skill_c", "result": True},
+                                   {"converse_poll_id": "other"}))
+            delay, result = responses[skill_id]
+            if delay is None:
+                return
+            Timer(delay, bus.emit, (msg.reply("skill.converse.response",
+                                              {"skill_id": skill_id,
+                                               "result": result}),)).start()
+
+        for skill in responses:
+            bus.on(f"{skill}.converse.request",
+                   lambda m, s=skill: Thread(target=_respond,
+                                             args=(m, s)).start())
+        bus.on("ovos.skills.converse.force_timeout",
+               lambda m: timeouts.append(m.data["skill_id"]))
+        message = Message("recognizer_loop:utterance",
+                          {"utterances": ["yes"]})
+
+        # Highest priority accepting skill is selected, not the fastest
+        start = time()
+        match = service.match(["yes"], "en-us", message)
+        self.assertLess(time() - start, 1)
+        self.assertEqual(match.intent_service, "Converse")
+        self.assertEqual(match.skill_id, "skill_a")
+        self.assertTrue(match.intent_type)
+        self.assertEqual(set(requests), set(responses))
+        self.assertEqual(timeouts, [])
+
+        # Unresponsive skills are timed out at the deadline
+        converse.config["parallel"]["deadline"] = 0.5
+        responses["skill_c"] = (None, False)
+        start = time()
+        match = service.match(["yes"], "en-us", message)
+        self.assertGreaterEqual(time() - start, 0.5)
+        self.assertLess(time() - start, 1.5)
+        self.assertEqual(match.skill_id, "skill_a")
+        self.assertEqual(timeouts, ["skill_c"])
+
+        # No skill accepts
+        responses["skill_a"] = (0, False)
+        responses["skill_b"] = (0, False)
+        responses["skill_c"] = (0, False)
+        self.assertIsNone(service.match(["no"], "en-us", message))
+        converse._collect_converse_skills.return_value = []
+        self.assertIsNone(service.match(["no"], "en-us", message))
+
+
+class TestConcurrentFallbackService(unittest.TestCase):
+    def test_concurrent_fallback(self):
+        from neon_core.skills.concurrent_fallback import \
+            ConcurrentFallbackService
+        from threading import Thread, Timer
+        bus = FakeBus()
+        fallback = Mock()
+        fallback.fallback_config = {"concurrent": {"enabled": True,
+                                                   "deadline": 2}}
+        fallback.registered_fallbacks = {"skill_a": 10, "skill_b": 20,
+                                         "skill_c": 50, "skill_d": 95,
+                                         "skill_e": 30}
+        fallback._fallback_allowed.side_effect = \
+            lambda skill_id: skill_id != "skill_e"
+        handled = {"skill_a": True, "skill_b": True, "skill_c": True,
+                   "skill_d": True}
+        fallback.attempt_fallback.side_effect = \
+            lambda utts, skill_id, lang, msg: handled.get(skill_id, False)
+        service = ConcurrentFallbackService(bus, fallback)
+        self.assertTrue(service.enabled)
+        message = Message("recognizer_loop:utterance",
+                          {"utterances": ["test"]})
+        self.assertEqual(service._get_skills(message, 5, 90),
+                         ["skill_a", "skill_b", "skill_c"])
+
+        pings = list()
+        timeouts = list()
+        responses = {"skill_a": (0.2, True), "skill_b": (0, True),
+                     "skill_c": (0, False), "skill_d": (0, True)}
+
+        def _respond(msg, skill_id):
+            if skill_id == "skill_b":
+                # Answers to other polls are ignored
+                bus.emit(msg.reply("ovos.skills.fallback.pong",
+                                   {"skill_id": "skill_c",
+                                    "can_handle": True},
+                                   {"fallback_poll_id": "other"}))
+            delay, result = responses[skill_id]
+            if delay is None:
+                return
+            Timer(delay, bus.emit, (msg.reply("ovos.skills.fallback.pong",
+                                              {"skill_id": skill_id,
+                                               "can_handle": result}),)
+                  ).start()
+
+        def _handle_ping(msg):
+            pings.append(msg.data)
+            for skill in responses:
+                Thread(target=_respond, args=(msg, skill)).start()
+
+        bus.on("ovos.skills.fallback.ping", _handle_ping)
+        bus.on("ovos.skills.fallback.force_timeout",
+               lambda m: timeouts.append(m.data["skill_id"]))
+
+        # All skills are asked at once; the highest priority accepting skill
+        # is selected, not the fastest
+        start = time()
+        match = service.medium_prio(["test"], "en-us", message)
+        self.assertLess(time() - start, 1)
+        self.assertEqual(match.intent_service, "Fallback")
+        self.assertEqual(match.skill_id, "skill_a")
+        self.assertEqual(pings, [{"utterances": ["test"], "lang": "en-us"}])
+        fallback.attempt_fallback.assert_called_once_with(
+            ["test"], "skill_a", "en-us", message)
+        self.assertEqual(timeouts, [])
+
+        # Unresponsive skills are timed out at the deadline
+        fallback.fallback_config["concurrent"]["deadline"] = 0.5
+        responses["skill_a"] = (None, True)
+        start = time()
+        match = service.medium_prio(["test"], "en-us", message)
+        self.assertGreaterEqual(time() - start, 0.5)
+        self.assertLess(time() - start, 1.5)
+        self.assertEqual(match.skill_id, "skill_b")
+        self.assertEqual(timeouts, ["skill_a"])
+
+        # The next accepting skill is tried if a skill does not handle it
+        responses["skill_a"] = (0, True)
+        responses["skill_c"] = (0, True)
+        handled["skill_a"] = False
+        handled["skill_b"] = False
+        match = service.medium_prio(["test"], "en-us", message)
+        self.assertEqual(match.skill_id, "skill_c")
+
+        # No skill accepts
+        for skill in ("skill_a", "skill_b", "skill_c"):
+            responses[skill] = (0, False)
+        fallback.attempt_fallback.reset_mock()
+        self.assertIsNone(service.medium_prio(["test"], "en-us", message))
+        fallback.attempt_fallback.assert_not_called()
+
+        # Ranges without skills are not polled
+        pings.clear()
+        self.assertIsNone(service.high_prio(["test"], "en-us", message))
+        self.assertEqual(pings, [])
+        self.assertEqual(service.low_prio(["test"], "en-us",
+                                          message).skill_id, "skill_d")
+
+
+class TestVectorizedIntentScorer(unittest.TestCase):
+    test_dir = join(dirname(__file__), "scorer_test")
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        os.makedirs(cls.test_dir, exist_ok=True)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.test_dir)
+
+    @staticmethod
+    def _write_net(path, num_inputs, num_hidden, activation):
+        from random import Random
+        rand = Random(num_inputs)
+        neuron = f"({{}}, {activation}, 5.00000000000000000000e-01)"
+        weights = [[rand.uniform(-2, 2) for _ in range(num_inputs + 1)]
+                   for _ in range(num_hidden)]
+        output = [rand.uniform(-2, 2) for _ in range(num_hidden + 1)]
+        neurons = ["(0, 0, 0.0)"] * (num_inputs + 1) + \
+            [neuron.format(num_inputs + 1)] * num_hidden + \
+            [neuron.format(0), neuron.format(num_hidden + 1),
+             neuron.format(0)]
+        connections = [f"({i}, {w})" for row in weights
+                       for i, w in enumerate(row)] + \
+            [f"({num_inputs + 1 + i}, {w})" for i, w in enumerate(output)]
+        with open(path, 'w') as f:
+            f.write(f"FANN_FLO_2.1\nnum_layers=3\nlayer_sizes="
+                    f"{num_inputs + 1} {num_hidden + 1} 2 \n"
+                    f"neurons (num_inputs, activation_function, "
+                    f"activation_steepness)={' '.join(neurons)} \n"
+                    f"connections (connected_to_neuron, weight)="
+                    f"{' '.join(connections)} \n")
+        return weights, output
+
+    @staticmethod
+    def _run_net(weights, output, inputs, activation):
+        from neon_core.skills.padatious_scorer import _STEPWISE
+
+        def _activate(value):
+            value *= 0.5
+            if activation == 5:
+                return math.tanh(value)
+            xp, fp, low, high = _STEPWISE[activation]
+            if value < xp[0]:
+                return low
+            if value >= xp[-1]:
+                return high
+            i = max(i for i in range(6) if xp[i] <= value)
+            return (fp[i + 1] - fp[i]) * (value - xp[i]) / \
+                (xp[i + 1] - xp[i]) + fp[i]
+
+        inputs = inputs + [1.0]
+        hidden = [_activate(sum(w * v for w, v in zip(row, inputs)))
+                  for row in weights] + [1.0]
+        return max(0, _activate(sum(w * v for w, v in zip(output, hidden))))
+
+    def test_score(self):
+        from neon_core.skills.padatious_scorer import _ScorerModel, \
+            load_fann_net
+        special = [':0', ':1', ':2', ':3', ':4']
+        intents = list()
+        nets = list()
+        for name, vocab, hidden, activation in (
+                ("test:time.intent", ["what", "time", "is", "it"], 10, 6),
+                ("test:joke.intent", ["tell", "me", "a", "joke", "it"], 7, 5),
+                ("test:play.intent", ["play", "track", "#"], 10, 6)):
+            ids = {token: i for i, token in enumerate(special + vocab)}
+            weights, output = self._write_net(
+                join(self.test_dir, f"{name}.intent.net"), len(ids), hidden,
+                activation)
+            intents.append(SimpleNamespace(
+                name=name, pos_intents=[],
+                simple_intent=SimpleNamespace(ids=SimpleNamespace(ids=ids))))
+            nets.append((ids, weights, output, activation))
+        intents.append(SimpleNamespace(name="test:entity.intent",
+                                       pos_intents=[Mock()]))
+
+        layers = load_fann_net(join(self.test_dir,
+                                    "test:joke.intent.intent.net"))
+        self.assertEqual([l.weights.shape for l in layers],
+                         [(11, 7), (8, 1)])
+        self.assertEqual(layers[0].activation, 5)
+        self.assertEqual(layers[0].steepness, 0.5)
+
+        model = _ScorerModel(intents, self.test_dir)
+        self.assertEqual(model.names, [i.name for i in intents[:3]])
+        self.assertEqual(model.fallback, intents[3:])
+        sents = [["what", "time", "is", "it"], ["tell", "me", "it", "it", "x"],
+                 [], ["play", "track", "12"], ["unknown"]]
+        scores = model.score(sents)
+        self.assertEqual(scores.shape, (5, 3))
+        for sent_idx, sent in enumerate(sents):
+            sent = [t.replace("1", "#").replace("2", "#") for t in sent]
+            for intent_idx, (ids, weights, output, activation) in \
+                    enumerate(nets):
+                inputs = [0.0] * len(ids)
+                for token in sent:
+                    if token in ids:
+                        inputs[ids[token]] = 1.0
+                if sent:
+                    inputs[0] = len([t for t in sent if t not in ids]) / \
+                        len(sent)
+                    for i in range(1, 5):
+                        inputs[i] = len(sent) / i
+                self.assertAlmostEqual(
+                    float(scores[sent_idx, intent_idx]),
+                    self._run_net(weights, output, inputs, activation),
+                    places=5)
+
+    def test_padatious_container(self):
+        from padatious import IntentContainer
+        from neon_core.skills.padatious_scorer import VectorizedIntentScorer
+        container = IntentContainer(join(self.test_dir, "cache"))
+        container.add_intent("test:time", ["what time is it",
+                                           "what is the time"])
+        container.add_intent("test:joke", ["tell me a joke",
+                                           "say something funny"])
+        container.add_entity("place", ["paris", "london"])
+        container.add_intent("test:weather", ["weather in {place}",
+                                              "what is the weather"])
+        container.train(single_thread=True)
+        queries = ["what's the time", "tell me something funny",
+                   "weather in paris", "what time is it", "unrelated"]
+        expected = {q: {m.name: (m.conf, m.matches)
+                        for m in container.calc_intents(q)} for q in queries}
+        scorer = VectorizedIntentScorer.attach(container)
+        self.assertIs(VectorizedIntentScorer.attach(container), scorer)
+        for query, matches in zip(queries, scorer.calc_intents_batch(
+                queries)):
+            matches = {m.name: (m.conf, m.matches) for m in matches}
+            self.assertEqual(set(matches), set(expected[query]))
+            for name, (conf, entities) in matches.items():
+                self.assertAlmostEqual(conf, expected[query][name][0],
+                                       places=4)
+                self.assertEqual(entities, expected[query][name][1])
+        self.assertEqual(container.calc_intent("what time is it").name,
+                         "test:time")
+
+
+class TestPipelineStats(unittest.TestCase):
+    def test_plan(self):
+        from neon_core.skills.pipeline_stats import PipelineStats, \
+            get_utterance_shape
+        self.assertEqual(get_utterance_shape([]), "1")
+        self.assertEqual(get_utterance_shape(["stop"]), "1")
+        self.assertEqual(get_utterance_shape(["what time is it"]), "4-6")
+        self.assertEqual(get_utterance_shape(["a b c d e f g"]), "7+")
+
+        stats_file = join(dirname(__file__), "test_pipeline_stats.json")
+        stats = PipelineStats(stats_file, min_samples=4, explore_interval=5,
+                              pinned=["padacioso_high"], reorder=True,
+                              save_interval=100)
+        self.assertFalse(PipelineStats(stats_file).reorder)
+        stages = ["stop_high", "converse", "padacioso_high",
+                  "padatious_high", "adapt_high", "common_qa",
+                  "padatious_medium", "adapt_medium", "fallback_medium",
+                  "fallback_low"]
+        for i in range(4):
+            stats.record("en-us", "2-3", [
+                ("stop_high", False, 0.001), ("converse", False, 0.01),
+                ("padacioso_high", False, 0.01),
+                ("padatious_high", False, 0.05), ("adapt_high", False, 0.01),
+                ("common_qa", False, 0.5),
+                ("padatious_medium", i == 0, 0.05),
+                ("adapt_medium", i > 0, 0.01),
+                ("fallback_medium", False, 0.001)])
+        plan = stats.plan("en-us", "2-3", stages)
+        self.assertFalse(plan["explore"])
+        # Pinned stages and stages that may act on an utterance are never
+        # skipped or moved
+        self.assertEqual(plan["order"], ["stop_high", "converse",
+                                         "padacioso_high", "common_qa",
+                                         "adapt_medium", "padatious_medium",
+                                         "fallback_medium", "fallback_low"])
+        self.assertEqual(plan["skipped"], ["padatious_high", "adapt_high"])
+
+        # Other languages and shapes are not changed
+        self.assertEqual(stats.plan("uk-ua", "2-3", stages)["order"], stages)
+        self.assertEqual(stats.plan("en-us", "1", stages)["order"], stages)
+
+        # Periodically run the full pipeline
+        stats.record("en-us", "2-3", [("stop_high", True, 0.001)])
+        plan = stats.plan("en-us", "2-3", stages)
+        self.assertTrue(plan["explore"])
+        self.assertEqual(plan["order"], stages)
+
+        # Reordering may be disabled
+        stats.reorder = False
+        stats.record("en-us", "2-3", [("stop_high", True, 0.001)])
+        self.assertEqual(stats.plan("en-us", "2-3", stages)["order"],
+                         ["stop_high", "converse", "padacioso_high",
+                          "common_qa", "padatious_medium", "adapt_medium",
+                          "fallback_medium", "fallback_low"])
+
+        # Statistics are reset by language
+        stats.record("uk-ua", "2-3", [("stop_high", True, 0.001)])
+        stats.reset("en-us")
+        self.assertEqual(stats.plan("en-us", "2-3", stages)["order"], stages)
+        self.assertEqual(list(stats._stats), ["uk-ua|2-3"])
+        stats.reset()
+        self.assertEqual(stats._stats, {})
+        for _ in range(4):
+            stats.record("en-us", "2-3", [("padatious_high", False, 0.05)])
+
+        stats.shutdown()
+        self.assertEqual(PipelineStats(stats_file)._stats, stats._stats)
+        os.remove(stats_file)
+
+        # New statistics are saved in the background
+        stats = PipelineStats(stats_file, save_interval=0.1)
+        stats.record("en-us", "1", [("stop_high", True, 0.001)])
+        self.assertFalse(os.path.isfile(stats_file))
+        timeout = time() + 5
+        while not os.path.isfile(stats_file) and time() < timeout:
+            sleep(0.05)
+        stats.shutdown()
+        self.assertEqual(PipelineStats(stats_file)._stats, stats._stats)
+        os.remove(stats_file)
+
+
 class TestSkillManager(unittest.TestCase):
     config_dir = join(dirname(__file__), "test_config")
 
@@ -441,6 +2023,423 @@ class TestSkillManager(unittest.TestCase):
         self.assertTrue(isdir(expanduser("~/neon-skills")))
 
 
+    def test_run_dependency_graph(self):
+        from neon_core.skills.skill_manager import run_dependency_graph
+        from threading import Lock
+        lock = Lock()
+        started = list()
+        finished = list()
+
+        def _task(name, delay=0.1):
+            def _run():
+                with lock:
+                    started.append(name)
+                sleep(delay)
+                with lock:
+                    finished.append(name)
+                if name == "error":
+                    raise RuntimeError(name)
+                return name
+            return _run
+
+        tasks = {"priority": _task("priority"), "api": _task("api", 0.3),
+                 "client": _task("client"), "other": _task("other"),
+                 "error": _task("error"), "cycle_a": _task("cycle_a"),
+                 "cycle_b": _task("cycle_b")}
+        dependencies = {"api": {"priority"}, "client": {"api", "missing"},
+                        "other": {"priority"}, "error": {"priority"},
+                        "cycle_a": {"cycle_b", "priority"},
+                        "cycle_b": {"cycle_a", "priority"}}
+        start = time()
+        results = run_dependency_graph(tasks, dependencies, 8)
+        self.assertEqual(started[0], "priority")
+        self.assertLess(finished.index("api"), started.index("client"))
+        self.assertIsNone(results.pop("error"))
+        self.assertEqual(results, {name: name for name in tasks
+                                   if name != "error"})
+        # Independent skills load concurrently
+        self.assertLess(time() - start, 0.8)
+
+    @patch("ovos_core.skill_manager.SkillManager._load_new_skills")
+    def test_load_new_skills_parallel(self, load_serial):
+        from neon_core.skills.skill_manager import NeonSkillManager
+        manager = NeonSkillManager(FakeBus())
+        manager.config = dict(manager.config)
+        manager.config["skills"] = {"priority_skills": ["skill-b"]}
+
+        # Serial load by default
+        manager._load_new_skills(False, False, False)
+        load_serial.assert_called_once_with(manager, False, False, False)
+
+        manager.config["skills"]["parallel_load"] = {
+            "enabled": True, "workers": 2,
+            "dependencies": {"skill-a": ["skill-c"]}}
+        loaded = list()
+        tasks = {skill: partial(loaded.append, skill)
+                 for skill in ("skill-a", "skill-b", "skill-c")}
+        manager._get_skill_load_tasks = Mock(return_value=tasks)
+        manager._load_new_skills(False, False, False)
+        load_serial.assert_called_once()
+        manager._get_skill_load_tasks.assert_called_once_with(False, False,
+                                                              False)
+        self.assertEqual(loaded[0], "skill-b")
+        self.assertLess(loaded.index("skill-c"), loaded.index("skill-a"))
+
+    @patch("neon_core.skills.skill_index.get_plugin_skill_entry_points")
+    def test_skill_index(self, entry_points):
+        from neon_core.skills.skill_index import SkillIndex
+        from neon_core.skills.skill_manager import NeonSkillManager
+        from tempfile import mkdtemp
+        test_dir = mkdtemp()
+        base_dir = join(test_dir, "skills")
+        os.makedirs(join(base_dir, "skill-a.neon"))
+        with open(join(base_dir, "skill-a.neon", "__init__.py"), "w"):
+            pass
+        index_file = join(test_dir, "skill_index.json")
+        entry_points.return_value = {"skill-plugin.neon": "os.path:join",
+                                     "skill-invalid.neon": "not_a_module:X"}
+
+        index = SkillIndex(index_file)
+        skills = index.get([base_dir])
+        self.assertEqual(skills["skill_dirs"],
+                         {base_dir: {"skill-a.neon": True}})
+        self.assertEqual(set(skills["plugins"]),
+                         {"skill-plugin.neon", "skill-invalid.neon"})
+        self.assertTrue(os.path.isfile(index_file))
+        self.assertEqual(index.get_plugins([base_dir]),
+                         {"skill-plugin.neon": join})
+        entry_points.assert_called_once()
+
+        # Unchanged index is read from disk
+        index = SkillIndex(index_file)
+        self.assertEqual(index.get([base_dir]), skills)
+        self.assertEqual(index.get_skill_dirs([base_dir]),
+                         [join(base_dir, "skill-a.neon")])
+        entry_points.assert_called_once()
+
+        # New skill directories are indexed without scanning plugins
+        os.makedirs(join(base_dir, "skill-b.neon"))
+        self.assertEqual(index.get([base_dir])["skill_dirs"][base_dir],
+                         {"skill-a.neon": True, "skill-b.neon": False})
+        with open(join(base_dir, "skill-b.neon", "__init__.py"), "w"):
+            pass
+        self.assertTrue(index.get([base_dir])["skill_dirs"][base_dir]
+                        ["skill-b.neon"])
+        entry_points.assert_called_once()
+
+        # Manager reads skills from the index
+        manager = NeonSkillManager(FakeBus())
+        manager.skill_index = index
+        manager._get_skill_base_dirs = Mock(return_value=[base_dir])
+        self.assertEqual(set(manager._get_skill_directories()),
+                         {join(base_dir, "skill-a.neon"),
+                          join(base_dir, "skill-b.neon")})
+        self.assertEqual(manager._find_skill_plugins(),
+                         {"skill-plugin.neon": join})
+        entry_points.assert_called_once()
+        shutil.rmtree(test_dir)
+
+    def test_skill_change_watcher(self):
+        from neon_core.skills.skill_watcher import SkillChangeWatcher
+        from tempfile import mkdtemp
+        test_dir = mkdtemp()
+        changes = list()
+        changed = Event()
+
+        def _on_change(paths):
+            changes.append(paths)
+            changed.set()
+
+        os.makedirs(join(test_dir, "skill-a", "__pycache__"))
+        watcher = SkillChangeWatcher(_on_change, 0.5)
+        watcher.watch(test_dir, recursive=True)
+        watcher.start()
+        self.assertTrue(watcher.is_alive())
+
+        # Runtime files are ignored
+        with open(join(test_dir, "skill-a", "settings.json"), "w") as f:
+            f.write("{}")
+        with open(join(test_dir, "skill-a", "__pycache__", "x.pyc"),
+                  "w") as f:
+            f.write("")
+        self.assertFalse(changed.wait(1))
+        changes.clear()
+
+        # A burst of changes is handled once
+        for name in ("__init__.py", "util.py"):
+            with open(join(test_dir, "skill-a", name), "w") as f:
+                f.write("")
+            sleep(0.1)
+        self.assertTrue(changed.wait(5))
+        sleep(1)
+        self.assertEqual(len(changes), 1)
+        self.assertIn(join(test_dir, "skill-a", "__init__.py"), changes[0])
+        self.assertIn(join(test_dir, "skill-a", "util.py"), changes[0])
+        watcher.shutdown()
+        self.assertFalse(watcher.is_alive())
+        shutil.rmtree(test_dir)
+
+    @patch("neon_core.skills.skill_manager.get_plugin_skill_versions")
+    def test_handle_skill_changes(self, get_versions):
+        from neon_core.skills.skill_manager import NeonSkillManager
+        from types import ModuleType
+        base_dir = "/tmp/test_skills"
+        package_dir = "/tmp/test_packages"
+        skill_dir = join(base_dir, "skill-a.neon")
+        os.makedirs(skill_dir, exist_ok=True)
+
+        class PluginSkill:
+            default_shutdown = Mock()
+
+        PluginSkill.__module__ = "test_plugin_skill.skill"
+        for module in ("test_plugin_skill", "test_plugin_skill.skill"):
+            sys.modules[module] = ModuleType(module)
+
+        manager = NeonSkillManager(FakeBus())
+        manager._get_skill_base_dirs = Mock(return_value=[base_dir])
+        manager._unload_removed_skills = Mock()
+        manager._load_new_skills = Mock()
+        manager._package_dirs = {package_dir}
+        manager._plugin_versions = {"skill-plugin.neon": "1.0.0",
+                                    "skill-other.neon": "1.0.0"}
+        dir_loader = Mock(skill_id="skill-a.neon")
+        other_loader = Mock(skill_id="skill-b.neon")
+        manager.skill_loaders = {skill_dir: dir_loader,
+                                 join(base_dir, "skill-b.neon"): other_loader}
+        manager.plugin_skills = {"skill-plugin.neon":
+                                 Mock(instance=PluginSkill()),
+                                 "skill-other.neon": Mock()}
+        get_versions.return_value = {"skill-plugin.neon": "1.0.1",
+                                     "skill-other.neon": "1.0.0"}
+
+        # Files written by skills at runtime do not reload them
+        manager._handle_skill_changes(
+            {join(skill_dir, "data.db"),
+             join(skill_dir, "cache", "response.json")})
+        dir_loader.reload.assert_not_called()
+        manager._load_new_skills.assert_not_called()
+
+        manager._handle_skill_changes(
+            {join(skill_dir, "__init__.py"),
+             join(skill_dir, "locale", "en-us", "test.intent"),
+             join(package_dir, "skill_plugin-1.0.1.dist-info")})
+        # Only changed skills are reloaded
+        dir_loader.reload.assert_called_once()
+        other_loader.reload.assert_not_called()
+        PluginSkill.default_shutdown.assert_called_once()
+        self.assertEqual(list(manager.plugin_skills), ["skill-other.neon"])
+        self.assertNotIn("test_plugin_skill", sys.modules)
+        self.assertNotIn("test_plugin_skill.skill", sys.modules)
+        self.assertEqual(manager._plugin_versions,
+                         get_versions.return_value)
+        manager._unload_removed_skills.assert_called_once()
+        manager._load_new_skills.assert_called_once()
+        shutil.rmtree(base_dir)
+
+    def test_poll_interval(self):
+        from neon_core.skills.skill_manager import NeonSkillManager, \
+            _PollStopEvent
+        manager = NeonSkillManager(FakeBus())
+        manager._watch_config = {"poll_interval": None}
+        self.assertEqual(manager._get_poll_interval(30), 30)
+
+        # Skills are not polled while changes are watched
+        watcher = Mock()
+        watcher.is_alive.return_value = True
+        manager._watcher = watcher
+        self.assertIsNone(manager._get_poll_interval(30))
+        manager._watch_config = {"poll_interval": 600}
+        self.assertEqual(manager._get_poll_interval(30), 600)
+
+        # Polling resumes if the watcher stops
+        manager._watch_config = {"poll_interval": None}
+        event = _PollStopEvent(manager._get_poll_interval)
+        timer = Timer(0.5, setattr, (watcher.is_alive, "return_value",
+                                     False))
+        timer.start()
+        start = time()
+        self.assertFalse(event.wait(0.2))
+        self.assertGreaterEqual(time() - start, 0.5)
+        self.assertLess(time() - start, 5)
+        watcher.shutdown.assert_called_once()
+        self.assertIsNone(manager._watcher)
+        self.assertEqual(manager._get_poll_interval(30), 30)
+
+        event.set()
+        self.assertTrue(event.wait(30))
+
+    @patch("neon_core.skills.skill_manager.get_plugin_skill_versions")
+    @patch("ovos_core.skill_manager.SkillManager._load_plugin_skill")
+    def test_lazy_load_skills(self, load_skill, get_versions):
+        from ovos_core.intent_services.adapt_service import AdaptService
+        from ovos_workshop.intents import open_intent_envelope
+        from neon_core.skills.skill_manager import NeonSkillManager
+        from neon_core.skills.lazy_skills import SkillManifestStore, \
+            RegistrationRecorder
+        skill_id = "skill-test.neon"
+        intent = f"{skill_id}:TestIntent"
+        manifest_dir = join(dirname(__file__), "lazy_manifests")
+        get_versions.return_value = {skill_id: "1.0.0"}
+        handled = list()
+        skill_loaded = Event()
+
+        def _load_skill(manager, sid, plugin):
+            manager.bus.emit(Message("register_intent",
+                                     {"name": intent,
+                                      "requires": [["TestKeyword",
+                                                    "TestKeyword"]]},
+                                     {"skill_id": sid}))
+            manager.bus.on(intent, handled.append)
+            skill_loaded.set()
+            return Mock(instance=object())
+
+        load_skill.side_effect = _load_skill
+
+        def _get_manager():
+            manager = NeonSkillManager(FakeBus())
+            manager._lazy_config = {"enabled": True, "record_delay": 0}
+            manager._manifests = SkillManifestStore(manifest_dir)
+            manager._recorder = RegistrationRecorder(manager.bus)
+            return manager
+
+        # No manifest, skill is loaded and registrations are recorded
+        manager = _get_manager()
+        loader = manager._load_plugin_skill(skill_id, Mock())
+        load_skill.assert_called_once_with(manager, skill_id, ANY)
+        self.assertIsNotNone(loader)
+        manifest_file = join(manifest_dir, f"{skill_id}.json")
+        timeout = time() + 5
+        while not os.path.isfile(manifest_file) and time() < timeout:
+            sleep(0.1)
+        manifest = manager._manifests.get(skill_id, "1.0.0")
+        self.assertTrue(manifest["lazy"])
+        self.assertEqual(manifest["messages"][0]["type"], "register_intent")
+        self.assertIsNone(manager._manifests.get(skill_id, "1.0.1"))
+        manager.stop()
+
+        # Manifest intents are registered without loading the skill
+        load_skill.reset_mock()
+        skill_loaded.clear()
+        manager = _get_manager()
+        registered = list()
+        manager.bus.on("register_intent", registered.append)
+        adapt = AdaptService()
+        manager.bus.on("register_intent", lambda m: adapt.register_intent(
+            open_intent_envelope(m)))
+        manager.bus.on("detach_skill",
+                       lambda m: adapt.detach_skill(m.data["skill_id"]))
+
+        def _parser_count():
+            return [len(engine.intent_parsers)
+                    for engine in adapt.engines.values()]
+        manager._load_plugin_skill(skill_id, Mock())
+        load_skill.assert_not_called()
+        self.assertEqual(registered[0].data["name"], intent)
+        self.assertIn(skill_id, manager.plugin_skills)
+        self.assertFalse(manager.plugin_skills[skill_id].loaded)
+        self.assertEqual(set(_parser_count()), {1})
+
+        # First intent match loads the skill and replays the intent
+        manager.bus.emit(Message(intent, {"utterance": "test"}))
+        self.assertTrue(skill_loaded.wait(5))
+        timeout = time() + 5
+        while not handled and time() < timeout:
+            sleep(0.1)
+        load_skill.assert_called_once_with(manager, skill_id, ANY)
+        self.assertEqual(len(handled), 1)
+        self.assertEqual(handled[0].data["utterance"], "test")
+        self.assertEqual(manager._lazy_intents, dict())
+        # Manifest registrations are replaced by the skill's own
+        self.assertEqual(set(_parser_count()), {1})
+
+        # Subsequent intents are handled by the skill directly
+        manager.bus.emit(Message(intent, {"utterance": "again"}))
+        self.assertEqual(len(handled), 2)
+        load_skill.assert_called_once()
+        manager.stop()
+        shutil.rmtree(manifest_dir)
+
+
+class TestSkillsZygote(unittest.TestCase):
+    def test_restart_worker(self):
+        import gc
+        import signal
+        from tempfile import mkdtemp
+        from neon_core.skills.zygote import SkillsZygote
+        test_dir = mkdtemp()
+        runs_file = join(test_dir, "runs")
+        handlers = {sig: signal.getsignal(sig) for sig in
+                    (signal.SIGTERM, signal.SIGINT, signal.SIGHUP)}
+
+        def _get_runs():
+            if not os.path.isfile(runs_file):
+                return []
+            with open(runs_file) as f:
+                return f.read().splitlines()
+
+        def _worker():
+            with open(runs_file, "a") as f:
+                f.write(f"{os.getpid()} {'json' in sys.modules}\n")
+            runs = _get_runs()
+            if len(runs) == 1:
+                raise RuntimeError("Worker crashed")
+            if len(runs) == 2:
+                # Wait for the zygote to restart this worker
+                sleep(10)
+                raise RuntimeError("Worker was not restarted")
+
+        def _request_restart():
+            timeout = time() + 5
+            while len(_get_runs()) < 2 and time() < timeout:
+                sleep(0.1)
+            os.kill(os.getpid(), signal.SIGHUP)
+
+        zygote = SkillsZygote(_worker, preload=["json"], restart_delay=0.1)
+        Thread(target=_request_restart, daemon=True).start()
+        try:
+            zygote.run()
+        finally:
+            gc.unfreeze()
+            for sig, handler in handlers.items():
+                signal.signal(sig, handler)
+        runs = [run.split() for run in _get_runs()]
+        # Crashed, restarted on SIGHUP, exited normally
+        self.assertEqual(len(runs), 3)
+        pids = {pid for pid, _ in runs}
+        self.assertEqual(len(pids), 3)
+        self.assertNotIn(str(os.getpid()), pids)
+        self.assertEqual({preloaded for _, preloaded in runs}, {"True"})
+        shutil.rmtree(test_dir)
+
+    def test_wait_for_service(self):
+        import signal
+        from neon_core.skills.__main__ import _wait_for_service
+        handlers = {sig: signal.getsignal(sig) for sig in
+                    (signal.SIGTERM, signal.SIGINT)}
+        service = Mock()
+        service.is_alive.return_value = True
+        service.skill_manager.is_alive.return_value = True
+        failed = Event()
+        try:
+            # Service reports an error
+            Timer(0.2, failed.set).start()
+            self.assertTrue(_wait_for_service(service, failed))
+
+            # Service threads stopped
+            failed.clear()
+            service.is_alive.return_value = False
+            service.skill_manager.is_alive.return_value = False
+            self.assertTrue(_wait_for_service(service, failed))
+
+            # Exit signal
+            service.skill_manager.is_alive.return_value = True
+            Timer(0.2, os.kill, (os.getpid(), signal.SIGTERM)).start()
+            self.assertFalse(_wait_for_service(service, failed))
+        finally:
+            for sig, handler in handlers.items():
+                signal.signal(sig, handler)
+
+
 # class TestSkillStore(unittest.TestCase):
 #     essential = ["https://github.com/OpenVoiceOS/skill-ovos-homescreen/tree/main"]
 #     config = {